@@ -0,0 +1,36 @@
+"""Add secondary indexes for task, report and discussion queries
+
+Revision ID: 202508100001
+Revises: 626ff7317b96
+Create Date: 2025-08-10 00:01:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100001'
+down_revision: Union[str, None] = '626ff7317b96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_skill ON tasks(status, required_skill)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_tasks_hunter_status ON tasks(hunter_id, status)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_reports_task_created ON reports(task_id, created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_reports_hunter_created ON reports(hunter_id, created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_reports_status_created ON reports(status, created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_discussion_created ON discussion_messages(created_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_discussion_created")
+    op.execute("DROP INDEX IF EXISTS idx_reports_status_created")
+    op.execute("DROP INDEX IF EXISTS idx_reports_hunter_created")
+    op.execute("DROP INDEX IF EXISTS idx_reports_task_created")
+    op.execute("DROP INDEX IF EXISTS idx_tasks_hunter_status")
+    op.execute("DROP INDEX IF EXISTS idx_tasks_status_skill")
@@ -0,0 +1,26 @@
+"""Persist task priority
+
+Revision ID: 202508100002
+Revises: 202508100001
+Create Date: 2025-08-10 00:02:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100002'
+down_revision: Union[str, None] = '202508100001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE tasks ADD COLUMN priority INTEGER DEFAULT 0")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE tasks DROP COLUMN priority")
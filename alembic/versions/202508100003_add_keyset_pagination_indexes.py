@@ -0,0 +1,48 @@
+"""Add (created_at, id) ordered indexes for keyset pagination
+
+Revision ID: 202508100003
+Revises: 202508100002
+Create Date: 2025-08-10 00:03:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100003'
+down_revision: Union[str, None] = '202508100002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_tasks_status_skill")
+    op.execute("DROP INDEX IF EXISTS idx_reports_task_created")
+    op.execute("DROP INDEX IF EXISTS idx_reports_hunter_created")
+    op.execute("DROP INDEX IF EXISTS idx_reports_status_created")
+    op.execute("CREATE INDEX idx_tasks_created ON tasks(created_at, id)")
+    op.execute("CREATE INDEX idx_tasks_status_created ON tasks(status, created_at, id)")
+    op.execute("CREATE INDEX idx_tasks_status_skill ON tasks(status, required_skill, created_at, id)")
+    op.execute("CREATE INDEX idx_hunters_created ON hunters(created_at, id)")
+    op.execute("CREATE INDEX idx_reports_created ON reports(created_at, id)")
+    op.execute("CREATE INDEX idx_reports_task_created ON reports(task_id, created_at, id)")
+    op.execute("CREATE INDEX idx_reports_hunter_created ON reports(hunter_id, created_at, id)")
+    op.execute("CREATE INDEX idx_reports_status_created ON reports(status, created_at, id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_reports_status_created")
+    op.execute("DROP INDEX IF EXISTS idx_reports_hunter_created")
+    op.execute("DROP INDEX IF EXISTS idx_reports_task_created")
+    op.execute("DROP INDEX IF EXISTS idx_reports_created")
+    op.execute("DROP INDEX IF EXISTS idx_hunters_created")
+    op.execute("DROP INDEX IF EXISTS idx_tasks_status_skill")
+    op.execute("DROP INDEX IF EXISTS idx_tasks_status_created")
+    op.execute("DROP INDEX IF EXISTS idx_tasks_created")
+    op.execute("CREATE INDEX idx_tasks_status_skill ON tasks(status, required_skill)")
+    op.execute("CREATE INDEX idx_reports_task_created ON reports(task_id, created_at)")
+    op.execute("CREATE INDEX idx_reports_hunter_created ON reports(hunter_id, created_at)")
+    op.execute("CREATE INDEX idx_reports_status_created ON reports(status, created_at)")
@@ -0,0 +1,45 @@
+"""Add change_log table and triggers for cross-process cache invalidation
+
+Revision ID: 202508100004
+Revises: 202508100003
+Create Date: 2025-08-10 00:04:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100004'
+down_revision: Union[str, None] = '202508100003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = [
+    (f"trg_{table}_change_{event.lower()}", table, event, entity, ref)
+    for table, entity in (("tasks", "task"), ("hunters", "hunter"))
+    for event, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD"))
+]
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity TEXT NOT NULL,
+            entity_id TEXT NOT NULL
+        )
+    """)
+    for name, table, event, entity, ref in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} BEGIN "
+            f"INSERT INTO change_log (entity, entity_id) VALUES ('{entity}', {ref}.id); END"
+        )
+
+
+def downgrade() -> None:
+    for name, *_ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS change_log")
@@ -0,0 +1,98 @@
+"""Add task_dependencies edge table and unmet-dependency counters
+
+Revision ID: 202508100005
+Revises: 202508100004
+Create Date: 2025-08-10 00:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100005'
+down_revision: Union[str, None] = '202508100004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNC_DEPENDENCIES = """
+    INSERT OR IGNORE INTO task_dependencies (task_id, depends_on_id)
+    SELECT NEW.id, value FROM json_each(COALESCE(NEW.depends_on, '[]'));
+    UPDATE tasks SET unmet_dependencies = (
+        SELECT COUNT(*) FROM task_dependencies d JOIN tasks dep ON dep.id = d.depends_on_id
+        WHERE d.task_id = NEW.id AND dep.status != 'completed'
+    ) WHERE id = NEW.id AND (unmet_dependencies != 0 OR json_array_length(COALESCE(NEW.depends_on, '[]')) > 0);
+"""
+
+TRIGGERS = {
+    "trg_tasks_deps_insert": f"""
+        AFTER INSERT ON tasks BEGIN
+        {SYNC_DEPENDENCIES}
+        UPDATE tasks SET unmet_dependencies = unmet_dependencies + 1
+        WHERE NEW.status != 'completed'
+          AND id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = NEW.id);
+        END
+    """,
+    "trg_tasks_deps_update": f"""
+        AFTER UPDATE OF depends_on ON tasks WHEN NEW.depends_on IS NOT OLD.depends_on BEGIN
+        DELETE FROM task_dependencies WHERE task_id = NEW.id;
+        {SYNC_DEPENDENCIES}
+        END
+    """,
+    "trg_tasks_deps_status": """
+        AFTER UPDATE OF status ON tasks
+        WHEN (NEW.status = 'completed') != (OLD.status = 'completed') BEGIN
+        UPDATE tasks SET unmet_dependencies = unmet_dependencies + (CASE WHEN NEW.status = 'completed' THEN -1 ELSE 1 END)
+        WHERE id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = NEW.id);
+        END
+    """,
+    "trg_tasks_deps_delete": """
+        AFTER DELETE ON tasks BEGIN
+        UPDATE tasks SET unmet_dependencies = unmet_dependencies - 1
+        WHERE OLD.status != 'completed'
+          AND id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = OLD.id);
+        DELETE FROM task_dependencies WHERE task_id = OLD.id;
+        END
+    """,
+}
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE tasks ADD COLUMN unmet_dependencies INTEGER NOT NULL DEFAULT 0")
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS task_dependencies (
+            task_id TEXT NOT NULL,
+            depends_on_id TEXT NOT NULL,
+            PRIMARY KEY (task_id, depends_on_id)
+        ) WITHOUT ROWID
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_task_dependencies_dep ON task_dependencies(depends_on_id)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_ready "
+        "ON tasks(status, unmet_dependencies, required_skill, priority DESC, created_at)"
+    )
+
+    # Backfill edges and counters from the JSON column
+    op.execute("""
+        INSERT OR IGNORE INTO task_dependencies (task_id, depends_on_id)
+        SELECT t.id, d.value FROM tasks t, json_each(COALESCE(t.depends_on, '[]')) d
+    """)
+    op.execute("""
+        UPDATE tasks SET unmet_dependencies = (
+            SELECT COUNT(*) FROM task_dependencies d JOIN tasks dep ON dep.id = d.depends_on_id
+            WHERE d.task_id = tasks.id AND dep.status != 'completed'
+        )
+    """)
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP INDEX IF EXISTS idx_tasks_ready")
+    op.execute("DROP INDEX IF EXISTS idx_task_dependencies_dep")
+    op.execute("DROP TABLE IF EXISTS task_dependencies")
+    op.execute("ALTER TABLE tasks DROP COLUMN unmet_dependencies")
@@ -0,0 +1,64 @@
+"""Add hunter_skills table and persist hunter reputation
+
+Revision ID: 202508100006
+Revises: 202508100005
+Create Date: 2025-08-10 00:06:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100006'
+down_revision: Union[str, None] = '202508100005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNC_HUNTER_SKILLS = """
+    DELETE FROM hunter_skills WHERE hunter_id = NEW.id;
+    INSERT INTO hunter_skills (hunter_id, skill, level, score)
+    SELECT NEW.id, key, value,
+           COALESCE(NEW.reputation, 0) * 0.7 - json_array_length(COALESCE(NEW.current_tasks, '[]')) * 0.3
+    FROM json_each(COALESCE(NEW.skills, '{}'));
+"""
+
+TRIGGERS = {
+    "trg_hunters_skills_insert": f"AFTER INSERT ON hunters BEGIN {SYNC_HUNTER_SKILLS} END",
+    "trg_hunters_skills_update": (
+        f"AFTER UPDATE OF skills, reputation, current_tasks ON hunters BEGIN {SYNC_HUNTER_SKILLS} END"
+    ),
+    "trg_hunters_skills_delete": "AFTER DELETE ON hunters BEGIN DELETE FROM hunter_skills WHERE hunter_id = OLD.id; END",
+}
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE hunters ADD COLUMN reputation INTEGER DEFAULT 0")
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS hunter_skills (
+            hunter_id TEXT NOT NULL,
+            skill TEXT NOT NULL,
+            level INTEGER NOT NULL,
+            score REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (hunter_id, skill)
+        ) WITHOUT ROWID
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_hunter_skills_rank ON hunter_skills(skill, score DESC, hunter_id)")
+    op.execute("""
+        INSERT INTO hunter_skills (hunter_id, skill, level, score)
+        SELECT h.id, s.key, s.value,
+               COALESCE(h.reputation, 0) * 0.7 - json_array_length(COALESCE(h.current_tasks, '[]')) * 0.3
+        FROM hunters h, json_each(COALESCE(h.skills, '{}')) s
+    """)
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP INDEX IF EXISTS idx_hunter_skills_rank")
+    op.execute("DROP TABLE IF EXISTS hunter_skills")
+    op.execute("ALTER TABLE hunters DROP COLUMN reputation")
@@ -0,0 +1,72 @@
+"""Add integer microsecond-epoch companions for range-scanned timestamps
+
+Revision ID: 202508100007
+Revises: 202508100006
+Create Date: 2025-08-10 00:07:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100007'
+down_revision: Union[str, None] = '202508100006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+EPOCH_COLUMNS = {
+    "tasks": [
+        ("created_at", "created_at_us"),
+        ("updated_at", "updated_at_us"),
+        ("lease_expires_at", "lease_expires_at_us"),
+    ],
+    "hunters": [
+        ("created_at", "created_at_us"),
+        ("updated_at", "updated_at_us"),
+        ("last_read_discussion_timestamp", "last_read_discussion_timestamp_us"),
+    ],
+    "discussion_messages": [("created_at", "created_at_us")],
+}
+
+
+def _to_epoch_us(value):
+    if value is None:
+        return None
+    value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table, pairs in EPOCH_COLUMNS.items():
+        for _, us in pairs:
+            op.execute(f"ALTER TABLE {table} ADD COLUMN {us} INTEGER")
+        iso_columns = [iso for iso, _ in pairs]
+        rows = conn.execute(sa.text(f"SELECT id, {', '.join(iso_columns)} FROM {table}")).mappings().all()
+        update = sa.text(f"UPDATE {table} SET {', '.join(f'{us} = :{us}' for _, us in pairs)} WHERE id = :id")
+        for row in rows:
+            conn.execute(update, {"id": row["id"], **{us: _to_epoch_us(row[iso]) for iso, us in pairs}})
+
+    op.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_updated ON tasks(status, updated_at_us)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_tasks_lease_expiry ON tasks(status, lease_expires_at_us)")
+    op.execute("DROP INDEX IF EXISTS idx_discussion_created")
+    op.execute("CREATE INDEX idx_discussion_created ON discussion_messages(created_at_us)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_discussion_created")
+    op.execute("CREATE INDEX idx_discussion_created ON discussion_messages(created_at)")
+    op.execute("DROP INDEX IF EXISTS idx_tasks_lease_expiry")
+    op.execute("DROP INDEX IF EXISTS idx_tasks_status_updated")
+    for table, pairs in EPOCH_COLUMNS.items():
+        for _, us in pairs:
+            op.execute(f"ALTER TABLE {table} DROP COLUMN {us}")
@@ -0,0 +1,28 @@
+"""Add indexes for SQL-side task statistics
+
+Revision ID: 202508100008
+Revises: 202508100007
+Create Date: 2025-08-10 00:08:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100008'
+down_revision: Union[str, None] = '202508100007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_hunter ON tasks(status, hunter_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_publisher ON tasks(status, published_by_hunter_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_tasks_status_publisher")
+    op.execute("DROP INDEX IF EXISTS idx_tasks_status_hunter")
@@ -0,0 +1,126 @@
+"""Add trigger-maintained task_counters and derive hunter workload from them
+
+Revision ID: 202508100009
+Revises: 202508100008
+Create Date: 2025-08-10 00:09:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100009'
+down_revision: Union[str, None] = '202508100008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_KEYS = """
+    SELECT 'status' AS dimension, '' AS key
+    UNION ALL SELECT 'skill', {row}.required_skill
+    UNION ALL SELECT 'hunter', {row}.hunter_id
+    UNION ALL SELECT 'publisher', {row}.published_by_hunter_id
+"""
+
+COUNT_TASK = f"""
+    INSERT INTO task_counters (dimension, key, status, n)
+    SELECT dimension, key, NEW.status, 1 FROM ({COUNTER_KEYS.format(row="NEW")}) WHERE key IS NOT NULL
+    ON CONFLICT (dimension, key, status) DO UPDATE SET n = n + 1;
+"""
+
+UNCOUNT_TASK = f"""
+    UPDATE task_counters SET n = n - 1
+    WHERE status = OLD.status AND (dimension, key) IN ({COUNTER_KEYS.format(row="OLD")});
+"""
+
+HUNTER_WORKLOAD = """(
+    SELECT COALESCE(SUM(n), 0) FROM task_counters
+    WHERE dimension = 'hunter' AND key = {hunter} AND status IN ('claimed', 'in_progress')
+)"""
+
+SYNC_HUNTER_SKILLS = f"""
+    DELETE FROM hunter_skills WHERE hunter_id = NEW.id;
+    INSERT INTO hunter_skills (hunter_id, skill, level, score)
+    SELECT NEW.id, key, value, COALESCE(NEW.reputation, 0) * 0.7 - {HUNTER_WORKLOAD.format(hunter="NEW.id")} * 0.3
+    FROM json_each(COALESCE(NEW.skills, '{{}}'));
+"""
+
+RESCORE_HUNTERS = f"""
+    UPDATE hunter_skills SET score =
+        (SELECT COALESCE(reputation, 0) FROM hunters WHERE id = hunter_skills.hunter_id) * 0.7
+        - {HUNTER_WORKLOAD.format(hunter="hunter_skills.hunter_id")} * 0.3
+    WHERE hunter_id IN ({{hunters}});
+"""
+
+TRIGGERS = {
+    "trg_hunters_skills_insert": f"AFTER INSERT ON hunters BEGIN {SYNC_HUNTER_SKILLS} END",
+    "trg_hunters_skills_update": f"AFTER UPDATE OF skills, reputation ON hunters BEGIN {SYNC_HUNTER_SKILLS} END",
+    "trg_tasks_count_insert": (
+        f"AFTER INSERT ON tasks BEGIN {COUNT_TASK} {RESCORE_HUNTERS.format(hunters='NEW.hunter_id')} END"
+    ),
+    "trg_tasks_count_update": f"""
+        AFTER UPDATE OF status, required_skill, hunter_id, published_by_hunter_id ON tasks
+        WHEN NEW.status IS NOT OLD.status OR NEW.required_skill IS NOT OLD.required_skill
+          OR NEW.hunter_id IS NOT OLD.hunter_id OR NEW.published_by_hunter_id IS NOT OLD.published_by_hunter_id
+        BEGIN {UNCOUNT_TASK} {COUNT_TASK} {RESCORE_HUNTERS.format(hunters='OLD.hunter_id, NEW.hunter_id')} END
+    """,
+    "trg_tasks_count_delete": (
+        f"AFTER DELETE ON tasks BEGIN {UNCOUNT_TASK} {RESCORE_HUNTERS.format(hunters='OLD.hunter_id')} END"
+    ),
+}
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS task_counters (
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            status TEXT NOT NULL,
+            n INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, key, status)
+        ) WITHOUT ROWID
+    """)
+    op.execute(
+        "INSERT INTO task_counters (dimension, key, status, n) "
+        "SELECT 'status', '', status, COUNT(*) FROM tasks GROUP BY status"
+    )
+    for dimension, column in (("skill", "required_skill"), ("publisher", "published_by_hunter_id"), ("hunter", "hunter_id")):
+        op.execute(
+            f"INSERT INTO task_counters (dimension, key, status, n) "
+            f"SELECT '{dimension}', {column}, status, COUNT(*) FROM tasks "
+            f"WHERE {column} IS NOT NULL GROUP BY status, {column}"
+        )
+
+    for name, body in TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+    op.execute(f"""
+        UPDATE hunter_skills SET score =
+            (SELECT COALESCE(reputation, 0) FROM hunters WHERE id = hunter_skills.hunter_id) * 0.7
+            - {HUNTER_WORKLOAD.format(hunter="hunter_skills.hunter_id")} * 0.3
+    """)
+
+
+def downgrade() -> None:
+    for name in ("trg_tasks_count_insert", "trg_tasks_count_update", "trg_tasks_count_delete"):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS task_counters")
+
+    # Restore the workload-from-current_tasks hunter_skills triggers of 202508100006
+    sync = """
+        DELETE FROM hunter_skills WHERE hunter_id = NEW.id;
+        INSERT INTO hunter_skills (hunter_id, skill, level, score)
+        SELECT NEW.id, key, value,
+               COALESCE(NEW.reputation, 0) * 0.7 - json_array_length(COALESCE(NEW.current_tasks, '[]')) * 0.3
+        FROM json_each(COALESCE(NEW.skills, '{}'));
+    """
+    op.execute("DROP TRIGGER IF EXISTS trg_hunters_skills_insert")
+    op.execute("DROP TRIGGER IF EXISTS trg_hunters_skills_update")
+    op.execute(f"CREATE TRIGGER trg_hunters_skills_insert AFTER INSERT ON hunters BEGIN {sync} END")
+    op.execute(
+        f"CREATE TRIGGER trg_hunters_skills_update AFTER UPDATE OF skills, reputation, current_tasks ON hunters "
+        f"BEGIN {sync} END"
+    )
@@ -0,0 +1,54 @@
+"""Add FTS5 full-text indexes over tasks and discussion messages
+
+Revision ID: 202508100010
+Revises: 202508100009
+Create Date: 2025-08-10 00:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100010'
+down_revision: Union[str, None] = '202508100009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_TABLES = {
+    "tasks_fts": ("tasks", ("name", "details")),
+    "discussion_fts": ("discussion_messages", ("content",)),
+}
+
+
+def _triggers(fts, table, columns):
+    cols = ", ".join(columns)
+    new = ", ".join(f"NEW.{c}" for c in columns)
+    old = ", ".join(f"OLD.{c}" for c in columns)
+    insert = f"INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.rowid, {new});"
+    delete = f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.rowid, {old});"
+    return {
+        f"trg_{fts}_insert": f"AFTER INSERT ON {table} BEGIN {insert} END",
+        f"trg_{fts}_update": f"AFTER UPDATE OF {cols} ON {table} BEGIN {delete} {insert} END",
+        f"trg_{fts}_delete": f"AFTER DELETE ON {table} BEGIN {delete} END",
+    }
+
+
+def upgrade() -> None:
+    for fts, (table, columns) in FTS_TABLES.items():
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({', '.join(columns)}, "
+            f"content='{table}', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+        for name, body in _triggers(fts, table, columns).items():
+            op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def downgrade() -> None:
+    for fts, (table, columns) in FTS_TABLES.items():
+        for name in _triggers(fts, table, columns):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,26 @@
+"""Count lease expiries per task
+
+Revision ID: 202508100011
+Revises: 202508100010
+Create Date: 2025-08-10 00:11:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '202508100011'
+down_revision: Union[str, None] = '202508100010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("lease_expiries", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "lease_expiries")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+claim_next_task cost: ready-queue dispatch vs the candidate-search query.
+
+Fills a database with pending tasks spread over several skills, many of them
+published by the claiming hunter so they must be skipped, then claims a
+batch through the in-process ready queue and another batch through the
+SQL search it replaces, reporting claims/sec for each.
+
+    python benchmarks/bench_claim_next.py --tasks 50000 --claims 2000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from taskhub.models.task import Task, TaskStatus
+from taskhub.storage.sqlite_store import SQLiteStore
+from taskhub.storage.timestamps import to_epoch_us
+
+SKILLS = ["python", "rust", "go", "sql", "docs"]
+
+# The candidate search claim_next_task used before the ready queue
+CLAIM_NEXT_SQL = """
+    UPDATE tasks
+    SET status = ?, hunter_id = ?, lease_id = ?, lease_expires_at = ?, lease_expires_at_us = ?,
+        updated_at = ?, updated_at_us = ?
+    WHERE status = ? AND id = (
+        SELECT t.id FROM tasks t
+        WHERE t.status = ? AND t.unmet_dependencies = 0 AND t.required_skill IN ({placeholders})
+          AND (t.published_by_hunter_id IS NULL OR t.published_by_hunter_id != ?)
+        ORDER BY t.priority DESC, t.created_at ASC
+        LIMIT 1
+    )
+    RETURNING *
+"""
+
+
+def query_claimer(store: SQLiteStore):
+    async def claim(hunter_id: str, skills: list[str], lease_id: str, lease_expires_at: datetime) -> Task | None:
+        now = datetime.now(timezone.utc)
+        rows = await store._execute_returning(
+            CLAIM_NEXT_SQL.format(placeholders=", ".join("?" * len(skills))),
+            (
+                TaskStatus.CLAIMED.value,
+                hunter_id,
+                lease_id,
+                lease_expires_at.isoformat(),
+                to_epoch_us(lease_expires_at),
+                now.isoformat(),
+                to_epoch_us(now),
+                TaskStatus.PENDING.value,
+                TaskStatus.PENDING.value,
+                *skills,
+                hunter_id,
+            ),
+        )
+        return store._task_from_row(rows[0]) if rows else None
+
+    return claim
+
+
+async def measure(label: str, claim_fn, claims: int) -> float:
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    start = time.perf_counter()
+    for i in range(claims):
+        task = await claim_fn("bench-hunter", ["python", "rust"], f"{label}-{i}", expires)
+        assert task is not None, "ran out of tasks"
+    elapsed = time.perf_counter() - start
+    rate = claims / elapsed
+    print(f"{label:6}  {claims} claims in {elapsed * 1000:.0f}ms  {rate:,.0f} claims/sec")
+    return rate
+
+
+async def run(path: Path, count: int, claims: int) -> None:
+    store = SQLiteStore(str(path))
+    await store.connect()
+    try:
+        await store.save_tasks_many(
+            [
+                Task(
+                    id=f"task-{i}",
+                    name=f"Task {i}",
+                    details="d",
+                    required_skill=SKILLS[i % len(SKILLS)],
+                    priority=i % 10,
+                    # A third of the work was published by the claimer and has to be skipped
+                    published_by_hunter_id="bench-hunter" if i % 3 == 0 else "publisher",
+                )
+                for i in range(count)
+            ]
+        )
+        await store.rebuild_ready_queue()
+        before = await measure("query", query_claimer(store), claims)
+        after = await measure("queue", store.claim_next_task, claims)
+        print(f"speedup: {after / before:.1f}x")
+    finally:
+        await store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50000, help="Number of pending tasks")
+    parser.add_argument("--claims", type=int, default=2000, help="Claims per strategy")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(Path(tmp) / "bench.db", args.tasks, args.claims))
+
+
+if __name__ == "__main__":
+    main()
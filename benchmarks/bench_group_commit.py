@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Write throughput of SQLiteStore with and without group commit.
+
+Simulates a burst of agents saving tasks concurrently and reports writes/sec.
+
+    python benchmarks/bench_group_commit.py --agents 200 --writes 20
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from taskhub.models.task import Task
+from taskhub.storage.sqlite_store import SQLiteStore
+
+
+async def run(group_commit: bool, agents: int, writes: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteStore(str(Path(tmp) / "bench.db"), group_commit=group_commit)
+        await store.connect()
+
+        async def agent(agent_id: int) -> None:
+            for i in range(writes):
+                await store.save_task(
+                    Task(id=f"task-{agent_id}-{i}", name="Task", details="Details", required_skill="python")
+                )
+
+        start = time.perf_counter()
+        await asyncio.gather(*[agent(a) for a in range(agents)])
+        elapsed = time.perf_counter() - start
+        stats = store.pool_stats()
+        await store.close()
+
+    total = agents * writes
+    line = f"group_commit={group_commit!s:5}  {total} writes in {elapsed:.2f}s  {total / elapsed:,.0f} writes/sec"
+    if "group_commit" in stats:
+        gc = stats["group_commit"]
+        line += f"  ({gc['batches']} batches, max batch {gc['max_batch']})"
+    print(line)
+    return total / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=200, help="Number of concurrent agents")
+    parser.add_argument("--writes", type=int, default=20, help="Writes per agent")
+    args = parser.parse_args()
+
+    baseline = asyncio.run(run(False, args.agents, args.writes))
+    grouped = asyncio.run(run(True, args.agents, args.writes))
+    print(f"speedup: {grouped / baseline:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Row decoding throughput: validating Task(**data) vs the trusted row mapper.
+
+Fills a database with tasks, reads them back once and decodes the same rows
+with both paths, reporting rows/sec.
+
+    python benchmarks/bench_row_decode.py --tasks 20000
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from taskhub.models.task import Task, TaskEvaluation, TaskStatus
+from taskhub.storage.row_mapper import TASK_MAPPER
+from taskhub.storage.sqlite_store import SQLiteStore
+
+
+def validated_decode(row: sqlite3.Row) -> Task:
+    """The per-row dict + json + fromisoformat + validating constructor path."""
+    data = dict(row)
+    data["status"] = TaskStatus(data["status"])
+    data["depends_on"] = json.loads(data["depends_on"]) if data["depends_on"] else []
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+    if data["lease_expires_at"]:
+        data["lease_expires_at"] = datetime.fromisoformat(data["lease_expires_at"])
+    data["evaluation"] = TaskEvaluation(**json.loads(data["evaluation"])) if data["evaluation"] else None
+    if data.get("priority") is None:
+        data["priority"] = 0
+    return Task(**data)
+
+
+def measure(label: str, decode, rows: list[sqlite3.Row], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode(rows)
+        best = min(best, time.perf_counter() - start)
+    rate = len(rows) / best
+    print(f"{label:10}  {len(rows)} rows in {best * 1000:.1f}ms  {rate:,.0f} rows/sec")
+    return rate
+
+
+async def load_rows(path: Path, count: int) -> list[sqlite3.Row]:
+    store = SQLiteStore(str(path))
+    await store.connect()
+    await store.save_tasks_many(
+        [
+            Task(
+                id=f"task-{i}",
+                name=f"Task {i}",
+                details="Details " * 10,
+                required_skill="python",
+                depends_on=[f"task-{i - 1}"] if i else [],
+            )
+            for i in range(count)
+        ]
+    )
+    rows = await store._fetchall("SELECT * FROM tasks")
+    await store.close()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20000, help="Number of task rows to decode")
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of repetitions")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = asyncio.run(load_rows(Path(tmp) / "bench.db", args.tasks))
+
+    before = measure("validated", lambda rs: [validated_decode(r) for r in rs], rows, args.repeat)
+    after = measure("mapper", TASK_MAPPER.many, rows, args.repeat)
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
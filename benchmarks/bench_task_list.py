@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+List endpoint cost: full Task rows vs projected TaskSummary rows.
+
+Fills a database with tasks carrying realistic ``details`` text and times
+``list_tasks`` against ``list_task_summaries``, reporting rows/sec and the
+JSON payload size of each.
+
+    python benchmarks/bench_task_list.py --tasks 20000 --details-size 2000
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from taskhub.models.task import Task
+from taskhub.storage.sqlite_store import SQLiteStore
+
+
+async def measure(label: str, list_fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = await list_fn()
+        best = min(best, time.perf_counter() - start)
+    payload = len(json.dumps([item.model_dump(mode="json") for item in items]))
+    rate = len(items) / best
+    print(f"{label:10}  {len(items)} rows in {best * 1000:.1f}ms  {rate:,.0f} rows/sec  payload {payload / 1024:,.0f} KiB")
+    return rate
+
+
+async def run(path: Path, count: int, details_size: int, repeat: int) -> None:
+    store = SQLiteStore(str(path))
+    await store.connect()
+    try:
+        await store.save_tasks_many(
+            [
+                Task(id=f"task-{i}", name=f"Task {i}", details="x" * details_size, required_skill="python")
+                for i in range(count)
+            ]
+        )
+        before = await measure("full", store.list_tasks, repeat)
+        after = await measure("summary", store.list_task_summaries, repeat)
+        print(f"speedup: {after / before:.1f}x")
+    finally:
+        await store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20000, help="Number of tasks to list")
+    parser.add_argument("--details-size", type=int, default=2000, help="Length of each task's details text")
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of repetitions")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(Path(tmp) / "bench.db", args.tasks, args.details_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ from pathlib import Path
 from contextlib import asynccontextmanager
 from typing import Any, List
 
-from fastapi import FastAPI, Depends,  Query, Request, APIRouter
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, APIRouter
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from starlette.middleware.cors import CORSMiddleware
@@ -19,8 +19,10 @@ from pydantic import BaseModel
 from datetime import datetime
 
 # Import our modularized components
-from taskhub.utils.scheduler_utils import run_stale_task_check
+from taskhub.context import close_all_namespace_stores, store_registry
 from taskhub.storage.sqlite_store import SQLiteStore
+from taskhub.storage.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from taskhub.models.task import TaskStatus
 
 # Import service modules and functions
 from taskhub.services import (
@@ -57,20 +59,19 @@ class DiscussionPostRequest(BaseModel):
 
 # --- Dependency ---
 async def get_store(namespace: str = Query("default", description="The namespace for the database.")):
-    db_path = f"data/{namespace}.db"
-    store = SQLiteStore(db_path)
-    try:
-        await store.connect()
+    # Stores are shared across requests and closed by the registry when idle
+    async with store_registry.acquire(namespace, db_path=f"data/{namespace}.db") as store:
         yield store
-    finally:
-        await store.close()
 
 # --- Lifespan Management ---
 @asynccontextmanager
 async def lifespan(app: Any): # Changed to Any to be compatible with Starlette
     logger.info("Taskhub API服务器启动...")
     # 注意：这里移除了任务检查调度器，因为MCP服务器会处理
+    store_registry.start_idle_sweeper()
     yield
+    await store_registry.stop_idle_sweeper()
+    await close_all_namespace_stores()
     logger.info("Taskhub API服务器关闭...")
 
 # --- App Initialization ---
@@ -110,6 +111,10 @@ async def get_system_stats_endpoint(store: SQLiteStore = Depends(get_store)):
 async def get_all_tasks_endpoint(store: SQLiteStore = Depends(get_store)):
     return await system_service.get_all_tasks(store)
 
+@system_router.get("/stores", response_model=Any)
+async def get_store_registry_stats():
+    return store_registry.stats()
+
 @system_router.get("/namespaces", response_model=List[str])
 async def list_namespaces():
     data_dir = Path("data")
@@ -118,8 +123,27 @@ async def list_namespaces():
 
 # Task Routes (示例，需要补充完整)
 @task_router.get("/")
-async def list_tasks(store: SQLiteStore = Depends(get_store)):
-    return await task_service.list_tasks(store)
+async def list_tasks(
+    status: TaskStatus | None = None,
+    required_skill: str | None = None,
+    hunter_id: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    summary: bool = False,
+    fields: List[str] | None = Query(None),
+    store: SQLiteStore = Depends(get_store),
+):
+    try:
+        # A projection covered by TaskSummary is read without the wide columns
+        summary = task_service.check_task_fields(fields) or (summary and not fields)
+        tasks, next_cursor = await task_service.task_list_page(
+            store, status, required_skill, hunter_id, limit=limit, cursor=cursor, summary=summary
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fields:
+        return {"items": [task.model_dump(include=set(fields)) for task in tasks], "next_cursor": next_cursor}
+    return {"items": tasks, "next_cursor": next_cursor}
 
 @task_router.post("/")
 async def create_task(task_data: dict, store: SQLiteStore = Depends(get_store)):
@@ -139,8 +163,16 @@ async def delete_task(task_id: str, store: SQLiteStore = Depends(get_store)):
 
 # Hunter Routes (示例，需要补充完整)
 @hunter_router.get("/")
-async def list_hunters(store: SQLiteStore = Depends(get_store)):
-    return await hunter_service.list_hunters(store)
+async def list_hunters(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    store: SQLiteStore = Depends(get_store),
+):
+    try:
+        hunters, next_cursor = await hunter_service.hunter_list_page(store, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": hunters, "next_cursor": next_cursor}
 
 @hunter_router.post("/")
 async def create_hunter(hunter_data: dict, store: SQLiteStore = Depends(get_store)):
@@ -159,8 +191,21 @@ async def post_discussion_message(request: DiscussionPostRequest, store: SQLiteS
 
 # Report Routes (示例，需要补充完整)
 @report_router.get("/")
-async def list_reports(store: SQLiteStore = Depends(get_store)):
-    return await report_service.list_reports(store)
+async def list_reports(
+    task_id: str | None = None,
+    hunter_id: str | None = None,
+    status: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    store: SQLiteStore = Depends(get_store),
+):
+    try:
+        reports, next_cursor = await report_service.report_list_page(
+            store, task_id, hunter_id, status, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": reports, "next_cursor": next_cursor}
 
 # --- Include Routers ---
 app.include_router(api_router)
@@ -9,6 +9,32 @@ import sys
 from taskhub.api_server import main as api_main
 from taskhub.mcp_server import main as mcp_main
 
+async def rebuild_counters(namespace: str) -> None:
+    """重建统计计数器 (task_counters) 和猎人技能评分，修复计数漂移"""
+    from taskhub.storage.sqlite_store import SQLiteStore
+    from taskhub.utils.config import config
+
+    store = SQLiteStore(config.get_database_path(namespace))
+    await store.connect()
+    try:
+        await store.rebuild_task_counters()
+        print(f"已重建命名空间 {namespace} 的任务计数器: {await store.task_counts()}")
+    finally:
+        await store.close()
+
+async def vacuum(namespace: str) -> None:
+    """切换为增量 auto_vacuum 并完整 VACUUM 一次（旧数据库文件只需执行一次）"""
+    from taskhub.storage.sqlite_store import SQLiteStore
+    from taskhub.utils.config import config
+
+    store = SQLiteStore(config.get_database_path(namespace))
+    await store.connect()
+    try:
+        await store.vacuum()
+        print(f"已压缩命名空间 {namespace} 的数据库: {store.db_path}")
+    finally:
+        await store.close()
+
 async def unified_main():
     """启动统一服务（API和MCP）"""
     # 使用 asyncio.gather 同时运行 API 和 MCP 服务
@@ -19,11 +45,13 @@ def main():
     parser = argparse.ArgumentParser(description="Taskhub服务管理器")
     parser.add_argument(
         "service", 
-        choices=["api", "mcp", "unified", "all", "cli"], 
-        help="要启动的服务: api (仅API服务), mcp (仅MCP服务), unified (统一服务), all (API和MCP服务), cli (CLI模式)"
+        choices=["api", "mcp", "unified", "all", "cli", "rebuild-counters", "vacuum"], 
+        help="要启动的服务: api (仅API服务), mcp (仅MCP服务), unified (统一服务), all (API和MCP服务), cli (CLI模式), "
+        "rebuild-counters (重建统计计数器), vacuum (启用增量回收并压缩数据库)"
     )
     parser.add_argument("--host", default="localhost", help="服务绑定的主机地址")
     parser.add_argument("--port", type=int, default=None, help="服务绑定的端口")
+    parser.add_argument("--namespace", default=None, help="rebuild-counters/vacuum 使用的命名空间，默认为默认命名空间")
     
     # 解析已知参数，忽略未知参数
     args, unknown = parser.parse_known_args()
@@ -58,6 +86,12 @@ def main():
         print("CLI模式已启动。请使用相应的命令与Taskhub交互。")
         # 这里可以添加CLI交互逻辑
         pass
+    elif args.service == "rebuild-counters":
+        from taskhub.utils.config import config
+        asyncio.run(rebuild_counters(args.namespace or config.get_default_namespace()))
+    elif args.service == "vacuum":
+        from taskhub.utils.config import config
+        asyncio.run(vacuum(args.namespace or config.get_default_namespace()))
     elif args.service == "all":
         # 启动所有服务
         print("启动所有服务...")
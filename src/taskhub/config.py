@@ -53,6 +53,7 @@ class Config:
         """Load environment variable overrides."""
         env_mappings = {
             "TASKHUB_DB_PATH": "database.path",
+            "TASKHUB_DB_GROUP_COMMIT": "database.group_commit",
             "TASKHUB_LOG_LEVEL": "logging.level",
             "TASKHUB_LOG_FILE": "logging.file",
             "TASKHUB_CACHE_TTL": "cache.ttl",
@@ -127,6 +128,9 @@ class Config:
             "pool_size": self.get("database.pool_size", 5),
             "timeout": self.get("database.timeout", 30),
             "check_same_thread": self.get("database.check_same_thread", False),
+            "group_commit": self.get("database.group_commit", False),
+            "group_commit_window_ms": self.get("database.group_commit_window_ms", 2),
+            "group_commit_max_batch": self.get("database.group_commit_max_batch", 256),
         }
     
     def get_cache_config(self) -> Dict[str, Any]:
@@ -135,6 +139,7 @@ class Config:
             "ttl": self.get("cache.ttl", 300),
             "max_size": self.get("cache.max_size", 1000),
             "enabled": self.get("cache.enabled", True),
+            "change_log_retention": self.get("cache.change_log_retention", 10000),
         }
     
     def get_logging_config(self) -> Dict[str, Any]:
@@ -177,6 +182,9 @@ DEFAULT_CONFIG = {
         "pool_size": 5,
         "timeout": 30,
         "check_same_thread": False,
+        "group_commit": False,
+        "group_commit_window_ms": 2,
+        "group_commit_max_batch": 256,
         "pragmas": {
             "journal_mode": "WAL",
             "synchronous": "NORMAL",
@@ -189,6 +197,7 @@ DEFAULT_CONFIG = {
         "enabled": True,
         "ttl": 300,
         "max_size": 1000,
+        "change_log_retention": 10000,
     },
     "logging": {
         "level": "INFO",
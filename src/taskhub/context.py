@@ -4,17 +4,22 @@ Context management for the Taskhub system.
 
 import asyncio
 import logging
-from contextlib import asynccontextmanager
-from dataclasses import dataclass
-from typing import Optional, Dict
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Optional, Dict
 import contextvars
 
 from mcp.server.fastmcp import Context
 
 from taskhub.storage.sqlite_store import SQLiteStore
 from taskhub.services import system_service
-from taskhub.utils.scheduler_utils import run_stale_task_check
+from taskhub.services.lease_manager import LeaseManager, start_lease_manager
+from taskhub.utils.scheduler_utils import MaintenanceScheduler, create_maintenance_scheduler
 from taskhub.utils.config import config
+from taskhub.utils.performance_monitor import record_metric
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +33,12 @@ class TaskhubAppContext:
     namespace_store: SQLiteStore
     current_namespace: str
     current_hunter_id: str
+    lease_manager: Optional[LeaseManager] = None
     
     async def close(self):
-        """Close all database connections."""
-        if self.namespace_store:
-            await self.namespace_store.close()
+        """Stop the lease manager, if any. The store belongs to ``store_registry``, which closes it."""
+        if self.lease_manager:
+            await self.lease_manager.stop()
 
 def get_store() -> SQLiteStore:
     """Get the store for the current namespace."""
@@ -43,12 +49,266 @@ def get_store() -> SQLiteStore:
     # The namespace is handled by the database path configuration
     return _app_context.namespace_store
 
-# Cache for namespace-specific stores
-_namespace_stores: dict[str, SQLiteStore] = {}
+@dataclass
+class _StoreEntry:
+    """An open namespace store and its usage bookkeeping."""
+    store: SQLiteStore
+    lease_manager: Optional[LeaseManager] = None
+    refs: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class StoreRegistry:
+    """LRU-bounded registry of open namespace stores.
+    
+    Keeps at most ``max_stores`` stores open. When a new one pushes the count
+    over the limit, the least recently used stores with no in-flight requests
+    are closed; stores unused for ``idle_timeout`` seconds are closed as well.
+    Stores in use are never closed, so the limit can be exceeded briefly while
+    every open store is busy.
+    
+    Concurrent first requests for a namespace share a single store: the first
+    one creates and connects it, the others wait for that.
+    """
+    
+    def __init__(self, max_stores: int = 64, idle_timeout: float = 600.0):
+        self.max_stores = max(1, max_stores)
+        self.idle_timeout = idle_timeout
+        self._entries: OrderedDict[str, _StoreEntry] = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        # Leases held by each asyncio task, released when the task finishes
+        self._task_leases: weakref.WeakKeyDictionary[asyncio.Task, Dict[str, _StoreEntry]] = weakref.WeakKeyDictionary()
+        self._last_sweep = time.monotonic()
+        self._sweeper: Optional[asyncio.Task] = None
+        # Databases whose schema this process has already created or migrated
+        self._initialized: set[str] = set()
+        self.created = 0
+        self.hits = 0
+        self.evictions = 0
+        self.idle_evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def _db_path(namespace: str, db_path: Optional[str]) -> str:
+        return str(db_path or config.get_database_path(namespace))
+    
+    async def _open(self, key: str) -> _StoreEntry:
+        """Return the entry for ``key``, creating and connecting its store at most once."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting for a failed creation; don't warn about it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending[key] = future
+        try:
+            start = time.perf_counter()
+            store = SQLiteStore(key)
+            try:
+                await store.connect()
+            except BaseException:
+                # The pool may already be open
+                await store.close()
+                raise
+            self._initialized.add(key)
+            record_metric("namespace_store.open", time.perf_counter() - start)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._pending.pop(key, None)
+        
+        entry = _StoreEntry(store, lease_manager=start_lease_manager(store))
+        self._entries[key] = entry
+        self.created += 1
+        future.set_result(entry)
+        logger.info(f"Opened store {key} ({len(self._entries)} open)")
+        return entry
+    
+    async def _lease(self, namespace: str, db_path: Optional[str]) -> _StoreEntry:
+        entry = await self._open(self._db_path(namespace, db_path))
+        # Taken before the next await, so eviction can't close the store under us
+        entry.refs += 1
+        entry.last_used = time.monotonic()
+        await self._evict()
+        return entry
+    
+    @staticmethod
+    def _release(entry: _StoreEntry) -> None:
+        entry.refs -= 1
+        entry.last_used = time.monotonic()
+    
+    @asynccontextmanager
+    async def acquire(self, namespace: str, db_path: Optional[str] = None):
+        """Use a namespace's store for the duration of the block."""
+        entry = await self._lease(namespace, db_path)
+        try:
+            yield entry.store
+        finally:
+            self._release(entry)
+    
+    @asynccontextmanager
+    async def maintenance(self, namespace: str, db_path: Optional[str] = None):
+        """Use a namespace's store for a background job without keeping the namespace in use.
+        
+        An open store is lent as is: its LRU position and idle time are left
+        alone, so maintenance never keeps a namespace open or evicts another
+        one. Otherwise a short-lived store, without a lease manager, is opened
+        for the block and closed after it. Such a store skips the schema setup
+        once this process has done it for the database, and the change monitor.
+        """
+        key = self._db_path(namespace, db_path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            # Only pins the store against eviction while the job runs
+            entry.refs += 1
+            try:
+                yield entry.store
+            finally:
+                entry.refs -= 1
+            return
+        store = SQLiteStore(key)
+        try:
+            await store.connect(init_schema=key not in self._initialized, watch_changes=False)
+        except BaseException:
+            await store.close()
+            raise
+        self._initialized.add(key)
+        try:
+            yield store
+        finally:
+            await store.close()
+    
+    async def get(self, namespace: str, db_path: Optional[str] = None) -> SQLiteStore:
+        """Get a namespace's store, held in use until the current asyncio task finishes."""
+        task = asyncio.current_task()
+        leases = self._task_leases.get(task) if task is not None else None
+        key = self._db_path(namespace, db_path)
+        if leases is not None and leases.get(key) is self._entries.get(key, False):
+            return leases[key].store
+        
+        entry = await self._lease(namespace, db_path)
+        if task is None:
+            self._release(entry)
+            return entry.store
+        if leases is None:
+            leases = self._task_leases[task] = {}
+            task.add_done_callback(self._release_task)
+        previous = leases.get(key)
+        if previous is not None:
+            # Its store was closed explicitly; the lease moves to the new one
+            self._release(previous)
+        leases[key] = entry
+        return entry.store
+    
+    def _release_task(self, task: asyncio.Task) -> None:
+        for entry in self._task_leases.pop(task, {}).values():
+            self._release(entry)
+    
+    async def _close_entries(self, keys: list[str]) -> None:
+        entries = [self._entries.pop(key) for key in keys]
+        for key, entry in zip(keys, entries):
+            if entry.lease_manager:
+                await entry.lease_manager.stop()
+            await entry.store.close()
+            logger.info(f"Closed store {key}")
+    
+    async def _evict(self) -> None:
+        """Close idle stores and, over capacity, the least recently used unused ones."""
+        now = time.monotonic()
+        expired = []
+        if now - self._last_sweep >= self.idle_timeout / 4:
+            self._last_sweep = now
+            expired = [
+                key for key, entry in self._entries.items()
+                if entry.refs <= 0 and now - entry.last_used >= self.idle_timeout
+            ]
+        excess = len(self._entries) - len(expired) - self.max_stores
+        lru = []
+        if excess > 0:
+            for key, entry in self._entries.items():
+                if len(lru) == excess:
+                    break
+                if entry.refs <= 0 and key not in expired:
+                    lru.append(key)
+        self.idle_evictions += len(expired)
+        self.evictions += len(lru)
+        if expired or lru:
+            await self._close_entries(expired + lru)
+    
+    async def evict_idle(self) -> int:
+        """Close every unused store that has been idle for ``idle_timeout``; returns how many."""
+        self._last_sweep = float("-inf")
+        before = self.idle_evictions
+        await self._evict()
+        return self.idle_evictions - before
+    
+    async def _sweep_idle(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"Error while closing idle stores: {e}")
+    
+    def start_idle_sweeper(self) -> None:
+        """Close idle stores every ``idle_timeout / 4`` seconds, even when no requests come in."""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_idle(self.idle_timeout / 4))
+    
+    async def stop_idle_sweeper(self) -> None:
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        try:
+            await self._sweeper
+        except asyncio.CancelledError:
+            pass
+        self._sweeper = None
+    
+    async def close(self, namespace: str, db_path: Optional[str] = None) -> None:
+        """Close a namespace's store now, even if requests are still using it."""
+        key = self._db_path(namespace, db_path)
+        if key in self._entries:
+            await self._close_entries([key])
+    
+    async def close_all(self) -> None:
+        await self._close_entries(list(self._entries))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Open/busy store counts and creation, hit and eviction counters."""
+        return {
+            "open": len(self._entries),
+            "busy": sum(1 for entry in self._entries.values() if entry.refs > 0),
+            "max_stores": self.max_stores,
+            "idle_timeout": self.idle_timeout,
+            "created": self.created,
+            "hits": self.hits,
+            "evictions": self.evictions,
+            "idle_evictions": self.idle_evictions,
+        }
+
+
+# Registry of namespace-specific stores
+store_registry = StoreRegistry(
+    max_stores=config.get("namespaces.max_open_stores", 64),
+    idle_timeout=config.get("namespaces.idle_timeout", 600),
+)
 
 async def get_namespace_store(namespace: str = None) -> SQLiteStore:
     """Get or create a store for the specified namespace.
     
+    The store stays in use (and will not be evicted) until the calling asyncio
+    task finishes.
+    
     Args:
         namespace: The namespace to use. If None, uses current request namespace.
         
@@ -57,32 +317,15 @@ async def get_namespace_store(namespace: str = None) -> SQLiteStore:
     """
     if namespace is None:
         namespace = "default"
-    
-    if namespace in _namespace_stores:
-        return _namespace_stores[namespace]
-    
-    # Create new store for this namespace
-    db_path = config.get_database_path(namespace)
-    store = SQLiteStore(db_path)
-    await store.connect()
-    
-    _namespace_stores[namespace] = store
-    logger.info(f"Created new store for namespace: {namespace}")
-    return store
+    return await store_registry.get(namespace)
 
 async def close_namespace_store(namespace: str):
     """Close and remove the store for a specific namespace."""
-    if namespace in _namespace_stores:
-        store = _namespace_stores.pop(namespace)
-        await store.close()
-        logger.info(f"Closed store for namespace: {namespace}")
+    await store_registry.close(namespace)
 
 async def close_all_namespace_stores():
     """Close all namespace stores."""
-    for namespace, store in list(_namespace_stores.items()):
-        await store.close()
-        logger.info(f"Closed store for namespace: {namespace}")
-    _namespace_stores.clear()
+    await store_registry.close_all()
 
 @dataclass
 class AppContext:
@@ -118,6 +361,9 @@ async def get_app_context(ctx: Context) -> AppContext:
 async def taskhub_lifespan(namespace: str = None, hunter_id: str = None):
     """Application lifespan context manager with namespace and hunter ID."""
     global _app_context, _current_namespace, _current_hunter_id
+    scheduler: Optional[MaintenanceScheduler] = None
+    # Holds the namespace's store in use for the whole lifespan
+    stores = AsyncExitStack()
     
     # Use provided values or current ones
     if namespace:
@@ -126,32 +372,32 @@ async def taskhub_lifespan(namespace: str = None, hunter_id: str = None):
         _current_hunter_id = hunter_id
     
     try:
-        # Initialize stores with namespace
-        db_path = config.get_database_path(_current_namespace)
-        
-        namespace_store = SQLiteStore(db_path)
-        await namespace_store.connect()
+        # The registry's store for the namespace, shared with MCP requests so a file
+        # has one ready queue and one lease manager
+        namespace_store = await stores.enter_async_context(store_registry.acquire(_current_namespace))
         
         _app_context = TaskhubAppContext(
             namespace_store=namespace_store,
             current_namespace=_current_namespace,
-            current_hunter_id=_current_hunter_id
+            current_hunter_id=_current_hunter_id,
         )
         
         logger.info(f"Taskhub app context initialized - namespace: {_current_namespace}, hunter_id: {_current_hunter_id}")
         
-        # Start stale task check scheduler
-        stale_task_task = asyncio.create_task(run_stale_task_check())
+        # Start maintenance jobs (stale sweep, archival, WAL checkpoint) for all namespaces
+        scheduler = create_maintenance_scheduler(store_registry.maintenance)
+        scheduler.start()
+        store_registry.start_idle_sweeper()
         
         yield _app_context
         
     finally:
-        # Cancel stale task check
-        stale_task_task.cancel()
-        try:
-            await stale_task_task
-        except asyncio.CancelledError:
-            pass
+        # Stop maintenance jobs
+        if scheduler:
+            await scheduler.stop()
+        await store_registry.stop_idle_sweeper()
+        await stores.aclose()
+        await close_all_namespace_stores()
         
         # Close context
         if _app_context:
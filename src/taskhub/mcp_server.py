@@ -13,7 +13,6 @@ from contextlib import asynccontextmanager
 from typing import Any, Optional
 
 # Import our modularized components
-from taskhub.utils.scheduler_utils import run_stale_task_check
 from taskhub.context import taskhub_lifespan
 
 # Import the global MCP instance
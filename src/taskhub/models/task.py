@@ -60,6 +60,20 @@ class Task(BaseModel):
     report_id: str | None = Field(None, description="关联的报告ID")
 
 
+class TaskSummary(BaseModel):
+    """任务摘要模型，列表接口只读取这些列，不加载详情和评价"""
+
+    id: str = Field(..., description="任务唯一标识")
+    name: str = Field(..., description="任务名称")
+    required_skill: str = Field(..., description="完成任务所需的核心技能")
+    status: TaskStatus = Field(default=TaskStatus.PENDING, description="任务状态")
+    priority: int = Field(default=0, description="任务优先级")
+    hunter_id: str | None = Field(None, description="认领任务的猎人ID")
+    published_by_hunter_id: str | None = Field(None, description="任务发布者ID")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
 class TaskCreateRequest(BaseModel):
     """任务创建请求"""
 
@@ -68,6 +82,8 @@ class TaskCreateRequest(BaseModel):
     required_skill: str = Field(..., description="所需技能")
     depends_on: list[str] = Field(default_factory=list)
     parent_task_id: str | None = None
+    task_type: TaskType = Field(default=TaskType.NORMAL, description="任务类型")
+    key: str | None = Field(None, description="批量发布时的引用键，同批任务可在depends_on中引用")
 
 
 class TaskUpdateRequest(BaseModel):
@@ -5,11 +5,17 @@ Taskhub services package.
 # Import all service functions for easy access
 from .task_service import (
     task_publish,
+    task_publish_many,
     task_claim,
+    task_claim_next,
+    task_wait_for,
     task_start,
     task_complete,
     get_task,
+    check_task_fields,
     task_list,
+    task_list_page,
+    task_search,
     task_delete,
     task_archive,
 )
@@ -19,6 +25,7 @@ from .hunter_service import (
     hunter_study,
     get_hunter,
     hunter_list,
+    hunter_list_page,
 )
 
 from .knowledge_service import (
@@ -37,12 +44,14 @@ from .discussion_service import (
     get_unread_messages,
     mark_as_read,
     get_all_messages,
+    discussion_search,
 )
 
 from .report_service import (
     report_submit,
     report_evaluate,
     report_list,
+    report_list_page,
 )
 
 from .system_service import (
@@ -52,11 +61,17 @@ from .system_service import (
 __all__ = [
     # Task services
     "task_publish",
+    "task_publish_many",
     "task_claim",
+    "task_claim_next",
+    "task_wait_for",
     "task_start",
     "task_complete",
     "get_task",
+    "check_task_fields",
     "task_list",
+    "task_list_page",
+    "task_search",
     "task_delete",
     "task_archive",
     
@@ -65,6 +80,7 @@ __all__ = [
     "hunter_study",
     "get_hunter",
     "hunter_list",
+    "hunter_list_page",
     
     # Knowledge services
     "knowledge_add",
@@ -80,11 +96,13 @@ __all__ = [
     "get_unread_messages",
     "mark_as_read",
     "get_all_messages",
+    "discussion_search",
     
     # Report services
     "report_submit",
     "report_evaluate",
     "report_list",
+    "report_list_page",
     
     # System services
     "get_system_guide",
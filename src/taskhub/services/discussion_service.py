@@ -59,3 +59,21 @@ async def get_all_messages(store: SQLiteStore) -> list[DiscussionMessage]:
         List of all DiscussionMessages
     """
     return await store.get_latest_messages(100)
+
+
+async def discussion_search(
+    store: SQLiteStore, query: str, limit: int = 20, offset: int = 0
+) -> tuple[list[tuple[DiscussionMessage, str, float]], int | None]:
+    """Full-text search over discussion messages.
+    
+    Args:
+        store: The database store
+        query: Free-text query; every term must match
+        limit: Maximum number of hits to return
+        offset: Number of hits to skip, for paging
+        
+    Returns:
+        (message, snippet, score) hits ranked by bm25, best first, and the offset of
+        the next page (None on the last page)
+    """
+    return await store.search_discussion(query, limit=limit, offset=offset)
@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 
 from taskhub.models.hunter import Hunter
 from taskhub.services import knowledge_service
+from taskhub.storage.pagination import DEFAULT_PAGE_SIZE
 from taskhub.storage.sqlite_store import SQLiteStore
 from taskhub.utils.id_generator import generate_id
 
@@ -59,7 +60,7 @@ async def hunter_register(store: SQLiteStore, hunter_id: str, skills: dict[str,
                     logger.debug(f"Added new skill {skill_name} with level {skill_level} to hunter {hunter_id}")
         
         # 更新时间戳
-        hunter.updated_at = datetime.now()
+        hunter.updated_at = datetime.now(timezone.utc)
 
     await store.save_hunter(hunter)
     return hunter
@@ -104,6 +105,13 @@ async def hunter_list(store: SQLiteStore) -> list[Hunter]:
     return await store.list_hunters()
 
 
+async def hunter_list_page(
+    store: SQLiteStore, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+) -> tuple[list[Hunter], str | None]:
+    """List one page of hunters and the cursor of the next page (None on the last page)."""
+    return await store.list_hunters_page(limit=limit, cursor=cursor)
+
+
 async def adjust_hunter_reputation(store: SQLiteStore, hunter_id: str, new_reputation: int) -> Hunter:
     """Manually adjust a hunter's reputation."""
     hunter = await store.get_hunter(hunter_id)
@@ -142,27 +150,10 @@ async def find_best_hunter_for_task(
     Returns:
         The best matching hunter, or None if no suitable hunter is found
     """
-    all_hunters = await store.list_hunters()
-
-    eligible_hunters = []
-    for hunter in all_hunters:
-        if (
-            hunter.id not in exclude_hunter_ids
-            and hunter.status == "active"
-            and skill in hunter.skills
-            and hunter.skills[skill] > 0  # 确保技能水平大于0
-        ):
-            eligible_hunters.append(hunter)
-
-    if not eligible_hunters:
+    best_hunter = await store.find_best_hunter(skill, exclude_hunter_ids)
+    if not best_hunter:
         logger.warning(f"No eligible hunters found for skill '{skill}' excluding {exclude_hunter_ids}")
         return None
 
-    # Scoring algorithm: 70% reputation, 30% penalty for workload
-    best_hunter = max(
-        eligible_hunters,
-        key=lambda h: (h.reputation * 0.7) - (len(h.current_tasks) * 0.3)
-    )
-
     logger.info(f"Best hunter found for skill '{skill}': {best_hunter.id} with reputation {best_hunter.reputation}")
     return best_hunter
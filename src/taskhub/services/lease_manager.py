@@ -0,0 +1,150 @@
+"""
+租约管理 - returns abandoned claims to the pool as soon as their lease expires.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from taskhub.models.task import Task, TaskStatus
+from taskhub.storage.sqlite_store import SQLiteStore
+from taskhub.storage.timestamps import to_epoch_us
+from taskhub.utils.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseManager:
+    """Expire task leases at the moment they run out.
+
+    Pending expiries live in a min-heap of (lease_expires_at_us, task_id,
+    lease_id). The run loop sleeps until the earliest one is due, or until a
+    claim with an even earlier expiry arrives, then expires each due lease
+    with one conditional UPDATE (``SQLiteStore.expire_lease``). The task goes
+    back to PENDING, or to FAILED after ``max_expiries`` expiries.
+
+    Claims made through the store are pushed onto the heap as they happen.
+    Claims made by other processes are picked up by a periodic resync from
+    the database. A heap entry whose task was started, completed or claimed
+    again in the meantime is harmless, because the UPDATE only matches a task
+    that is still claimed under the same lease.
+
+    Only CLAIMED tasks are expired. Nothing renews a lease while a task is in
+    progress, so in-progress work is left to the stale-task sweep.
+    """
+
+    def __init__(self, store: SQLiteStore, max_expiries: int = 3, resync_interval: float = 60.0):
+        self.store = store
+        self.max_expiries = max(1, max_expiries)
+        self.resync_interval = resync_interval
+        self._heap: list[tuple[int, str, str]] = []
+        self._scheduled: set[tuple[str, str]] = set()
+        self._wakeup = asyncio.Event()
+        self._runner: asyncio.Task | None = None
+        self.expired = 0
+        self.failed = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, expires_us: int, task_id: str, lease_id: str) -> None:
+        if (task_id, lease_id) in self._scheduled:
+            return
+        self._scheduled.add((task_id, lease_id))
+        heapq.heappush(self._heap, (expires_us, task_id, lease_id))
+        if self._heap[0][1:] == (task_id, lease_id):
+            # New earliest expiry: the run loop has to sleep for less
+            self._wakeup.set()
+
+    def track(self, task: Task) -> None:
+        """Schedule the expiry of a freshly claimed task's lease."""
+        if task.status == TaskStatus.CLAIMED and task.lease_id and task.lease_expires_at:
+            self._push(to_epoch_us(task.lease_expires_at), task.id, task.lease_id)
+
+    async def resync(self) -> None:
+        """Schedule every claimed lease in the database, including other processes' claims."""
+        for expires_us, task_id, lease_id in await self.store.list_lease_expiries(TaskStatus.CLAIMED):
+            self._push(expires_us, task_id, lease_id)
+
+    async def expire_due(self, now: datetime | None = None) -> list[Task]:
+        """Expire every scheduled lease that ran out by ``now``; returns the tasks taken back."""
+        now = now or datetime.now(timezone.utc)
+        now_us = to_epoch_us(now)
+        expired = []
+        while self._heap and self._heap[0][0] <= now_us:
+            _, task_id, lease_id = heapq.heappop(self._heap)
+            self._scheduled.discard((task_id, lease_id))
+            task = await self.store.expire_lease(task_id, lease_id, now, self.max_expiries)
+            if task is None:
+                continue
+            expired.append(task)
+            self.expired += 1
+            if task.status == TaskStatus.FAILED:
+                self.failed += 1
+                logger.info(f"任务 {task_id} 租约已过期 {self.max_expiries} 次，标记为失败")
+            else:
+                logger.info(f"任务 {task_id} 租约已过期，重新开放认领")
+        return expired
+
+    def _next_delay(self, next_resync: float) -> float:
+        delay = next_resync - time.monotonic()
+        if self._heap:
+            now_us = to_epoch_us(datetime.now(timezone.utc))
+            delay = min(delay, (self._heap[0][0] - now_us) / 1_000_000)
+        return max(0.0, delay)
+
+    async def _run(self) -> None:
+        next_resync = time.monotonic()
+        while True:
+            # Cleared before the work, so a claim tracked meanwhile still wakes the next wait
+            self._wakeup.clear()
+            try:
+                if time.monotonic() >= next_resync:
+                    await self.resync()
+                    next_resync = time.monotonic() + self.resync_interval
+                await self.expire_due()
+            except Exception as e:
+                logger.error(f"Error while expiring task leases: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_delay(next_resync))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start tracking the store's claims and expiring leases in the background."""
+        if self._runner is None:
+            self.store.add_claim_listener(self.track)
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is None:
+            return
+        self.store.remove_claim_listener(self.track)
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+        self._runner = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "scheduled": len(self._heap),
+            "next_expiry_us": self._heap[0][0] if self._heap else None,
+            "expired": self.expired,
+            "failed": self.failed,
+        }
+
+
+def start_lease_manager(store: SQLiteStore) -> LeaseManager:
+    """Start a LeaseManager for ``store`` configured from ``task.max_lease_expiries``/``task.lease_resync_interval``."""
+    manager = LeaseManager(
+        store,
+        max_expiries=config.get("task.max_lease_expiries", 3),
+        resync_interval=config.get("task.lease_resync_interval", 60),
+    )
+    manager.start()
+    return manager
@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from taskhub.models.hunter import Hunter
 from taskhub.models.report import Report, ReportEvaluation
 from taskhub.models.task import Task, TaskStatus
+from taskhub.storage.pagination import DEFAULT_PAGE_SIZE
 from taskhub.storage.sqlite_store import SQLiteStore
 from taskhub.utils.id_generator import generate_id
 from .task_service import task_publish
@@ -37,28 +38,40 @@ async def report_submit(
         result=result,
         details=details,
     )
-    await store.save_report(report)
 
-    task.status = TaskStatus(status)
-    task.updated_at = datetime.now(timezone.utc)
-    await store.save_task(task)
-    
-    # Automatically create an evaluation task if the completed task was a NORMAL one
-    if task.task_type == "NORMAL":
-        evaluation_task_name = f"评价报告 {report.id[:8]}"
-        evaluation_task = await task_publish(
-            store,
-            name=evaluation_task_name,
-            details="请对附件中的报告进行评价和打分。",
-            required_skill="report_evaluation",
-            publisher_id="system", # Evaluation tasks are published by the system
-            depends_on=[]
+    # Report, task status and the follow-up evaluation task are committed together
+    async with store.transaction():
+        # Guarded on the lease read above, like task_complete: a late report after a sweep
+        # or an expiry (and maybe a new claim) must not overwrite the task
+        task = await store.transition_task(
+            task_id, hunter_id, task.lease_id, (TaskStatus.CLAIMED, TaskStatus.IN_PROGRESS), TaskStatus(status)
         )
+        if not task:
+            raise ValueError(f"Task {task_id} is no longer held by hunter {hunter_id}; its lease may have expired.")
+        await store.save_report(report)
+
+        hunter = await store.get_hunter(hunter_id)
+        if hunter and task_id in hunter.current_tasks:
+            hunter.current_tasks.remove(task_id)
+            hunter.updated_at = datetime.now(timezone.utc)
+            await store.save_hunter(hunter)
         
-        # Update task type and link the report
-        evaluation_task.task_type = "EVALUATION"
-        evaluation_task.report_id = report.id
-        await store.save_task(evaluation_task)
+        # Automatically create an evaluation task if the completed task was a NORMAL one
+        if task.task_type == "NORMAL":
+            evaluation_task_name = f"评价报告 {report.id[:8]}"
+            evaluation_task = await task_publish(
+                store,
+                name=evaluation_task_name,
+                details="请对附件中的报告进行评价和打分。",
+                required_skill="report_evaluation",
+                publisher_id="system", # Evaluation tasks are published by the system
+                depends_on=[]
+            )
+            
+            # Update task type and link the report
+            evaluation_task.task_type = "EVALUATION"
+            evaluation_task.report_id = report.id
+            await store.save_task(evaluation_task)
     
     return report
 
@@ -87,33 +100,33 @@ async def report_evaluate(
         skill_updates=skill_updates or {},
         evaluator_id=evaluator_id,
     )
-    await store.save_evaluation(evaluation)
-
-    report.evaluation = evaluation
-    await store.save_report(report)
-
-    # Update hunter's skills and reputation based on evaluation and task priority
-    task = await store.get_task(report.task_id)
-    if not task:
-        logger.warning(f"Task {report.task_id} not found for evaluated report {report.id}")
-        return report
-
-    hunter = await store.get_hunter(report.hunter_id)
-    if not hunter:
-        logger.warning(f"Hunter {report.hunter_id} not found for evaluated report {report.id}")
-        return report
-
-    # Calculate reputation and skill gain, boosted by task priority
-    priority_bonus = 1 + (task.priority / 100.0)
-    reputation_gain = int((score / 10) * priority_bonus) # Base gain is score/10
-    hunter.reputation += reputation_gain
-
-    if skill_updates:
-        for skill, increment in skill_updates.items():
-            skill_gain = int(increment * priority_bonus)
-            hunter.skills[skill] = hunter.skills.get(skill, 0) + skill_gain
-    
-    await store.save_hunter(hunter)
+    # The evaluated report and the hunter's rewards are committed together
+    async with store.transaction():
+        report.evaluation = evaluation
+        await store.save_report(report)
+
+        # Update hunter's skills and reputation based on evaluation and task priority
+        task = await store.get_task(report.task_id)
+        if not task:
+            logger.warning(f"Task {report.task_id} not found for evaluated report {report.id}")
+            return report
+
+        hunter = await store.get_hunter(report.hunter_id)
+        if not hunter:
+            logger.warning(f"Hunter {report.hunter_id} not found for evaluated report {report.id}")
+            return report
+
+        # Calculate reputation and skill gain, boosted by task priority
+        priority_bonus = 1 + (task.priority / 100.0)
+        reputation_gain = int((score / 10) * priority_bonus) # Base gain is score/10
+        hunter.reputation += reputation_gain
+
+        if skill_updates:
+            for skill, increment in skill_updates.items():
+                skill_gain = int(increment * priority_bonus)
+                hunter.skills[skill] = hunter.skills.get(skill, 0) + skill_gain
+        
+        await store.save_hunter(hunter)
     
     # 检查特性开关和评价分数
     from taskhub.utils.config import config
@@ -158,6 +171,18 @@ async def report_list(store: SQLiteStore, task_id: str | None = None, hunter_id:
     return await store.list_reports(task_id, hunter_id, status)
 
 
+async def report_list_page(
+    store: SQLiteStore,
+    task_id: str | None = None,
+    hunter_id: str | None = None,
+    status: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> tuple[list[Report], str | None]:
+    """List one page of reports and the cursor of the next page (None on the last page)."""
+    return await store.list_reports_page(task_id, hunter_id, status, limit=limit, cursor=cursor)
+
+
 async def delete_all_reports(store: SQLiteStore) -> None:
     """Delete all reports from the database."""
     await store.delete_all_reports()
@@ -3,11 +3,16 @@ System-level service functions for the Taskhub system.
 """
 
 import logging
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from taskhub.models.hunter import Hunter
 from taskhub.models.task import Task, TaskStatus
 from taskhub.storage.sqlite_store import SQLiteStore
+from taskhub.utils.config import config
+from taskhub.utils.performance_monitor import record_metric
+from .lease_manager import LeaseManager
 
 logger = logging.getLogger(__name__)
 
@@ -30,36 +35,37 @@ async def get_system_guide() -> str:
         return f"读取taskhub_guide.md文件时出错: {str(e)}"
 
 async def get_system_stats(store: SQLiteStore) -> dict:
-    """Get statistics for the entire system for the admin dashboard."""
-    hunters = await store.list_hunters()
-    tasks = await store.list_tasks()
+    """Get statistics for the entire system for the admin dashboard.
 
-    # Get active hunters (e.g., those assigned to a task in progress)
-    in_progress_hunter_ids = {
-        t.hunter_id for t in tasks if t.status == TaskStatus.IN_PROGRESS and t.hunter_id
-    }
-    active_hunters = len(in_progress_hunter_ids)
+    All counts are aggregated in SQL, so the cost does not depend on loading
+    every task or hunter.
+    """
+    by_status = await store.task_counts()
+    by_skill = await store.task_counts(by="skill")
 
     stats = {
-        "total_tasks": len(tasks),
-        "in_progress": len(
-            [t for t in tasks if t.status == TaskStatus.IN_PROGRESS]
-        ),
-        "pending": len([t for t in tasks if t.status == TaskStatus.PENDING]),
-        "active_hunters": active_hunters,
+        "total_tasks": sum(by_status.values()),
+        "in_progress": by_status.get(TaskStatus.IN_PROGRESS.value, 0),
+        "pending": by_status.get(TaskStatus.PENDING.value, 0),
+        # Active hunters are those assigned to a task in progress
+        "active_hunters": await store.count_hunters(TaskStatus.IN_PROGRESS),
+        "total_hunters": await store.count_hunters(),
+        "by_status": by_status,
+        "by_skill": by_skill,
+        "backlog_by_skill": {
+            skill: counts[TaskStatus.PENDING.value]
+            for skill, counts in by_skill.items()
+            if TaskStatus.PENDING.value in counts
+        },
+        "by_publisher": await store.task_counts(by="publisher"),
     }
     return stats
 
 
 async def get_all_tasks(store: SQLiteStore) -> list[dict]:
     """Get a list of all tasks with essential details for the admin table."""
-    tasks = await store.list_tasks()
-    
-    # Sort tasks by a reasonable default, e.g., status
-    tasks.sort(key=lambda t: t.status.value)
-
     task_list = []
-    for task in tasks:
+    async for task in store.iter_tasks(summary=True):
         task_list.append(
             {
                 "id": task.id,
@@ -68,6 +74,9 @@ async def get_all_tasks(store: SQLiteStore) -> list[dict]:
                 "assignee": task.hunter_id[:8] + "..." if task.hunter_id else "Unassigned",
             }
         )
+
+    # Sort tasks by a reasonable default, e.g., status
+    task_list.sort(key=lambda t: t["status"])
     return task_list
 
 
@@ -115,17 +124,34 @@ async def get_task_with_details(store: SQLiteStore, task_id: str) -> dict | None
     return task_dict
 
 
+def stale_task_rules() -> list[tuple[TaskStatus, timedelta, str]]:
+    """过期规则 (状态, 最长未更新时间, 原因)，阈值取自配置"""
+    in_progress_hours = config.get("workflow.evaluation_task_timeout_hours", 24)
+    claimed_minutes = config.get("task.max_lease_duration", 120)
+    return [
+        (TaskStatus.IN_PROGRESS, timedelta(hours=in_progress_hours), f"超时{in_progress_hours}小时未更新"),
+        (TaskStatus.CLAIMED, timedelta(minutes=claimed_minutes), f"认领后{claimed_minutes}分钟未开始"),
+    ]
+
+
+# 过期任务检查的累计统计
+stale_sweep_stats = {"runs": 0, "failed_tasks": 0, "last_duration": 0.0, "last_failed": 0}
+
+
 async def check_and_escalate_stale_tasks(store: SQLiteStore) -> int:
     """
     检查并升级过期的任务。
     
-    检查标准：
-    - 处于IN_PROGRESS状态超过24小时未更新的任务
-    - 标记为CLAIMED但超过12小时未开始处理的任务
+    检查标准（阈值见 stale_task_rules）：
+    - 处于IN_PROGRESS状态超过 workflow.evaluation_task_timeout_hours 小时未更新的任务
+    - 标记为CLAIMED但超过 task.max_lease_duration 分钟未开始处理的任务
+    
+    租约已到期的认领先按 LeaseManager 的规则退回待认领，再应用上述规则：
+    维护任务可能运行在没有 LeaseManager 的短期 store 上，否则这些认领会被直接标记为失败。
     
     升级操作：
-    - 将过期任务状态改为FAILED
-    - 记录失败原因
+    - 每条规则执行一条带索引的 UPDATE ... RETURNING id，将过期任务状态改为FAILED
+    - 记录耗时和处理数量
     - 返回处理的任务数量
     
     Args:
@@ -134,36 +160,29 @@ async def check_and_escalate_stale_tasks(store: SQLiteStore) -> int:
     Returns:
         int: 被升级的任务数量
     """
-    from datetime import datetime, timedelta, timezone
-    from taskhub.models.task import TaskStatus
-    
     try:
-        tasks = await store.list_tasks()
+        start = time.perf_counter()
         stale_count = 0
-        
         now = datetime.now(timezone.utc)
-        
-        for task in tasks:
-            if task.status == TaskStatus.IN_PROGRESS:
-                # 检查是否超过24小时未更新
-                if task.updated_at and (now - task.updated_at) > timedelta(hours=24):
-                    logger.info(f"任务 {task.id} 超时24小时未更新，标记为失败")
-                    task.status = TaskStatus.FAILED
-                    task.updated_at = now
-                    await store.save_task(task)
-                    stale_count += 1
-                    
-            elif task.status == TaskStatus.CLAIMED:
-                # 检查是否超过12小时未开始处理
-                if task.updated_at and (now - task.updated_at) > timedelta(hours=12):
-                    logger.info(f"任务 {task.id} 认领后12小时未开始，标记为失败")
-                    task.status = TaskStatus.FAILED
-                    task.updated_at = now
-                    await store.save_task(task)
-                    stale_count += 1
-        
+
+        leases = LeaseManager(store, max_expiries=config.get("task.max_lease_expiries", 3))
+        await leases.resync()
+        await leases.expire_due(now)
+
+        for status, max_age, reason in stale_task_rules():
+            task_ids = await store.fail_stale_tasks(status, now - max_age)
+            for task_id in task_ids:
+                logger.info(f"任务 {task_id} {reason}，标记为失败")
+            stale_count += len(task_ids)
+
+        duration = time.perf_counter() - start
+        record_metric("stale_task_sweep", duration)
+        stale_sweep_stats["runs"] += 1
+        stale_sweep_stats["failed_tasks"] += stale_count
+        stale_sweep_stats["last_duration"] = duration
+        stale_sweep_stats["last_failed"] = stale_count
         if stale_count > 0:
-            logger.info(f"成功升级 {stale_count} 个过期任务")
+            logger.info(f"成功升级 {stale_count} 个过期任务，耗时 {duration * 1000:.1f}ms")
         
         return stale_count
         
@@ -172,6 +191,32 @@ async def check_and_escalate_stale_tasks(store: SQLiteStore) -> int:
         raise
 
 
+async def archive_old_tasks(store: SQLiteStore, older_than: timedelta, batch_size: int = 500) -> dict:
+    """
+    将超过指定时间未更新的已完成/失败任务（及其报告）批量移入归档库，然后增量回收热库空间。
+    
+    Args:
+        store: SQLiteStore实例
+        older_than: 任务最后更新时间距今超过该时长才会被归档
+        batch_size: 每个写事务移动的任务数量，避免长时间占用写连接
+        
+    Returns:
+        dict: {"archived": 归档任务数, "pages_freed": 回收的页数}
+    """
+    cutoff = datetime.now(timezone.utc) - older_than
+    archived = 0
+    while True:
+        moved = await store.archive_tasks_before(cutoff, limit=batch_size)
+        archived += moved
+        if moved < batch_size:
+            break
+
+    pages_freed = await store.incremental_vacuum() if archived else 0
+    if archived:
+        logger.info(f"归档了 {archived} 个任务，回收 {pages_freed} 页")
+    return {"archived": archived, "pages_freed": pages_freed}
+
+
 async def get_task_interaction_graph(store: SQLiteStore) -> dict:
     """
     获取任务交互网络图所需的数据。
@@ -179,7 +224,6 @@ async def get_task_interaction_graph(store: SQLiteStore) -> dict:
     边: Published, Claimed
     """
     hunters = await store.list_hunters()
-    tasks = await store.list_tasks()
 
     nodes = []
     links = []
@@ -195,7 +239,7 @@ async def get_task_interaction_graph(store: SQLiteStore) -> dict:
         })
 
     # 创建任务节点并建立连接
-    for task in tasks:
+    async for task in store.iter_tasks(summary=True):
         nodes.append({
             "id": f"task-{task.id}",
             "name": f"Task {task.name[:15]}",
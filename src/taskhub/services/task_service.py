@@ -6,8 +6,11 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from taskhub.models.hunter import Hunter
-from taskhub.models.task import Task, TaskStatus
+from taskhub.models.task import Task, TaskCreateRequest, TaskStatus, TaskSummary
+from taskhub.storage.pagination import DEFAULT_PAGE_SIZE
 from taskhub.storage.sqlite_store import SQLiteStore
+from taskhub.services.task_waiter import get_task_waiter
+from taskhub.utils.config import config
 from taskhub.utils.id_generator import generate_id
 
 logger = logging.getLogger(__name__)
@@ -59,6 +62,68 @@ async def task_publish(
     return task
 
 
+async def task_publish_many(
+    store: SQLiteStore,
+    tasks: list[TaskCreateRequest | dict],
+    publisher_id: str,
+) -> list[Task]:
+    """Publish a batch of tasks atomically.
+    
+    The publisher is looked up once and all tasks are inserted in a single
+    transaction, so either the whole batch is published or none of it.
+    A task may give itself a ``key``; other tasks in the same batch can use that
+    key in ``depends_on`` and it is replaced with the generated task ID.
+    
+    Args:
+        store: The database store to save the tasks to.
+        tasks: The tasks to publish, as TaskCreateRequest objects or dictionaries.
+        publisher_id: The ID of the hunter publishing the tasks.
+        
+    Returns:
+        The newly created Task objects, in input order.
+        
+    Raises:
+        ValueError: If the publisher is not found, a task is invalid or a key is duplicated.
+    """
+    requests = [req if isinstance(req, TaskCreateRequest) else TaskCreateRequest(**req) for req in tasks]
+
+    publisher = await store.get_hunter(publisher_id)
+    if not publisher:
+        raise ValueError(f"Publisher (hunter) with ID {publisher_id} not found.")
+    priority = publisher.reputation // 10
+
+    ids_by_key: dict[str, str] = {}
+    task_ids = []
+    for req in requests:
+        task_id = generate_id("task")
+        if req.key is not None:
+            if req.key in ids_by_key:
+                raise ValueError(f"Duplicate task key in batch: {req.key}")
+            ids_by_key[req.key] = task_id
+        task_ids.append(task_id)
+
+    new_tasks = [
+        Task(
+            id=task_id,
+            name=req.name,
+            details=req.details,
+            required_skill=req.required_skill,
+            published_by_hunter_id=publisher_id,
+            priority=priority,
+            depends_on=[ids_by_key.get(dep, dep) for dep in req.depends_on],
+            parent_task_id=ids_by_key.get(req.parent_task_id, req.parent_task_id),
+            task_type=req.task_type,
+        )
+        for task_id, req in zip(task_ids, requests)
+    ]
+    await store.save_tasks_many(new_tasks)
+    logger.info(f"Published {len(new_tasks)} tasks for publisher {publisher_id}")
+    return new_tasks
+
+
+LEASE_DURATION = timedelta(minutes=config.get("task.default_lease_duration", 30))
+
+
 async def task_claim(store: SQLiteStore, task_id: str, hunter_id: str) -> Task:
     task = await store.get_task(task_id)
     if not task:
@@ -69,6 +134,8 @@ async def task_claim(store: SQLiteStore, task_id: str, hunter_id: str) -> Task:
     # Rule: A hunter cannot claim their own task
     if task.published_by_hunter_id == hunter_id:
         raise ValueError("A hunter cannot claim their own published task.")
+    if await store.get_unmet_dependencies(task_id):
+        raise ValueError(f"Task {task_id} is blocked by dependencies that are not completed yet.")
 
     hunter = await store.get_hunter(hunter_id)
     if not hunter:
@@ -79,13 +146,103 @@ async def task_claim(store: SQLiteStore, task_id: str, hunter_id: str) -> Task:
             "Please learn this skill and re-register your skills with 0 skill points to start."
         )
 
-    task.status = TaskStatus.CLAIMED
-    task.hunter_id = hunter_id
-    task.lease_id = generate_id("lease")
-    task.lease_expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
-    task.updated_at = datetime.now(timezone.utc)
-    await store.save_task(task)
-    return task
+    # The store only claims the row if it is still pending, so a concurrent claim loses here.
+    # The claim and the hunter's task list are committed together.
+    async with store.transaction():
+        claimed = await store.claim_task(
+            task_id, hunter_id, generate_id("lease"), datetime.now(timezone.utc) + LEASE_DURATION
+        )
+        if claimed:
+            await _add_current_task(store, hunter_id, claimed.id)
+    # Raised after the block: losing the race wrote nothing, so there is nothing to roll back
+    if not claimed:
+        raise ValueError(f"Task {task_id} was claimed by another hunter.")
+    return claimed
+
+
+async def _add_current_task(store: SQLiteStore, hunter_id: str, task_id: str) -> None:
+    hunter = await store.get_hunter(hunter_id)
+    if hunter and task_id not in hunter.current_tasks:
+        hunter.current_tasks.append(task_id)
+        hunter.updated_at = datetime.now(timezone.utc)
+        await store.save_hunter(hunter)
+
+
+async def task_claim_next(store: SQLiteStore, hunter_id: str, skill: str | None = None) -> Task | None:
+    """Claim the highest-priority ready pending task the hunter can work on.
+
+    Args:
+        store: The database store.
+        hunter_id: The ID of the hunter claiming a task.
+        skill: Optional skill to restrict the search to. Defaults to all of the hunter's skills.
+
+    Returns:
+        The claimed task, or None if no ready task is available.
+
+    Raises:
+        ValueError: If the hunter is not found or does not possess the requested skill.
+    """
+    hunter = await store.get_hunter(hunter_id)
+    if not hunter:
+        raise ValueError(f"Hunter {hunter_id} not found.")
+    if skill is not None and skill not in hunter.skills:
+        raise ValueError(f"Hunter {hunter_id} does not possess the required skill: {skill}.")
+
+    skills = [skill] if skill is not None else list(hunter.skills)
+    return await _claim_next(store, hunter_id, skills)
+
+
+async def _claim_next(store: SQLiteStore, hunter_id: str, skills: list[str]) -> Task | None:
+    async with store.transaction():
+        claimed = await store.claim_next_task(
+            hunter_id, skills, generate_id("lease"), datetime.now(timezone.utc) + LEASE_DURATION
+        )
+        if claimed:
+            await _add_current_task(store, hunter_id, claimed.id)
+    return claimed
+
+
+async def task_wait_for(
+    store: SQLiteStore, hunter_id: str, skills: list[str] | None = None, timeout: float = 30
+) -> Task | None:
+    """Claim the next ready task for one of ``skills``, waiting for one if there is none yet.
+
+    The call returns as soon as a matching task is published or released by
+    a lease expiry and claimed for the hunter, like ``task_claim_next``.
+    Waits are capped at ``task.wait_max_timeout`` seconds.
+
+    Args:
+        store: The database store.
+        hunter_id: The ID of the hunter waiting for work.
+        skills: Skills to wait for. Defaults to all of the hunter's skills.
+        timeout: Seconds to wait before giving up.
+
+    Returns:
+        The claimed task, or None if none became available within the timeout.
+
+    Raises:
+        ValueError: If the hunter is not found or does not possess one of the skills.
+    """
+    hunter = await store.get_hunter(hunter_id)
+    if not hunter:
+        raise ValueError(f"Hunter {hunter_id} not found.")
+    missing = [skill for skill in skills or [] if skill not in hunter.skills]
+    if missing:
+        raise ValueError(f"Hunter {hunter_id} does not possess the required skills: {', '.join(missing)}.")
+
+    skills = list(skills) if skills else list(hunter.skills)
+    if not skills:
+        return None
+    timeout = max(0.0, min(timeout, config.get("task.wait_max_timeout", 60)))
+    waiter = get_task_waiter(store, poll_interval=config.get("task.wait_poll_interval", 5))
+    return await waiter.wait(skills, timeout, lambda: _claim_if_ready(store, hunter_id, skills))
+
+
+async def _claim_if_ready(store: SQLiteStore, hunter_id: str, skills: list[str]) -> Task | None:
+    # Parked hunters retry every poll interval; only take the writer when there is a candidate
+    if not await store.has_ready_task(hunter_id, skills):
+        return None
+    return await _claim_next(store, hunter_id, skills)
 
 
 async def task_start(store: SQLiteStore, task_id: str, hunter_id: str) -> Task:
@@ -110,11 +267,13 @@ async def task_start(store: SQLiteStore, task_id: str, hunter_id: str) -> Task:
     if task.status != TaskStatus.CLAIMED:
         raise ValueError(f"Task {task_id} is not claimed, current status: {task.status}")
     
-    task.status = TaskStatus.IN_PROGRESS
-    task.started_at = datetime.now(timezone.utc)
-    task.updated_at = datetime.now(timezone.utc)
-    await store.save_task(task)
-    return task
+    # Guarded on the lease read above: if it expired and the task was claimed again since, nothing is written
+    started = await store.transition_task(
+        task_id, hunter_id, task.lease_id, TaskStatus.CLAIMED, TaskStatus.IN_PROGRESS
+    )
+    if not started:
+        raise ValueError(f"Task {task_id} is no longer claimed by hunter {hunter_id}; its lease may have expired.")
+    return started
 
 
 async def task_complete(store: SQLiteStore, task_id: str, result: str, status: str, hunter_id: str) -> Task:
@@ -123,7 +282,7 @@ async def task_complete(store: SQLiteStore, task_id: str, result: str, status: s
     Args:
         store: The database store.
         task_id: The ID of the task to complete.
-        result: The result of the task.
+        result: The result of the task. Tasks have no result column; it is kept by the report.
         status: The final status of the task.
         hunter_id: The ID of the hunter completing the task.
         
@@ -141,17 +300,17 @@ async def task_complete(store: SQLiteStore, task_id: str, result: str, status: s
     if task.status != TaskStatus.IN_PROGRESS:
         raise ValueError(f"Task {task_id} is not in progress, current status: {task.status}")
     
-    task.status = TaskStatus(status)
-    task.result = result
-    task.completed_at = datetime.now(timezone.utc)
-    task.updated_at = datetime.now(timezone.utc)
-    await store.save_task(task)
+    completed = await store.transition_task(
+        task_id, hunter_id, task.lease_id, TaskStatus.IN_PROGRESS, TaskStatus(status)
+    )
+    if not completed:
+        raise ValueError(f"Task {task_id} is no longer held by hunter {hunter_id}; its lease may have expired.")
     
     # 确保评价任务完成后不会触发新任务
     # 对于非评价任务，可以在这里添加触发后续任务的逻辑
     # 但对于EVALUATION类型的任务，工作流到此结束
     
-    return task
+    return completed
 
 
 async def get_task(store: SQLiteStore, task_id: str) -> Task | None:
@@ -176,6 +335,73 @@ async def task_list(
     return await store.list_tasks(status.value if status else None, required_skill, hunter_id)
 
 
+def check_task_fields(fields: list[str] | None) -> bool:
+    """Validate a ``fields`` projection and tell whether TaskSummary rows can serve it.
+    
+    Raises:
+        ValueError: If a field is not a task field.
+    """
+    if not fields:
+        return False
+    unknown = [field for field in fields if field not in Task.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown task fields: {', '.join(unknown)}")
+    return set(fields) <= set(TaskSummary.model_fields)
+
+
+async def task_list_page(
+    store: SQLiteStore,
+    status: TaskStatus | None = None,
+    required_skill: str | None = None,
+    hunter_id: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    summary: bool = False,
+) -> tuple[list[Task] | list[TaskSummary], str | None]:
+    """List one page of tasks.
+    
+    Args:
+        store: The database store.
+        status: Optional status to filter by.
+        required_skill: Optional skill to filter by.
+        hunter_id: Optional assignee to filter by.
+        limit: Maximum number of tasks to return.
+        cursor: Cursor returned with the previous page, or None for the first page.
+        summary: Return TaskSummary rows, which skip details, evaluation and the other wide columns.
+        
+    Returns:
+        The tasks of the page and the cursor of the next page (None on the last page).
+    """
+    list_page = store.list_task_summaries_page if summary else store.list_tasks_page
+    return await list_page(status.value if status else None, required_skill, hunter_id, limit=limit, cursor=cursor)
+
+
+async def task_search(
+    store: SQLiteStore,
+    query: str,
+    status: TaskStatus | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[list[tuple[Task, str, float]], int | None]:
+    """Full-text search over task names and details.
+    
+    Args:
+        store: The database store.
+        query: Free-text query; every term must match.
+        status: Optional status to filter by.
+        limit: Maximum number of hits to return.
+        offset: Number of hits to skip, for paging.
+        
+    Returns:
+        (task, snippet, score) hits ranked by bm25, best first, and the offset of the
+        next page (None on the last page).
+        
+    Raises:
+        ValueError: If the query is empty or limit/offset are out of range.
+    """
+    return await store.search_tasks(query, status.value if status else None, limit=limit, offset=offset)
+
+
 async def task_delete(store: SQLiteStore, task_id: str) -> None:
     """Delete a task from the system.
     
@@ -198,13 +424,26 @@ async def delete_all_tasks(store: SQLiteStore) -> None:
 
 
 async def task_archive(store: SQLiteStore, task_id: str) -> Task:
+    """Move a completed or failed task and its reports into the archive database.
+    
+    Args:
+        store: The database store.
+        task_id: The ID of the task to archive.
+        
+    Returns:
+        The archived task, as read back from the archive.
+        
+    Raises:
+        ValueError: If the task is not found, not finished, or still needed by an unfinished dependent.
+    """
     task = await store.get_task(task_id)
     if not task:
         raise ValueError(f"Task not found: {task_id}")
-    if task.status not in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
+    if task.status == TaskStatus.ARCHIVED and task.is_archived:
+        return task
+    if task.status not in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.ARCHIVED]:
         raise ValueError(f"Task {task_id} must be completed or failed to be archived")
 
-    task.status = TaskStatus.ARCHIVED
-    task.updated_at = datetime.now(timezone.utc)
-    await store.save_task(task)
-    return task
+    if not await store.archive_tasks([task_id]):
+        raise ValueError(f"Task {task_id} cannot be archived while unfinished tasks depend on it")
+    return await store.get_task(task_id)
@@ -0,0 +1,105 @@
+"""
+任务等待 - parks idle hunters until a task for one of their skills is ready.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Awaitable, Callable
+
+from taskhub.models.task import Task
+from taskhub.storage.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+class TaskWaiter:
+    """Long-poll support for one store: an asyncio.Condition per skill.
+
+    The store wakes a skill's waiters whenever it saves a pending task of
+    that skill or a lease expiry releases one. Each skill also has a version
+    counter, bumped on every wakeup. A waiter reads the versions before it
+    tries to claim and only sleeps while none of them has moved, so a task
+    published during the attempt is not missed.
+
+    Tasks that become ready in other ways (a dependency completing, a
+    publish from another process) don't signal. Waiters retry the claim
+    every ``poll_interval`` seconds to cover those.
+    """
+
+    def __init__(self, store: SQLiteStore, poll_interval: float = 5.0):
+        # No reference to the store is kept: get_task_waiter's map is keyed weakly by it
+        self.poll_interval = poll_interval
+        self._conditions: dict[str, asyncio.Condition] = {}
+        self._versions: dict[str, int] = {}
+        self.waiting = 0
+        self.wakeups = 0
+        store.add_ready_listener(self.notify)
+
+    def _condition(self, skill: str) -> asyncio.Condition:
+        condition = self._conditions.get(skill)
+        if condition is None:
+            condition = self._conditions[skill] = asyncio.Condition()
+        return condition
+
+    async def notify(self, skill: str) -> None:
+        """Wake everyone waiting for ``skill``."""
+        self._versions[skill] = self._versions.get(skill, 0) + 1
+        condition = self._conditions.get(skill)
+        if condition is None:
+            return
+        async with condition:
+            condition.notify_all()
+        self.wakeups += 1
+
+    async def _changed(self, skill: str, seen: int) -> None:
+        condition = self._condition(skill)
+        async with condition:
+            await condition.wait_for(lambda: self._versions.get(skill, 0) != seen)
+
+    async def _wait_any(self, seen: dict[str, int], timeout: float) -> None:
+        waits = [asyncio.create_task(self._changed(skill, version)) for skill, version in seen.items()]
+        try:
+            await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for wait in waits:
+                wait.cancel()
+            await asyncio.gather(*waits, return_exceptions=True)
+
+    async def wait(
+        self, skills: list[str], timeout: float, claim: Callable[[], Awaitable[Task | None]]
+    ) -> Task | None:
+        """Call ``claim`` until it returns a task, sleeping between attempts until a skill is signalled.
+
+        Returns:
+            The claimed task, or None if ``timeout`` seconds passed without one.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self.waiting += 1
+        try:
+            while True:
+                seen = {skill: self._versions.get(skill, 0) for skill in skills}
+                task = await claim()
+                if task is not None:
+                    return task
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                await self._wait_any(seen, min(remaining, self.poll_interval))
+        finally:
+            self.waiting -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {"waiting": self.waiting, "wakeups": self.wakeups, "skills": len(self._conditions)}
+
+
+_waiters: "weakref.WeakKeyDictionary[SQLiteStore, TaskWaiter]" = weakref.WeakKeyDictionary()
+
+
+def get_task_waiter(store: SQLiteStore, poll_interval: float = 5.0) -> TaskWaiter:
+    """The TaskWaiter of ``store``, created and subscribed to it on first use."""
+    waiter = _waiters.get(store)
+    if waiter is None:
+        waiter = _waiters[store] = TaskWaiter(store, poll_interval)
+    return waiter
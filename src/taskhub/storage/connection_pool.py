@@ -0,0 +1,166 @@
+"""
+SQLite连接池 - one serialized writer connection plus a bounded set of readers.
+"""
+
+import sqlite3
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+import anyio
+
+from ..utils.performance_monitor import record_metric
+
+MEMORY_DB = ":memory:"
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # Write-Ahead Logging for better concurrency
+    "PRAGMA synchronous=NORMAL",  # Balance between safety and performance
+    "PRAGMA cache_size=10000",  # Increase cache size
+    "PRAGMA temp_store=memory",  # Use memory for temp operations
+    "PRAGMA mmap_size=268435456",  # 256MB memory-mapped I/O
+)
+
+
+class ConnectionPool:
+    """Connection pool for a single SQLite database file.
+
+    All writes go through one writer connection guarded by an async lock, which
+    matches SQLite's single-writer model and avoids ``database is locked``
+    contention between our own connections. Reads use up to ``size`` reader
+    connections, opened lazily. Waiting for a connection happens on the event
+    loop, so no worker thread is parked while the pool is exhausted.
+
+    An in-memory database cannot be shared between connections, so for
+    ``:memory:`` reads are served by the writer connection.
+
+    ``attach`` maps schema names to further database files that are ATTACHed
+    on every connection, so statements can span them (ATTACH is per
+    connection and cannot run inside a transaction).
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        size: int = 5,
+        timeout: float = 30.0,
+        attach: dict[str, Path | str] | None = None,
+    ):
+        self.db_path = str(db_path)
+        self.attach = {name: str(path) for name, path in (attach or {}).items()}
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._writer: sqlite3.Connection | None = None
+        self._readers: list[sqlite3.Connection] = []
+        self._idle: deque[sqlite3.Connection] = deque()
+        self._write_lock = anyio.Lock()
+        self._reader_slots = anyio.Semaphore(self.size)
+        self._stats = {
+            "writer": {"acquired": 0, "total_wait": 0.0, "max_wait": 0.0},
+            "reader": {"acquired": 0, "total_wait": 0.0, "max_wait": 0.0},
+        }
+
+    @property
+    def is_memory(self) -> bool:
+        return self.db_path == MEMORY_DB
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    def _connect(self, readonly: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if not readonly:
+            # Only takes effect on a new file; existing files need a one-off VACUUM to switch
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        for name, path in self.attach.items():
+            conn.execute(f"ATTACH DATABASE ? AS {name}", (path,))
+            if not readonly:
+                conn.execute(f"PRAGMA {name}.auto_vacuum=INCREMENTAL")
+                conn.execute(f"PRAGMA {name}.journal_mode=WAL")
+        if readonly:
+            conn.execute("PRAGMA query_only=1")
+        return conn
+
+    async def open(self) -> None:
+        """Open the writer connection. Readers are opened on first use."""
+        if self._writer is None:
+            self._writer = await anyio.to_thread.run_sync(self._connect)
+
+    async def close(self) -> None:
+        """Close every connection, waiting for in-flight operations to finish."""
+        async with self._write_lock:
+            for _ in range(self.size):
+                await self._reader_slots.acquire()
+            try:
+                connections = [*self._readers, self._writer]
+                self._readers.clear()
+                self._idle.clear()
+                self._writer = None
+                for conn in connections:
+                    if conn is not None:
+                        await anyio.to_thread.run_sync(conn.close)
+            finally:
+                for _ in range(self.size):
+                    self._reader_slots.release()
+
+    def _record_wait(self, kind: str, wait: float) -> None:
+        stats = self._stats[kind]
+        stats["acquired"] += 1
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+        record_metric(f"db.pool.{kind}_wait", wait)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[sqlite3.Connection]:
+        """Hold the writer connection exclusively."""
+        start = time.perf_counter()
+        async with self._write_lock:
+            self._record_wait("writer", time.perf_counter() - start)
+            if self._writer is None:
+                raise RuntimeError("Connection pool is closed")
+            yield self._writer
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[sqlite3.Connection]:
+        """Borrow a reader connection for the duration of the block."""
+        if self.is_memory:
+            async with self.writer() as conn:
+                yield conn
+            return
+
+        start = time.perf_counter()
+        async with self._reader_slots:
+            self._record_wait("reader", time.perf_counter() - start)
+            if self._writer is None:
+                raise RuntimeError("Connection pool is closed")
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = await anyio.to_thread.run_sync(self._connect, True)
+                self._readers.append(conn)
+            try:
+                yield conn
+            finally:
+                self._idle.append(conn)
+
+    def stats(self) -> dict[str, Any]:
+        """Pool size, open connections and wait-time statistics."""
+        result: dict[str, Any] = {
+            "size": self.size,
+            "open_readers": len(self._readers),
+            "idle_readers": len(self._idle),
+        }
+        for kind, stats in self._stats.items():
+            acquired = stats["acquired"]
+            result[kind] = {
+                **stats,
+                "avg_wait": stats["total_wait"] / acquired if acquired else 0.0,
+            }
+        return result
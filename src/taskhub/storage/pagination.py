@@ -0,0 +1,42 @@
+"""
+Keyset pagination helpers.
+
+Pages are ordered by ``(created_at, id)``. The cursor handed to clients is an
+opaque token encoding the sort key of the last row of the previous page, so
+fetching the next page is an index range scan starting right after it.
+"""
+
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(created_at: str, item_id: str) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    raw = json.dumps([created_at, item_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, item_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+    if not isinstance(created_at, str) or not isinstance(item_id, str):
+        raise ValueError(f"Invalid pagination cursor: {cursor}")
+    return created_at, item_id
+
+
+def check_page_size(limit: int) -> int:
+    """Validate a requested page size."""
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
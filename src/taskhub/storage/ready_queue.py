@@ -0,0 +1,138 @@
+"""
+就绪队列 - in-process index of claimable tasks for SQLiteStore.
+"""
+
+import heapq
+from typing import Any
+
+# (-priority, created_at_us, task_id): highest priority first, then oldest
+Entry = tuple[int, int, str]
+
+
+class ReadyQueue:
+    """Per-skill heaps of the pending tasks whose dependencies are all completed.
+
+    Within a skill, tasks are bucketed by publisher, each bucket a min-heap,
+    and a heap of bucket heads picks the best bucket. ``peek`` therefore finds
+    the best ready task for a set of skills in O(k log n) for k skills
+    without a query, and skipping the claiming hunter's own tasks costs one
+    bucket, however many of them are queued.
+
+    Removal is lazy: ``discard`` and ``add`` only update ``_entries``, and
+    heap items that no longer match it are dropped when they reach the top
+    of their heap. The heaps are rebuilt once dead items clearly outnumber
+    live ones.
+
+    The queue is only an index. The store keeps it in step with the
+    change_log and claims through a conditional UPDATE, so an outdated entry
+    costs one failed claim, never a wrong one.
+    """
+
+    def __init__(self):
+        # task_id -> (heap item, skill, publisher) of the live entry
+        self._entries: dict[str, tuple[Entry, str, str]] = {}
+        self._buckets: dict[tuple[str, str], list[Entry]] = {}
+        # skill -> heap of (bucket head, publisher); stale heads are replaced when found
+        self._heads: dict[str, list[tuple[Entry, str]]] = {}
+        self._items = 0
+        self.rebuilds = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+        self._heads.clear()
+        self._items = 0
+
+    def _push(self, item: Entry, skill: str, publisher: str) -> None:
+        bucket = self._buckets.setdefault((skill, publisher), [])
+        heapq.heappush(bucket, item)
+        self._items += 1
+        if bucket[0] == item:
+            heapq.heappush(self._heads.setdefault(skill, []), (item, publisher))
+            self._items += 1
+
+    def add(self, task_id: str, skill: str, priority: int, created_at_us: int, publisher: str | None = None) -> None:
+        """Add a ready task, or update it if its skill, priority or publisher changed."""
+        item = (-(priority or 0), created_at_us or 0, task_id)
+        # Heads compare (item, publisher) tuples, so None must not meet a str
+        publisher = publisher or ""
+        if self._entries.get(task_id) == (item, skill, publisher):
+            return
+        self._entries[task_id] = (item, skill, publisher)
+        self._push(item, skill, publisher)
+        self._compact()
+
+    def discard(self, task_id: str) -> None:
+        """Forget a task that was claimed, deleted or is no longer ready."""
+        if self._entries.pop(task_id, None) is not None:
+            self._compact()
+
+    def _compact(self) -> None:
+        if self._items <= 4 * len(self._entries) + 64:
+            return
+        entries = list(self._entries.values())
+        self.clear()
+        for item, skill, publisher in sorted(entries):
+            self._push(item, skill, publisher)
+        self._entries = {item[2]: (item, skill, publisher) for item, skill, publisher in entries}
+        self.rebuilds += 1
+
+    def _bucket_head(self, skill: str, publisher: str) -> Entry | None:
+        """Best live item of a bucket, dropping the dead ones above it."""
+        bucket = self._buckets.get((skill, publisher))
+        while bucket:
+            item = bucket[0]
+            if self._entries.get(item[2]) == (item, skill, publisher):
+                return item
+            heapq.heappop(bucket)
+            self._items -= 1
+        self._buckets.pop((skill, publisher), None)
+        return None
+
+    def _top(self, skill: str, exclude_publisher: str | None) -> Entry | None:
+        heads = self._heads.get(skill)
+        skipped = []
+        top = None
+        while heads:
+            item, publisher = heads[0]
+            head = self._bucket_head(skill, publisher)
+            if head != item:
+                # The bucket's head was claimed or superseded; replace it with the current one
+                heapq.heappop(heads)
+                self._items -= 1
+                if head is not None:
+                    heapq.heappush(heads, (head, publisher))
+                    self._items += 1
+                continue
+            if exclude_publisher and publisher == exclude_publisher:
+                # The hunter can't claim their own tasks; look past the bucket, then put it back
+                skipped.append(heapq.heappop(heads))
+                continue
+            top = item
+            break
+        for head in skipped:
+            heapq.heappush(heads, head)
+        return top
+
+    def peek(self, skills: list[str], exclude_publisher: str | None = None) -> str | None:
+        """Id of the highest-priority, oldest ready task for any of ``skills``, or None."""
+        best = None
+        for skill in skills:
+            top = self._top(skill, exclude_publisher)
+            if top is not None and (best is None or top < best):
+                best = top
+        return best[2] if best else None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ready": len(self._entries),
+            "skills": sum(1 for heads in self._heads.values() if heads),
+            "heap_items": self._items,
+            "rebuilds": self.rebuilds,
+        }
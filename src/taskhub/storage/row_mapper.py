@@ -0,0 +1,143 @@
+"""
+行映射器 - trusted fast path from sqlite3 rows to Pydantic models.
+"""
+
+import json
+import sqlite3
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from ..models.discussion import DiscussionMessage
+from ..models.hunter import Hunter
+from ..models.report import Report, ReportEvaluation
+from ..models.task import Task, TaskEvaluation, TaskStatus, TaskSummary, TaskType
+
+M = TypeVar("M", bound=BaseModel)
+
+Converter = Callable[[Any], Any]
+
+
+class RowMapper(Generic[M]):
+    """Build models from rows of our own tables without re-validating them.
+
+    Rows written by the store already satisfy the model schema, so instead of
+    ``dict(row)`` plus a validating ``Model(**data)`` per row we convert only
+    the columns that need it (JSON, timestamps, enums) and set up the instance
+    state the way ``model_construct`` does. The column-to-field plan is
+    computed once per column layout and reused for every row with that layout.
+
+    NULL columns are left out so the model default applies; columns that are
+    not model fields are ignored.
+    """
+
+    def __init__(self, model: type[M], converters: dict[str, Converter] | None = None):
+        self.model = model
+        self.converters = converters or {}
+        self._plans: dict[tuple[str, ...], list[tuple[int, str, Converter | None]]] = {}
+        self._defaults: list[tuple[str, Any, Callable[[], Any] | None]] = [
+            (name, field.default, field.default_factory)
+            for name, field in model.model_fields.items()
+            if not field.is_required()
+        ]
+
+    def _plan(self, columns: tuple[str, ...]) -> list[tuple[int, str, Converter | None]]:
+        plan = self._plans.get(columns)
+        if plan is None:
+            fields = self.model.model_fields
+            plan = [
+                (index, name, self.converters.get(name))
+                for index, name in enumerate(columns)
+                if name in fields
+            ]
+            self._plans[columns] = plan
+        return plan
+
+    def __call__(self, row: sqlite3.Row) -> M:
+        return self._build(self._plan(tuple(row.keys())), row)
+
+    def many(self, rows: Iterable[sqlite3.Row]) -> list[M]:
+        """Decode a batch of rows sharing one column layout."""
+        rows = list(rows)
+        if not rows:
+            return []
+        plan = self._plan(tuple(rows[0].keys()))
+        return [self._build(plan, row) for row in rows]
+
+    def _build(self, plan: list[tuple[int, str, Converter | None]], row: sqlite3.Row) -> M:
+        values = {}
+        for index, name, convert in plan:
+            value = row[index]
+            if value is not None:
+                values[name] = convert(value) if convert else value
+        fields_set = set(values)
+        for name, default, factory in self._defaults:
+            if name not in values:
+                values[name] = factory() if factory is not None else default
+        # Same state model_construct() leaves behind, minus its per-field bookkeeping
+        instance = self.model.__new__(self.model)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+
+def _json_model(model: type[BaseModel]) -> Converter:
+    """Converter for a JSON-encoded nested model; unreadable values decode to None."""
+
+    def convert(value: str) -> BaseModel | None:
+        try:
+            data = json.loads(value)
+            return model(**data) if data else None
+        except (json.JSONDecodeError, TypeError, ValidationError):
+            return None
+
+    return convert
+
+
+TASK_MAPPER: RowMapper[Task] = RowMapper(
+    Task,
+    {
+        "status": TaskStatus,
+        "task_type": TaskType,
+        "depends_on": json.loads,
+        "lease_expires_at": datetime.fromisoformat,
+        "created_at": datetime.fromisoformat,
+        "updated_at": datetime.fromisoformat,
+        "evaluation": _json_model(TaskEvaluation),
+        "is_archived": bool,
+    },
+)
+
+TASK_SUMMARY_MAPPER: RowMapper[TaskSummary] = RowMapper(
+    TaskSummary,
+    {
+        "status": TaskStatus,
+        "created_at": datetime.fromisoformat,
+        "updated_at": datetime.fromisoformat,
+    },
+)
+
+HUNTER_MAPPER: RowMapper[Hunter] = RowMapper(
+    Hunter,
+    {
+        "skills": json.loads,
+        "current_tasks": json.loads,
+        "created_at": datetime.fromisoformat,
+        "updated_at": datetime.fromisoformat,
+        "last_read_discussion_timestamp": datetime.fromisoformat,
+    },
+)
+
+REPORT_MAPPER: RowMapper[Report] = RowMapper(
+    Report,
+    {"evaluation": _json_model(ReportEvaluation)},
+)
+
+MESSAGE_MAPPER: RowMapper[DiscussionMessage] = RowMapper(
+    DiscussionMessage,
+    {"created_at": datetime.fromisoformat},
+)
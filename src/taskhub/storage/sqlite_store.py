@@ -2,116 +2,724 @@
 SQLite存储实现 (FTS5 Optimized) - Full Async Version
 """
 
+import contextvars
 import json
 import sqlite3
-from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional, Any
 import threading
-import time
-from functools import wraps
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, TypeVar
 
 import anyio
+from pydantic import BaseModel
 
 from ..models.hunter import Hunter
 from ..models.discussion import DiscussionMessage
-from ..models.report import Report, ReportEvaluation
-from ..models.task import Task, TaskStatus
+from ..models.report import Report
+from ..models.task import Task, TaskStatus, TaskSummary
 from ..config import get_config
+from .cache import LRUCache
+from .connection_pool import MEMORY_DB, ConnectionPool
+from .pagination import DEFAULT_PAGE_SIZE, check_page_size, decode_cursor, encode_cursor
+from .ready_queue import ReadyQueue
+from .row_mapper import (
+    HUNTER_MAPPER,
+    MESSAGE_MAPPER,
+    REPORT_MAPPER,
+    TASK_MAPPER,
+    TASK_SUMMARY_MAPPER,
+    RowMapper,
+)
+from .timestamps import to_epoch_us
+from .write_queue import GroupCommitWriter
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+# (store, connection) of the transaction open in the current task
+_current_transaction: contextvars.ContextVar[tuple["SQLiteStore", sqlite3.Connection] | None] = (
+    contextvars.ContextVar("taskhub_sqlite_transaction", default=None)
+)
+
+
+# Secondary indexes managed by the store. Keep in sync with the Alembic revisions.
+INDEXES: dict[str, str] = {
+    "idx_tasks_created": "tasks(created_at, id)",
+    "idx_tasks_status_created": "tasks(status, created_at, id)",
+    "idx_tasks_status_skill": "tasks(status, required_skill, created_at, id)",
+    "idx_tasks_hunter_status": "tasks(hunter_id, status)",
+    "idx_tasks_status_hunter": "tasks(status, hunter_id)",
+    "idx_tasks_status_publisher": "tasks(status, published_by_hunter_id)",
+    "idx_hunters_created": "hunters(created_at, id)",
+    "idx_reports_created": "reports(created_at, id)",
+    "idx_reports_task_created": "reports(task_id, created_at, id)",
+    "idx_reports_hunter_created": "reports(hunter_id, created_at, id)",
+    "idx_reports_status_created": "reports(status, created_at, id)",
+    "idx_tasks_ready": "tasks(status, unmet_dependencies, required_skill, priority DESC, created_at)",
+    "idx_tasks_status_updated": "tasks(status, updated_at_us)",
+    "idx_tasks_lease_expiry": "tasks(status, lease_expires_at_us)",
+    "idx_discussion_created": "discussion_messages(created_at_us)",
+    "idx_task_dependencies_dep": "task_dependencies(depends_on_id)",
+    "idx_hunter_skills_rank": "hunter_skills(skill, score DESC, hunter_id)",
+}
+
+# Columns added after the initial schema, as (table, column definition).
+ADDED_COLUMNS: list[tuple[str, str]] = [
+    ("hunters", "last_read_discussion_timestamp TEXT"),
+    ("tasks", "priority INTEGER DEFAULT 0"),
+    ("tasks", "unmet_dependencies INTEGER NOT NULL DEFAULT 0"),
+    ("hunters", "reputation INTEGER DEFAULT 0"),
+    ("tasks", "created_at_us INTEGER"),
+    ("tasks", "updated_at_us INTEGER"),
+    ("tasks", "lease_expires_at_us INTEGER"),
+    ("hunters", "created_at_us INTEGER"),
+    ("hunters", "updated_at_us INTEGER"),
+    ("hunters", "last_read_discussion_timestamp_us INTEGER"),
+    ("discussion_messages", "created_at_us INTEGER"),
+    ("tasks", "lease_expiries INTEGER NOT NULL DEFAULT 0"),
+]
+
+# Integer microsecond-epoch companions of ISO timestamp columns (see timestamps.py),
+# as table -> [(ISO column, epoch column)]
+EPOCH_COLUMNS: dict[str, list[tuple[str, str]]] = {
+    "tasks": [
+        ("created_at", "created_at_us"),
+        ("updated_at", "updated_at_us"),
+        ("lease_expires_at", "lease_expires_at_us"),
+    ],
+    "hunters": [
+        ("created_at", "created_at_us"),
+        ("updated_at", "updated_at_us"),
+        ("last_read_discussion_timestamp", "last_read_discussion_timestamp_us"),
+    ],
+    "discussion_messages": [("created_at", "created_at_us")],
+}
+
+TASK_COLUMNS = (
+    "id", "name", "details", "required_skill", "status", "hunter_id", "lease_id", "lease_expires_at",
+    "depends_on", "parent_task_id", "published_by_hunter_id", "created_at", "updated_at", "evaluation",
+    "is_archived", "priority", "created_at_us", "updated_at_us", "lease_expires_at_us",
+)
+
+HUNTER_COLUMNS = (
+    "id", "skills", "status", "current_tasks", "completed_tasks", "failed_tasks", "created_at", "updated_at",
+    "last_read_discussion_timestamp", "reputation", "created_at_us", "updated_at_us",
+    "last_read_discussion_timestamp_us",
+)
+
+# An upsert rather than INSERT OR REPLACE, so that UPDATE triggers fire when an existing task is saved
+SAVE_TASK_SQL = (
+    f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) VALUES ({', '.join('?' * len(TASK_COLUMNS))}) "
+    f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in TASK_COLUMNS[1:])}"
+)
+SAVE_HUNTER_SQL = (
+    f"INSERT INTO hunters ({', '.join(HUNTER_COLUMNS)}) VALUES ({', '.join('?' * len(HUNTER_COLUMNS))}) "
+    f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in HUNTER_COLUMNS[1:])}"
+)
+
+# Most change_log entries one cache sync reads; when more piled up, the cache is cleared instead
+CACHE_SYNC_LIMIT = 1000
+
+# Every committed change to a cached entity is logged so that stores in other
+# processes can drop exactly the cache entries it touched.
+CHANGE_LOG_TRIGGERS: dict[str, str] = {
+    f"trg_{table}_change_{event.lower()}": (
+        f"AFTER {event} ON {table} BEGIN "
+        f"INSERT INTO change_log (entity, entity_id) VALUES ('{entity}', {ref}.id); END"
+    )
+    for table, entity in (("tasks", "task"), ("hunters", "hunter"))
+    for event, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD"))
+}
+
+# tasks.unmet_dependencies counts the existing, not yet completed tasks a task
+# depends on. The task_dependencies edges mirror tasks.depends_on and the
+# counters are adjusted incrementally as tasks are inserted, completed,
+# reopened or deleted, so a task is ready exactly when its counter is 0.
+_SYNC_DEPENDENCIES = """
+    INSERT OR IGNORE INTO task_dependencies (task_id, depends_on_id)
+    SELECT NEW.id, value FROM json_each(COALESCE(NEW.depends_on, '[]'));
+    UPDATE tasks SET unmet_dependencies = (
+        SELECT COUNT(*) FROM task_dependencies d JOIN tasks dep ON dep.id = d.depends_on_id
+        WHERE d.task_id = NEW.id AND dep.status != 'completed'
+    ) WHERE id = NEW.id AND (unmet_dependencies != 0 OR json_array_length(COALESCE(NEW.depends_on, '[]')) > 0);
+"""
+
+DEPENDENCY_TRIGGERS: dict[str, str] = {
+    "trg_tasks_deps_insert": f"""
+        AFTER INSERT ON tasks BEGIN
+        {_SYNC_DEPENDENCIES}
+        UPDATE tasks SET unmet_dependencies = unmet_dependencies + 1
+        WHERE NEW.status != 'completed'
+          AND id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = NEW.id);
+        END
+    """,
+    "trg_tasks_deps_update": f"""
+        AFTER UPDATE OF depends_on ON tasks WHEN NEW.depends_on IS NOT OLD.depends_on BEGIN
+        DELETE FROM task_dependencies WHERE task_id = NEW.id;
+        {_SYNC_DEPENDENCIES}
+        END
+    """,
+    "trg_tasks_deps_status": """
+        AFTER UPDATE OF status ON tasks
+        WHEN (NEW.status = 'completed') != (OLD.status = 'completed') BEGIN
+        UPDATE tasks SET unmet_dependencies = unmet_dependencies + (CASE WHEN NEW.status = 'completed' THEN -1 ELSE 1 END)
+        WHERE id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = NEW.id);
+        END
+    """,
+    "trg_tasks_deps_delete": """
+        AFTER DELETE ON tasks BEGIN
+        UPDATE tasks SET unmet_dependencies = unmet_dependencies - 1
+        WHERE OLD.status != 'completed'
+          AND id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = OLD.id);
+        DELETE FROM task_dependencies WHERE task_id = OLD.id;
+        END
+    """,
+}
+
+# task_counters holds task counts per status, overall (dimension 'status',
+# key '') and per skill, hunter and publisher. The triggers below keep it in
+# step with every insert, update and delete on tasks, so statistics never
+# have to scan tasks.
+_COUNTER_KEYS = """
+    SELECT 'status' AS dimension, '' AS key
+    UNION ALL SELECT 'skill', {row}.required_skill
+    UNION ALL SELECT 'hunter', {row}.hunter_id
+    UNION ALL SELECT 'publisher', {row}.published_by_hunter_id
+"""
+
+_COUNT_TASK = f"""
+    INSERT INTO task_counters (dimension, key, status, n)
+    SELECT dimension, key, NEW.status, 1 FROM ({_COUNTER_KEYS.format(row="NEW")}) WHERE key IS NOT NULL
+    ON CONFLICT (dimension, key, status) DO UPDATE SET n = n + 1;
+"""
+
+_UNCOUNT_TASK = f"""
+    UPDATE task_counters SET n = n - 1
+    WHERE status = OLD.status AND (dimension, key) IN ({_COUNTER_KEYS.format(row="OLD")});
+"""
+
+# A hunter's workload is the number of tasks they hold claimed or in progress
+_HUNTER_WORKLOAD = """(
+    SELECT COALESCE(SUM(n), 0) FROM task_counters
+    WHERE dimension = 'hunter' AND key = {hunter} AND status IN ('claimed', 'in_progress')
+)"""
+
+# hunter_skills holds one row per (hunter, skill) from hunters.skills, together
+# with the hunter's routing score (70% reputation, 30% penalty for workload), so
+# picking the best hunter for a skill is a walk down idx_hunter_skills_rank.
+_SYNC_HUNTER_SKILLS = f"""
+    DELETE FROM hunter_skills WHERE hunter_id = NEW.id;
+    INSERT INTO hunter_skills (hunter_id, skill, level, score)
+    SELECT NEW.id, key, value, COALESCE(NEW.reputation, 0) * 0.7 - {_HUNTER_WORKLOAD.format(hunter="NEW.id")} * 0.3
+    FROM json_each(COALESCE(NEW.skills, '{{}}'));
+"""
+
+_RESCORE_HUNTERS = f"""
+    UPDATE hunter_skills SET score =
+        (SELECT COALESCE(reputation, 0) FROM hunters WHERE id = hunter_skills.hunter_id) * 0.7
+        - {_HUNTER_WORKLOAD.format(hunter="hunter_skills.hunter_id")} * 0.3
+    WHERE hunter_id IN ({{hunters}});
+"""
+
+HUNTER_SKILL_TRIGGERS: dict[str, str] = {
+    "trg_hunters_skills_insert": f"AFTER INSERT ON hunters BEGIN {_SYNC_HUNTER_SKILLS} END",
+    "trg_hunters_skills_update": f"AFTER UPDATE OF skills, reputation ON hunters BEGIN {_SYNC_HUNTER_SKILLS} END",
+    "trg_hunters_skills_delete": "AFTER DELETE ON hunters BEGIN DELETE FROM hunter_skills WHERE hunter_id = OLD.id; END",
+}
+
+COUNTER_TRIGGERS: dict[str, str] = {
+    "trg_tasks_count_insert": (
+        f"AFTER INSERT ON tasks BEGIN {_COUNT_TASK} {_RESCORE_HUNTERS.format(hunters='NEW.hunter_id')} END"
+    ),
+    "trg_tasks_count_update": f"""
+        AFTER UPDATE OF status, required_skill, hunter_id, published_by_hunter_id ON tasks
+        WHEN NEW.status IS NOT OLD.status OR NEW.required_skill IS NOT OLD.required_skill
+          OR NEW.hunter_id IS NOT OLD.hunter_id OR NEW.published_by_hunter_id IS NOT OLD.published_by_hunter_id
+        BEGIN {_UNCOUNT_TASK} {_COUNT_TASK} {_RESCORE_HUNTERS.format(hunters='OLD.hunter_id, NEW.hunter_id')} END
+    """,
+    "trg_tasks_count_delete": (
+        f"AFTER DELETE ON tasks BEGIN {_UNCOUNT_TASK} {_RESCORE_HUNTERS.format(hunters='OLD.hunter_id')} END"
+    ),
+}
+
+# External-content FTS5 indexes, as name -> (content table, indexed columns).
+# They store only the index; the text is read back from the content table.
+FTS_TABLES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "tasks_fts": ("tasks", ("name", "details")),
+    "discussion_fts": ("discussion_messages", ("content",)),
+}
+
+
+def _fts_triggers(fts: str, table: str, columns: tuple[str, ...]) -> dict[str, str]:
+    cols = ", ".join(columns)
+    new = ", ".join(f"NEW.{c}" for c in columns)
+    old = ", ".join(f"OLD.{c}" for c in columns)
+    insert = f"INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.rowid, {new});"
+    delete = f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.rowid, {old});"
+    return {
+        f"trg_{fts}_insert": f"AFTER INSERT ON {table} BEGIN {insert} END",
+        f"trg_{fts}_update": f"AFTER UPDATE OF {cols} ON {table} BEGIN {delete} {insert} END",
+        f"trg_{fts}_delete": f"AFTER DELETE ON {table} BEGIN {delete} END",
+    }
+
+
+FTS_TRIGGERS: dict[str, str] = {
+    name: body
+    for fts, (table, columns) in FTS_TABLES.items()
+    for name, body in _fts_triggers(fts, table, columns).items()
+}
+
+# Breakdowns supported by task_counts, as name -> tasks column. Each has a
+# (status, column) index so the GROUP BY is an index scan without a sort.
+TASK_COUNT_GROUPS: dict[str, str] = {
+    "skill": "required_skill",
+    "publisher": "published_by_hunter_id",
+    "hunter": "hunter_id",
+}
+
+# Cold storage: finished tasks and their reports are moved into this ATTACHed
+# database file, keeping the hot file (and its indexes) small.
+ARCHIVE_SCHEMA = "archive"
+ARCHIVE_TABLES: dict[str, str] = {"tasks": "id", "reports": "task_id"}
+ARCHIVABLE_STATUSES = (TaskStatus.COMPLETED.value, TaskStatus.FAILED.value, TaskStatus.ARCHIVED.value)
+_FINISHED = ", ".join(f"'{status}'" for status in ARCHIVABLE_STATUSES)
+# A finished task can move to the archive unless it failed and an unfinished
+# task still depends on it: removing it from the hot file would unblock that dependent.
+ARCHIVABLE_TASK_FILTER = f"""
+    tasks.status IN ({_FINISHED})
+    AND (tasks.status = '{TaskStatus.COMPLETED.value}' OR NOT EXISTS (
+        SELECT 1 FROM task_dependencies d JOIN tasks t ON t.id = d.task_id
+        WHERE d.depends_on_id = tasks.id AND t.status NOT IN ({_FINISHED})
+    ))
+"""
+
+# Columns read for TaskSummary rows; leaves out details, evaluation and the other wide columns
+TASK_SUMMARY_COLUMNS = ", ".join(TaskSummary.model_fields)
+
+# Pending tasks whose dependencies are all completed, as loaded into the ready queue
+READY_TASKS_SQL = (
+    "SELECT id, required_skill, priority, created_at_us, published_by_hunter_id FROM tasks "
+    "WHERE status = 'pending' AND unmet_dependencies = 0"
+)
+
+# Compare-and-swap claim of one ready task; the claimer can't take a task they published
+CLAIM_TASK_SQL = """
+    UPDATE tasks
+    SET status = ?, hunter_id = ?, lease_id = ?, lease_expires_at = ?, lease_expires_at_us = ?,
+        updated_at = ?, updated_at_us = ?
+    WHERE id = ? AND status = ? AND unmet_dependencies = 0
+      AND (published_by_hunter_id IS NULL OR published_by_hunter_id != ?)
+    RETURNING *
+"""
+
+# Status change of a task by the hunter holding it, guarded on the lease it was read
+# under, so a holder whose lease expired can't overwrite a newer claim
+TRANSITION_TASK_SQL = """
+    UPDATE tasks SET status = ?, updated_at = ?, updated_at_us = ?
+    WHERE id = ? AND hunter_id = ? AND lease_id IS ? AND status IN (SELECT value FROM json_each(?))
+    RETURNING *
+"""
+
+MESSAGES_AFTER_SQL = "SELECT * FROM discussion_messages WHERE created_at_us > ? ORDER BY created_at_us ASC LIMIT ?"
 
 
 class SQLiteStore:
-    def __init__(self, db_path: str | None = None):
+    # Trusted row decoders for rows read back from our own tables
+    _task_from_row = TASK_MAPPER
+    _task_summary_from_row = TASK_SUMMARY_MAPPER
+    _hunter_from_row = HUNTER_MAPPER
+    _report_from_row = REPORT_MAPPER
+    _message_from_row = MESSAGE_MAPPER
+
+    def __init__(self, db_path: str | None = None, group_commit: bool | None = None):
         config = get_config()
         self.db_path = Path(db_path or config.get("database.path", "data/taskhub.db"))
         self.db_path.parent.mkdir(exist_ok=True)
-        self._conn: sqlite3.Connection | None = None
-        self._local = threading.local()
-        self._pool_size = 10
-        self._timeout = 30.0
-        
-        # Cache configuration
-        self._cache = {}
+        db_config = config.get_database_config()
+        if str(self.db_path) == MEMORY_DB:
+            self.archive_path = Path(MEMORY_DB)
+        else:
+            self.archive_path = self.db_path.with_name(f"{self.db_path.stem}_archive{self.db_path.suffix}")
+        self._pool = ConnectionPool(
+            self.db_path,
+            size=db_config["pool_size"],
+            timeout=db_config["timeout"],
+            attach={ARCHIVE_SCHEMA: self.archive_path},
+        )
+
+        # Opt-in write-behind mode: writes are batched into group commits by a single writer task
+        if group_commit is None:
+            group_commit = db_config["group_commit"]
+        self._group_writer = (
+            GroupCommitWriter(
+                self._pool,
+                window=db_config["group_commit_window_ms"] / 1000,
+                max_batch=db_config["group_commit_max_batch"],
+            )
+            if group_commit
+            else None
+        )
+
         cache_config = config.get_cache_config()
-        self._cache_ttl = cache_config["ttl"]
-        self._max_cache_size = cache_config["max_size"]
-        
-    def _cache_key(self, prefix: str, *args) -> str:
+        self._cache = LRUCache(
+            max_size=cache_config["max_size"], ttl=cache_config["ttl"], enabled=cache_config["enabled"]
+        )
+        self._change_log_retention = cache_config["change_log_retention"]
+        # Watches for commits made by other connections (including other processes)
+        self._monitor: sqlite3.Connection | None = None
+        # Serializes cache syncs, and closing the monitor under one
+        self._monitor_lock = anyio.Lock()
+        self._data_version = 0
+        self._change_seq = 0
+        # Called with every task this store claims, e.g. to schedule its lease expiry
+        self._claim_listeners: list[Callable[[Task], None]] = []
+        # Awaited with the skill of every task this store saves as pending or releases, e.g. to wake waiting hunters
+        self._ready_listeners: list[Callable[[str], Awaitable[None]]] = []
+        # Claimable tasks per skill, kept in step with the change_log
+        self._ready = ReadyQueue()
+        # Serializes queue syncs and peeks, which run on the writer and on reader threads
+        self._ready_lock = threading.RLock()
+        # Last change_log entry applied to the queue; None when it has to be (re)loaded,
+        # which the first claim_next_task does, so stores that never dispatch skip the load
+        self._ready_seq: int | None = None
+        # Whether the open transaction changed the queue, which a rollback then undoes
+        self._ready_in_transaction = False
+        # Skills with tasks made ready inside the open transaction, notified once it commits
+        self._ready_skills: set[str] = set()
+        # Cache keys written inside the open transaction, invalidated again once it commits
+        self._transaction_keys: set[str] = set()
+
+    @staticmethod
+    def _cache_key(prefix: str, *args) -> str:
         """Generate cache key from prefix and arguments."""
         return f"{prefix}:{':'.join(str(arg) for arg in args)}"
-    
-    def _get_from_cache(self, key: str) -> Any:
-        """Get value from cache if not expired."""
-        if key in self._cache:
-            value, timestamp = self._cache[key]
-            if time.time() - timestamp < self._cache_ttl:
-                return value
+
+    def _invalidate(self, prefix: str, *args) -> None:
+        """Drop a cached entity after a write to it."""
+        key = self._cache_key(prefix, *args)
+        self._cache.invalidate(key)
+        if self._transaction_connection() is not None:
+            # Others may cache the committed row again before the block commits
+            self._transaction_keys.add(key)
+
+    def add_claim_listener(self, listener: Callable[[Task], None]) -> None:
+        self._claim_listeners.append(listener)
+
+    def remove_claim_listener(self, listener: Callable[[Task], None]) -> None:
+        if listener in self._claim_listeners:
+            self._claim_listeners.remove(listener)
+
+    def _notify_claimed(self, task: Task) -> None:
+        for listener in self._claim_listeners:
+            listener(task)
+
+    def ready_queue_stats(self) -> dict[str, Any]:
+        """Size of the in-process ready-task index."""
+        return self._ready.stats()
+
+    def add_ready_listener(self, listener: Callable[[str], Awaitable[None]]) -> None:
+        self._ready_listeners.append(listener)
+
+    def remove_ready_listener(self, listener: Callable[[str], Awaitable[None]]) -> None:
+        if listener in self._ready_listeners:
+            self._ready_listeners.remove(listener)
+
+    async def _notify_ready(self, tasks: list[Task]) -> None:
+        if not self._ready_listeners:
+            return
+        skills = {task.required_skill for task in tasks if task.status == TaskStatus.PENDING}
+        if self._transaction_connection() is not None:
+            # Other connections can't see the tasks before the commit; transaction() notifies then
+            self._ready_skills.update(skills)
+            return
+        await self._fire_ready(skills)
+
+    async def _fire_ready(self, skills: set[str]) -> None:
+        for skill in skills:
+            for listener in self._ready_listeners:
+                await listener(skill)
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Entity cache size and hit/miss/eviction counters."""
+        return self._cache.stats()
+
+    async def connect(self, init_schema: bool = True, watch_changes: bool = True) -> None:
+        """Open the connection pool and make sure the schema exists.
+
+        Args:
+            init_schema: Create or migrate the schema and prune the change_log.
+                Skip it for a database this process has already initialized.
+            watch_changes: Watch for other connections' commits to keep the
+                entity cache fresh. Short-lived stores that barely use the
+                cache can do without.
+        """
+        if not self._pool.is_open:
+            await self._pool.open()
+            if init_schema:
+                await self._init_tables()
+                await self.prune_change_log()
+            if watch_changes and not self._pool.is_memory:
+                await anyio.to_thread.run_sync(self._open_monitor)
+            if self._group_writer:
+                self._group_writer.start()
+
+    async def close(self) -> None:
+        """Flush queued writes and close all pooled connections."""
+        if self._group_writer:
+            await self._group_writer.stop()
+        async with self._monitor_lock:
+            if self._monitor is not None:
+                self._monitor.close()
+                self._monitor = None
+        if self._pool.is_open:
+            await self._pool.close()
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Connection pool size and wait-time statistics."""
+        stats = self._pool.stats()
+        if self._group_writer:
+            stats["group_commit"] = dict(self._group_writer.stats)
+        return stats
+
+    def _open_monitor(self) -> None:
+        self._monitor = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._monitor.execute("PRAGMA query_only=1")
+        self._data_version = self._monitor.execute("PRAGMA data_version").fetchone()[0]
+        self._change_seq = self._monitor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+    async def _sync_cache(self) -> None:
+        """Drop cache entries for rows changed by other connections since the last check.
+
+        ``PRAGMA data_version`` only changes when another connection has
+        committed, so the common case is a single cheap pragma with no I/O.
+        When it has changed, the change_log entries written since the last
+        check name exactly which tasks and hunters to invalidate. The queries
+        run on a worker thread; the cache is only touched on the event loop.
+        """
+        if self._monitor is None or not self._cache.enabled:
+            return
+        async with self._monitor_lock:
+            if self._monitor is None:
+                return
+            changed = await anyio.to_thread.run_sync(self._read_changes, self._monitor)
+        if changed is None:
+            self._cache.clear()
+        else:
+            for entity, entity_id in changed:
+                self._cache.invalidate(self._cache_key(entity, entity_id))
+
+    def _read_changes(self, monitor: sqlite3.Connection) -> list[tuple[str, str]] | None:
+        """The (entity, id) pairs changed since the last check, or None if they can't all be named."""
+        version = monitor.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return []
+        self._data_version = version
+        rows = monitor.execute(
+            "SELECT seq, entity, entity_id FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+            (self._change_seq, CACHE_SYNC_LIMIT + 1),
+        ).fetchall()
+        if not rows:
+            return []
+        if rows[0][0] > self._change_seq + 1 or len(rows) > CACHE_SYNC_LIMIT:
+            # Entries we never saw were pruned, or too many piled up to be worth naming
+            self._change_seq = monitor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+            return None
+        self._change_seq = rows[-1][0]
+        return [(entity, entity_id) for _, entity, entity_id in rows]
+
+    async def rebuild_ready_queue(self) -> None:
+        """Reload the ready queue with every claimable task in the database."""
+        # Queue updates run on the writer connection, which serializes them with claims
+        await self._write(self._load_ready_queue)
+
+    def _load_ready_queue(self, conn: sqlite3.Connection) -> None:
+        with self._ready_lock:
+            # Read the seq first: a change committed between the two queries is then applied again, not missed
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+            self._ready.clear()
+            for row in conn.execute(READY_TASKS_SQL):
+                self._ready.add(*row)
+            self._ready_seq = seq
+
+    def _sync_ready_queue(self, conn: sqlite3.Connection) -> None:
+        """Apply the task changes committed since the last sync to the ready queue.
+
+        Each task named in the change_log since then is looked up again and
+        added to or dropped from the queue, so it can run on any connection:
+        a task changed again after its lookup has a later entry and is looked
+        up again on the next sync.
+        """
+        with self._ready_lock:
+            self._apply_ready_changes(conn)
+
+    def _apply_ready_changes(self, conn: sqlite3.Connection) -> None:
+        if self._ready_seq is None:
+            self._load_ready_queue(conn)
+            return
+        log = conn.execute(
+            "SELECT seq, entity, entity_id FROM change_log WHERE seq > ? ORDER BY seq", (self._ready_seq,)
+        ).fetchall()
+        if not log:
+            return
+        if log[0][0] > self._ready_seq + 1:
+            # Entries we never saw were pruned, so we can't tell what changed
+            self._load_ready_queue(conn)
+            return
+        task_ids = list({entity_id for _, entity, entity_id in log if entity == "task"})
+        ready = {}
+        for i in range(0, len(task_ids), 500):
+            chunk = task_ids[i:i + 500]
+            ready.update(
+                (row["id"], row)
+                for row in conn.execute(f"{READY_TASKS_SQL} AND id IN ({', '.join('?' * len(chunk))})", chunk)
+            )
+        for task_id in task_ids:
+            row = ready.get(task_id)
+            if row is None:
+                self._ready.discard(task_id)
             else:
-                del self._cache[key]
+                self._ready.add(*row)
+        self._ready_seq = log[-1][0]
+
+    async def prune_change_log(self) -> int:
+        """Keep only the most recent ``cache.change_log_retention`` change_log entries."""
+        return await self._execute(
+            "DELETE FROM change_log WHERE seq <= (SELECT MAX(seq) FROM change_log) - ?",
+            (self._change_log_retention,),
+        )
+
+    def _transaction_connection(self) -> sqlite3.Connection | None:
+        """The connection pinned by this store's transaction in the current task, if any."""
+        current = _current_transaction.get()
+        if current is not None and current[0] is self:
+            return current[1]
         return None
-    
-    def _set_cache(self, key: str, value: Any) -> None:
-        """Set value in cache with TTL."""
-        if len(self._cache) >= self._max_cache_size:
-            # Simple LRU: remove oldest entries
-            oldest_keys = sorted(self._cache.keys(), 
-                               key=lambda k: self._cache[k][1])[:self._max_cache_size//10]
-            for k in oldest_keys:
-                del self._cache[k]
-        
-        self._cache[key] = (value, time.time())
-    
-    def _invalidate_cache(self, prefix: str) -> None:
-        """Invalidate all cache entries with given prefix."""
-        keys_to_remove = [k for k in self._cache.keys() if k.startswith(prefix)]
-        for key in keys_to_remove:
-            del self._cache[key]
-
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get thread-local connection or create new one."""
-        if not hasattr(self._local, 'connection') or self._local.connection is None:
-            conn = sqlite3.connect(
-                self.db_path,
-                timeout=self._timeout,
-                check_same_thread=False
-            )
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging for better concurrency
-            conn.execute("PRAGMA synchronous=NORMAL")  # Balance between safety and performance
-            conn.execute("PRAGMA cache_size=10000")  # Increase cache size
-            conn.execute("PRAGMA temp_store=memory")  # Use memory for temp operations
-            conn.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
-            self._local.connection = conn
-        return self._local.connection
-
-    async def connect(self) -> None:
-        """Initialize connection pool settings."""
-        if self._conn is None:
-            self._conn = self._get_connection()
-            await self._init_tables()
 
-    async def close(self) -> None:
-        """Close all connections."""
-        if hasattr(self._local, 'connection') and self._local.connection:
-            await anyio.to_thread.run_sync(self._local.connection.close)
-            self._local.connection = None
-        if self._conn:
-            await anyio.to_thread.run_sync(self._conn.close)
-            self._conn = None
-
-    async def _execute_sync(self, sql: str, parameters: tuple = ()) -> sqlite3.Cursor:
-        """Execute SQL with connection from pool."""
-        def db_op() -> sqlite3.Cursor:
-            conn = self._get_connection()
-            with conn as c:
-                return c.execute(sql, parameters)
-
-        return await anyio.to_thread.run_sync(db_op)
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Run several store operations as one atomic unit of work.
+
+        Holds the writer connection for the duration of the block and wraps it
+        in ``BEGIN IMMEDIATE … COMMIT``. Store calls made inside the block (in
+        the same task) run on that connection, so reads see the block's own
+        uncommitted writes and the whole block costs a single commit. Any
+        exception rolls everything back. Nested blocks join the outer one.
+        """
+        if self._transaction_connection() is not None:
+            yield
+            return
+
+        ready_skills: set[str] = set()
+        async with self._pool.writer() as conn:
+            await anyio.to_thread.run_sync(conn.execute, "BEGIN IMMEDIATE")
+            token = _current_transaction.set((self, conn))
+            # The writer is held until the block ends, so only one block at a time touches these
+            self._ready_in_transaction = False
+            self._ready_skills = set()
+            self._transaction_keys = set()
+            try:
+                yield
+            except BaseException:
+                with anyio.CancelScope(shield=True):
+                    await anyio.to_thread.run_sync(conn.rollback)
+                # The ready queue may hold rolled-back state
+                self._invalidate_ready_queue()
+                raise
+            else:
+                try:
+                    await anyio.to_thread.run_sync(conn.commit)
+                except BaseException:
+                    # Don't hand the writer back with the transaction still open
+                    with anyio.CancelScope(shield=True):
+                        await anyio.to_thread.run_sync(conn.rollback)
+                    self._cache.clear()
+                    self._invalidate_ready_queue()
+                    raise
+                for key in self._transaction_keys:
+                    self._cache.invalidate(key)
+                ready_skills = self._ready_skills
+            finally:
+                _current_transaction.reset(token)
+                self._ready_in_transaction = False
+                self._ready_skills = set()
+                self._transaction_keys = set()
+        await self._fire_ready(ready_skills)
+
+    def _invalidate_ready_queue(self) -> None:
+        """Reload the ready queue on next use if the rolled-back block changed it."""
+        if self._ready_in_transaction:
+            self._ready_seq = None
+
+    async def _write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run ``fn`` on the writer connection inside a transaction."""
+        tx_conn = self._transaction_connection()
+        if tx_conn is not None:
+            return await anyio.to_thread.run_sync(fn, tx_conn)
+        if self._group_writer and self._group_writer.running:
+            return await self._group_writer.submit(fn)
+        async with self._pool.writer() as conn:
+            def db_op() -> T:
+                with conn:
+                    return fn(conn)
+
+            return await anyio.to_thread.run_sync(db_op)
+
+    async def _read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run ``fn`` on a reader connection."""
+        tx_conn = self._transaction_connection()
+        if tx_conn is not None:
+            return await anyio.to_thread.run_sync(fn, tx_conn)
+        async with self._pool.reader() as conn:
+            return await anyio.to_thread.run_sync(fn, conn)
+
+    async def _execute(self, sql: str, parameters: tuple = ()) -> int:
+        """Execute a write statement and return the number of affected rows."""
+        return await self._write(lambda conn: conn.execute(sql, parameters).rowcount)
+
+    async def _execute_returning(self, sql: str, parameters: tuple = ()) -> list[sqlite3.Row]:
+        """Execute a write with a RETURNING clause, fetching its rows before the commit."""
+        return await self._write(lambda conn: conn.execute(sql, parameters).fetchall())
+
+    async def _fetchone(self, sql: str, parameters: tuple = ()) -> sqlite3.Row | None:
+        return await self._read(lambda conn: conn.execute(sql, parameters).fetchone())
+
+    async def _fetchall(self, sql: str, parameters: tuple = ()) -> list[sqlite3.Row]:
+        return await self._read(lambda conn: conn.execute(sql, parameters).fetchall())
+
+    async def _iter_rows(
+        self, sql: str, parameters: tuple, mapper: RowMapper[M], chunk_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[M]:
+        """Stream a query's rows as models, fetching ``chunk_size`` rows at a time.
+
+        Holds one reader connection until the iteration ends, so the whole
+        stream reads a single snapshot and only one chunk is in memory at a
+        time. Close the generator (e.g. with ``contextlib.aclosing``) when
+        stopping early so the connection is returned promptly. Inside a
+        transaction, or for ``:memory:`` where reads share the writer
+        connection, the rows are fetched up front instead, so the caller can
+        keep writing while it iterates.
+        """
+        tx_conn = self._transaction_connection()
+        if tx_conn is not None or self._pool.is_memory:
+            for row in await self._fetchall(sql, parameters):
+                yield mapper(row)
+            return
+
+        async with self._pool.reader() as conn:
+            cursor = await anyio.to_thread.run_sync(conn.execute, sql, parameters)
+            try:
+                while rows := await anyio.to_thread.run_sync(cursor.fetchmany, chunk_size):
+                    for model in mapper.many(rows):
+                        yield model
+            finally:
+                cursor.close()
 
     async def _init_tables(self) -> None:
         """Initialize database tables if they don't exist."""
         # Create tables if they don't exist (fallback when Alembic is not used)
-        await self._execute_sync("""
+        await self._execute("""
             CREATE TABLE IF NOT EXISTS tasks (
                 id TEXT PRIMARY KEY,
                 name TEXT NOT NULL,
@@ -127,11 +735,17 @@ class SQLiteStore:
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
                 evaluation TEXT,
-                is_archived BOOLEAN DEFAULT 0
+                is_archived BOOLEAN DEFAULT 0,
+                priority INTEGER DEFAULT 0,
+                unmet_dependencies INTEGER NOT NULL DEFAULT 0,
+                created_at_us INTEGER,
+                updated_at_us INTEGER,
+                lease_expires_at_us INTEGER,
+                lease_expiries INTEGER NOT NULL DEFAULT 0
             )
         """)
         
-        await self._execute_sync("""
+        await self._execute("""
             CREATE TABLE IF NOT EXISTS hunters (
                 id TEXT PRIMARY KEY,
                 skills TEXT NOT NULL,
@@ -141,11 +755,15 @@ class SQLiteStore:
                 failed_tasks INTEGER DEFAULT 0,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
-                last_read_discussion_timestamp TEXT
+                last_read_discussion_timestamp TEXT,
+                reputation INTEGER DEFAULT 0,
+                created_at_us INTEGER,
+                updated_at_us INTEGER,
+                last_read_discussion_timestamp_us INTEGER
             )
         """)
         
-        await self._execute_sync("""
+        await self._execute("""
             CREATE TABLE IF NOT EXISTS reports (
                 id TEXT PRIMARY KEY,
                 task_id TEXT NOT NULL,
@@ -159,128 +777,812 @@ class SQLiteStore:
             )
         """)
         
-        await self._execute_sync("""
+        await self._execute("""
             CREATE TABLE IF NOT EXISTS discussion_messages (
                 id TEXT PRIMARY KEY,
                 hunter_id TEXT NOT NULL,
                 content TEXT NOT NULL,
-                created_at TEXT NOT NULL
+                created_at TEXT NOT NULL,
+                created_at_us INTEGER
             )
         """)
         
+        await self._execute("""
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                entity TEXT NOT NULL,
+                entity_id TEXT NOT NULL
+            )
+        """)
+
+        await self._execute("""
+            CREATE TABLE IF NOT EXISTS task_dependencies (
+                task_id TEXT NOT NULL,
+                depends_on_id TEXT NOT NULL,
+                PRIMARY KEY (task_id, depends_on_id)
+            ) WITHOUT ROWID
+        """)
+
+        await self._execute("""
+            CREATE TABLE IF NOT EXISTS task_counters (
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                n INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, key, status)
+            ) WITHOUT ROWID
+        """)
+
+        await self._execute("""
+            CREATE TABLE IF NOT EXISTS hunter_skills (
+                hunter_id TEXT NOT NULL,
+                skill TEXT NOT NULL,
+                level INTEGER NOT NULL,
+                score REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (hunter_id, skill)
+            ) WITHOUT ROWID
+        """)
+
+        existing_fts = {
+            row["name"] for row in await self._fetchall("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        for fts, (table, columns) in FTS_TABLES.items():
+            await self._execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({', '.join(columns)}, "
+                f"content='{table}', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')"
+            )
+            if fts not in existing_fts:
+                # Index rows written before the FTS table existed
+                await self._execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
         # Backward compatibility: add columns that might be missing
-        try:
-            await self._execute_sync("ALTER TABLE hunters ADD COLUMN last_read_discussion_timestamp TEXT")
-        except sqlite3.OperationalError as e:
-            # Ignore "duplicate column" errors
-            if "duplicate column name" not in str(e).lower():
-                raise
+        added = set()
+        for table, column in ADDED_COLUMNS:
+            try:
+                await self._execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+                added.add(column.split()[0])
+            except sqlite3.OperationalError as e:
+                # Ignore "duplicate column" errors
+                if "duplicate column name" not in str(e).lower():
+                    raise
+
+        await self._ensure_archive_schema()
+
+        created = await self._ensure_triggers()
+        if "unmet_dependencies" in added:
+            await self.rebuild_dependencies()
+        if "trg_tasks_count_insert" in created:
+            # Also rescores hunter_skills from the fresh counters
+            await self.rebuild_task_counters()
+        elif "reputation" in added:
+            await self.rebuild_hunter_skills()
+        if any(column.endswith("_us") for column in added):
+            await self.rebuild_epoch_columns()
+
+        await self._ensure_indexes()
+
+    async def rebuild_dependencies(self) -> None:
+        """Rebuild task_dependencies and the unmet-dependency counters from tasks.depends_on."""
+
+        def rebuild(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM task_dependencies")
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO task_dependencies (task_id, depends_on_id)
+                SELECT t.id, d.value FROM tasks t, json_each(COALESCE(t.depends_on, '[]')) d
+                """
+            )
+            conn.execute(
+                """
+                UPDATE tasks SET unmet_dependencies = (
+                    SELECT COUNT(*) FROM task_dependencies d JOIN tasks dep ON dep.id = d.depends_on_id
+                    WHERE d.task_id = tasks.id AND dep.status != ?
+                )
+                """,
+                (TaskStatus.COMPLETED.value,),
+            )
+
+        await self._write(rebuild)
+
+    async def rebuild_hunter_skills(self) -> None:
+        """Rebuild hunter_skills from hunters.skills and the current workload counters."""
+
+        def rebuild(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM hunter_skills")
+            conn.execute(
+                f"""
+                INSERT INTO hunter_skills (hunter_id, skill, level, score)
+                SELECT h.id, s.key, s.value,
+                       COALESCE(h.reputation, 0) * 0.7 - {_HUNTER_WORKLOAD.format(hunter="h.id")} * 0.3
+                FROM hunters h, json_each(COALESCE(h.skills, '{{}}')) s
+                """
+            )
+
+        await self._write(rebuild)
+
+    async def rebuild_task_counters(self) -> None:
+        """Recount task_counters from tasks, repairing any drift, and rescore hunter_skills."""
+
+        def rebuild(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM task_counters")
+            conn.execute(
+                "INSERT INTO task_counters (dimension, key, status, n) "
+                "SELECT 'status', '', status, COUNT(*) FROM tasks GROUP BY status"
+            )
+            for dimension, column in TASK_COUNT_GROUPS.items():
+                conn.execute(
+                    f"""
+                    INSERT INTO task_counters (dimension, key, status, n)
+                    SELECT ?, {column}, status, COUNT(*) FROM tasks
+                    WHERE {column} IS NOT NULL GROUP BY status, {column}
+                    """,
+                    (dimension,),
+                )
+
+        await self._write(rebuild)
+        await self.rebuild_hunter_skills()
+
+    async def rebuild_epoch_columns(self) -> None:
+        """Fill the ``*_us`` epoch columns from their ISO counterparts."""
+
+        def rebuild(conn: sqlite3.Connection) -> None:
+            for table, pairs in EPOCH_COLUMNS.items():
+                iso_columns = [iso for iso, _ in pairs]
+                rows = conn.execute(f"SELECT id, {', '.join(iso_columns)} FROM {table}").fetchall()
+                conn.executemany(
+                    f"UPDATE {table} SET {', '.join(f'{us} = ?' for _, us in pairs)} WHERE id = ?",
+                    [(*(to_epoch_us(row[iso]) for iso in iso_columns), row["id"]) for row in rows],
+                )
+
+        await self._write(rebuild)
+
+    async def _ensure_triggers(self) -> set[str]:
+        """Create the managed triggers, replacing any whose definition changed.
+
+        Returns the names of the triggers that were (re)created.
+        """
+        rows = await self._fetchall("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+        existing = {row["name"]: " ".join(row["sql"].split()) for row in rows}
+        created = set()
+        triggers = {
+            **CHANGE_LOG_TRIGGERS,
+            **DEPENDENCY_TRIGGERS,
+            **HUNTER_SKILL_TRIGGERS,
+            **COUNTER_TRIGGERS,
+            **FTS_TRIGGERS,
+        }
+        for name, body in triggers.items():
+            sql = f"CREATE TRIGGER {name} {body}"
+            if existing.get(name) == " ".join(sql.split()):
+                continue
+            if name in existing:
+                await self._execute(f"DROP TRIGGER {name}")
+            await self._execute(sql)
+            created.add(name)
+        return created
+
+    async def _ensure_archive_schema(self) -> None:
+        """Mirror the archived tables into the archive database, adding columns it lacks."""
+
+        def ensure(conn: sqlite3.Connection) -> None:
+            for table, key in ARCHIVE_TABLES.items():
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.{table} AS SELECT * FROM main.{table} WHERE 0"
+                )
+                archived = {row["name"] for row in conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.table_info({table})")}
+                for row in conn.execute(f"PRAGMA main.table_info({table})"):
+                    if row["name"] not in archived:
+                        conn.execute(f"ALTER TABLE {ARCHIVE_SCHEMA}.{table} ADD COLUMN {row['name']} {row['type']}")
+                conn.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_archive_{table}_id ON {table}(id)"
+                )
+                if key != "id":
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_archive_{table}_{key} ON {table}({key})"
+                    )
+
+        await self._write(ensure)
+
+    async def _ensure_indexes(self) -> None:
+        """Create the managed secondary indexes, rebuilding any whose definition changed."""
+        rows = await self._fetchall("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")
+        existing = {row["name"]: " ".join(row["sql"].split(" ON ", 1)[-1].split()) for row in rows}
+        for name, target in INDEXES.items():
+            if name in existing and existing[name] != target:
+                await self._execute(f"DROP INDEX {name}")
+            await self._execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+    @staticmethod
+    def _task_params(task: Task) -> tuple:
+        return (
+            task.id,
+            task.name,
+            task.details,
+            task.required_skill,
+            task.status,
+            task.hunter_id,
+            task.lease_id,
+            task.lease_expires_at.isoformat() if task.lease_expires_at else None,
+            json.dumps(task.depends_on),
+            task.parent_task_id,
+            task.published_by_hunter_id,
+            task.created_at.isoformat(),
+            task.updated_at.isoformat(),
+            json.dumps(task.evaluation.model_dump(mode="json")) if task.evaluation else None,
+            task.is_archived,
+            task.priority,
+            to_epoch_us(task.created_at),
+            to_epoch_us(task.updated_at),
+            to_epoch_us(task.lease_expires_at),
+        )
 
     async def save_task(self, task: Task) -> None:
-        await self._execute_sync(
-            "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        await self._execute(SAVE_TASK_SQL, self._task_params(task))
+        self._invalidate("task", task.id)
+        await self._notify_ready([task])
+
+    async def save_tasks_many(self, tasks: list[Task]) -> None:
+        """Insert or replace a batch of tasks in a single transaction."""
+        if not tasks:
+            return
+        params = [self._task_params(task) for task in tasks]
+        await self._write(lambda conn: conn.executemany(SAVE_TASK_SQL, params))
+        for task in tasks:
+            self._invalidate("task", task.id)
+        await self._notify_ready(tasks)
+
+    @staticmethod
+    def _claim_params(task_id: str, hunter_id: str, lease_id: str, lease_expires_at: datetime) -> tuple:
+        now = datetime.now(timezone.utc)
+        return (
+            TaskStatus.CLAIMED.value,
+            hunter_id,
+            lease_id,
+            lease_expires_at.isoformat(),
+            to_epoch_us(lease_expires_at),
+            now.isoformat(),
+            to_epoch_us(now),
+            task_id,
+            TaskStatus.PENDING.value,
+            hunter_id,
+        )
+
+    async def claim_task(
+        self, task_id: str, hunter_id: str, lease_id: str, lease_expires_at: datetime
+    ) -> Task | None:
+        """Atomically claim a pending task whose dependencies are all completed.
+
+        The status guard makes this a compare-and-swap: of several concurrent
+        claims for the same task exactly one gets the row back, the others get
+        None.
+        """
+        rows = await self._execute_returning(
+            CLAIM_TASK_SQL, self._claim_params(task_id, hunter_id, lease_id, lease_expires_at)
+        )
+        self._invalidate("task", task_id)
+        if not rows:
+            return None
+        task = self._task_from_row(rows[0])
+        self._notify_claimed(task)
+        return task
+
+    async def transition_task(
+        self,
+        task_id: str,
+        hunter_id: str,
+        lease_id: str | None,
+        expected: TaskStatus | tuple[TaskStatus, ...],
+        status: TaskStatus,
+    ) -> Task | None:
+        """Move a task from ``expected`` (one status or several) to ``status`` for the hunter holding it under ``lease_id``.
+
+        Returns:
+            The updated task, or None if it is no longer held by that hunter
+            under that lease in an expected status.
+        """
+        expected = (expected,) if isinstance(expected, TaskStatus) else expected
+        now = datetime.now(timezone.utc)
+        rows = await self._execute_returning(
+            TRANSITION_TASK_SQL,
             (
-                task.id,
-                task.name,
-                task.details,
-                task.required_skill,
-                task.status,
-                task.hunter_id,
-                task.lease_id,
-                task.lease_expires_at.isoformat() if task.lease_expires_at else None,
-                json.dumps(task.depends_on),
-                task.parent_task_id,
-                task.published_by_hunter_id,
-                task.created_at.isoformat(),
-                task.updated_at.isoformat(),
-                json.dumps(task.evaluation.model_dump()) if task.evaluation else None,
-                task.is_archived,
+                status.value,
+                now.isoformat(),
+                to_epoch_us(now),
+                task_id,
+                hunter_id,
+                lease_id,
+                json.dumps([value.value for value in expected]),
             ),
         )
-        # Invalidate task cache when saving
-        self._invalidate_cache("task:")
+        self._invalidate("task", task_id)
+        if not rows:
+            return None
+        task = self._task_from_row(rows[0])
+        await self._notify_ready([task])
+        return task
+
+    async def claim_next_task(
+        self, hunter_id: str, skills: list[str], lease_id: str, lease_expires_at: datetime
+    ) -> Task | None:
+        """Atomically claim the highest-priority ready pending task for one of ``skills``.
+
+        A task is ready when every task it depends on is completed. Tasks
+        published by the claiming hunter are skipped. Ties on priority go to
+        the oldest task.
+
+        Candidates come from the in-process ready queue, brought up to date
+        from the change_log and claimed with the compare-and-swap in
+        ``claim_task``, all in one write on the writer connection. A
+        candidate that another process got first is dropped and the next
+        one tried. Inside ``transaction()`` the queue follows the block's
+        own writes, and is reloaded if the block rolls back.
+        """
+        if not skills:
+            return None
+
+        if self._transaction_connection() is not None:
+            self._ready_in_transaction = True
+
+        def claim(conn: sqlite3.Connection) -> sqlite3.Row | None:
+            with self._ready_lock:
+                self._sync_ready_queue(conn)
+                while (task_id := self._ready.peek(skills, exclude_publisher=hunter_id)) is not None:
+                    rows = conn.execute(
+                        CLAIM_TASK_SQL, self._claim_params(task_id, hunter_id, lease_id, lease_expires_at)
+                    ).fetchall()
+                    self._ready.discard(task_id)
+                    if rows:
+                        return rows[0]
+                return None
+
+        try:
+            row = await self._write(claim)
+        except Exception:
+            # The write was rolled back, possibly with changes the queue already applied
+            self._ready_seq = None
+            raise
+        if row is None:
+            return None
+        task = self._task_from_row(row)
+        self._invalidate("task", task.id)
+        self._notify_claimed(task)
+        return task
+
+    async def has_ready_task(self, hunter_id: str, skills: list[str]) -> bool:
+        """Whether the ready queue holds a task ``claim_next_task`` could try for the hunter.
+
+        Syncs the queue on a reader connection, so unlike a claim it doesn't
+        wait for or hold the writer. A True answer can still lose the claim
+        to another hunter.
+        """
+        if not skills:
+            return False
+        if self._transaction_connection() is not None:
+            self._ready_in_transaction = True
+
+        def peek(conn: sqlite3.Connection) -> bool:
+            with self._ready_lock:
+                self._sync_ready_queue(conn)
+                return self._ready.peek(skills, exclude_publisher=hunter_id) is not None
+
+        return await self._read(peek)
 
     async def get_task(self, task_id: str) -> Task | None:
+        # Inside a transaction the block's own uncommitted rows must be read, and never cached
+        in_transaction = self._transaction_connection() is not None
         # Check cache first
+        await self._sync_cache()
         cache_key = self._cache_key("task", task_id)
-        cached = self._get_from_cache(cache_key)
+        cached = None if in_transaction else self._cache.get(cache_key)
         if cached is not None:
             return cached
-            
-        cursor = await self._execute_sync("SELECT * FROM tasks WHERE id = ?", (task_id,))
-        row = await anyio.to_thread.run_sync(cursor.fetchone)
+
+        row = await self._fetchone("SELECT * FROM tasks WHERE id = ?", (task_id,))
+        if row is None:
+            # Read-through to cold storage for archived tasks
+            row = await self._fetchone(f"SELECT * FROM {ARCHIVE_SCHEMA}.tasks WHERE id = ?", (task_id,))
         if row:
-            data = dict(row)
-            data["status"] = TaskStatus(data["status"])
-            data["depends_on"] = json.loads(data["depends_on"]) if data["depends_on"] else []
-            data["created_at"] = datetime.fromisoformat(data["created_at"]) if data["created_at"] else None
-            data["updated_at"] = datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None
-            if data["lease_expires_at"]:
-                data["lease_expires_at"] = datetime.fromisoformat(data["lease_expires_at"])
-            if data["evaluation"]:
-                try:
-                    eval_data = json.loads(data["evaluation"])
-                    data["evaluation"] = TaskEvaluation(**eval_data) if eval_data else None
-                except (json.JSONDecodeError, TypeError):
-                    data["evaluation"] = None
-            task = Task(**data)
+            task = self._task_from_row(row)
             # Cache the result
-            self._set_cache(cache_key, task)
+            if not in_transaction:
+                self._cache.set(cache_key, task)
             return task
         return None
 
+    async def get_unmet_dependencies(self, task_id: str) -> int | None:
+        """Number of dependencies of a task that are not completed yet, or None if it doesn't exist."""
+        row = await self._fetchone("SELECT unmet_dependencies FROM tasks WHERE id = ?", (task_id,))
+        return row["unmet_dependencies"] if row else None
+
+    async def list_ready_tasks(self, required_skill: str, limit: int = DEFAULT_PAGE_SIZE) -> list[Task]:
+        """Pending tasks for a skill whose dependencies are all completed, highest priority first."""
+        rows = await self._fetchall(
+            """
+            SELECT * FROM tasks
+            WHERE status = ? AND unmet_dependencies = 0 AND required_skill = ?
+            ORDER BY priority DESC, created_at
+            LIMIT ?
+            """,
+            (TaskStatus.PENDING.value, required_skill, check_page_size(limit)),
+        )
+        return self._task_from_row.many(rows)
+
+    async def fail_stale_tasks(self, status: TaskStatus, updated_before: datetime) -> list[str]:
+        """Mark every task in ``status`` not updated since ``updated_before`` as FAILED.
+
+        One UPDATE over idx_tasks_status_updated instead of reading and
+        rewriting each stale task. Like an expired lease, the failed tasks
+        lose their lease and leave their hunters' current task lists.
+
+        Returns:
+            The IDs of the failed tasks.
+        """
+        now = datetime.now(timezone.utc)
+
+        def fail(conn: sqlite3.Connection) -> list[sqlite3.Row]:
+            rows = conn.execute(
+                """
+                UPDATE tasks
+                SET status = ?, lease_id = NULL, lease_expires_at = NULL, lease_expires_at_us = NULL,
+                    updated_at = ?, updated_at_us = ?
+                WHERE status = ? AND updated_at_us < ?
+                RETURNING id, hunter_id
+                """,
+                (
+                    TaskStatus.FAILED.value,
+                    now.isoformat(),
+                    to_epoch_us(now),
+                    status.value,
+                    to_epoch_us(updated_before),
+                ),
+            ).fetchall()
+            by_hunter: dict[str, list[str]] = {}
+            for row in rows:
+                if row["hunter_id"]:
+                    by_hunter.setdefault(row["hunter_id"], []).append(row["id"])
+            conn.executemany(
+                """
+                UPDATE hunters SET current_tasks = (
+                    SELECT json_group_array(value) FROM json_each(current_tasks)
+                    WHERE value NOT IN (SELECT value FROM json_each(?))
+                )
+                WHERE id = ?
+                """,
+                [(json.dumps(task_ids), hunter_id) for hunter_id, task_ids in by_hunter.items()],
+            )
+            return rows
+
+        rows = await self._write(fail)
+        for row in rows:
+            self._invalidate("task", row["id"])
+            if row["hunter_id"]:
+                self._invalidate("hunter", row["hunter_id"])
+        return [row["id"] for row in rows]
+
+    async def list_lease_expiries(self, status: TaskStatus = TaskStatus.CLAIMED) -> list[tuple[int, str, str]]:
+        """(lease_expires_at_us, task_id, lease_id) of every leased task in ``status``."""
+        rows = await self._fetchall(
+            "SELECT lease_expires_at_us, id, lease_id FROM tasks "
+            "WHERE status = ? AND lease_expires_at_us IS NOT NULL AND lease_id IS NOT NULL",
+            (status.value,),
+        )
+        return [tuple(row) for row in rows]
+
+    async def expire_lease(
+        self, task_id: str, lease_id: str, now: datetime, max_expiries: int
+    ) -> Task | None:
+        """Take back a claimed task whose lease ``lease_id`` expired by ``now``.
+
+        One conditional UPDATE: it only matches while the task is still claimed
+        under that same lease, so a task that was started, completed or claimed
+        again in the meantime is left alone. The task returns to PENDING, or
+        becomes FAILED once this is its ``max_expiries``-th expiry, and leaves
+        the hunter's current task list.
+
+        Returns:
+            The updated task, or None if the lease was no longer current.
+        """
+        now_us = to_epoch_us(now)
+
+        def expire(conn: sqlite3.Connection) -> tuple[sqlite3.Row | None, str | None]:
+            holder = conn.execute("SELECT hunter_id FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            rows = conn.execute(
+                """
+                UPDATE tasks
+                SET status = CASE WHEN lease_expiries + 1 >= ? THEN ? ELSE ? END,
+                    hunter_id = CASE WHEN lease_expiries + 1 >= ? THEN hunter_id END,
+                    lease_id = NULL, lease_expires_at = NULL, lease_expires_at_us = NULL,
+                    lease_expiries = lease_expiries + 1, updated_at = ?, updated_at_us = ?
+                WHERE id = ? AND lease_id = ? AND status = ? AND lease_expires_at_us <= ?
+                RETURNING *
+                """,
+                (
+                    max_expiries,
+                    TaskStatus.FAILED.value,
+                    TaskStatus.PENDING.value,
+                    max_expiries,
+                    now.isoformat(),
+                    now_us,
+                    task_id,
+                    lease_id,
+                    TaskStatus.CLAIMED.value,
+                    now_us,
+                ),
+            ).fetchall()
+            row = rows[0] if rows else None
+            hunter_id = holder["hunter_id"] if row is not None and holder is not None else None
+            if hunter_id:
+                conn.execute(
+                    """
+                    UPDATE hunters SET current_tasks = (
+                        SELECT json_group_array(value) FROM json_each(current_tasks) WHERE value != ?
+                    )
+                    WHERE id = ?
+                    """,
+                    (task_id, hunter_id),
+                )
+            return row, hunter_id
+
+        row, hunter_id = await self._write(expire)
+        if row is None:
+            return None
+        self._invalidate("task", task_id)
+        if hunter_id:
+            self._invalidate("hunter", hunter_id)
+        task = self._task_from_row(row)
+        await self._notify_ready([task])
+        return task
+
+    async def task_counts(self, by: str | None = None) -> dict:
+        """Count tasks per status, optionally broken down by skill, publisher or hunter.
+
+        Returns ``{status: count}``, or ``{key: {status: count}}`` when ``by``
+        is one of TASK_COUNT_GROUPS. Reads the trigger-maintained
+        task_counters table rather than scanning tasks.
+        """
+        if by is not None and by not in TASK_COUNT_GROUPS:
+            raise ValueError(f"Unsupported task count grouping: {by}")
+        rows = await self._fetchall(
+            "SELECT key, status, n FROM task_counters WHERE dimension = ? AND n > 0", (by or "status",)
+        )
+        if by is None:
+            return {row["status"]: row["n"] for row in rows}
+        counts: dict = {}
+        for row in rows:
+            counts.setdefault(row["key"], {})[row["status"]] = row["n"]
+        return counts
+
+    async def count_hunters(self, task_status: TaskStatus | None = None) -> int:
+        """Number of hunters, or of distinct hunters holding a task in ``task_status``."""
+        if task_status is None:
+            row = await self._fetchone("SELECT COUNT(*) FROM hunters")
+        else:
+            row = await self._fetchone(
+                "SELECT COUNT(*) FROM task_counters WHERE dimension = 'hunter' AND status = ? AND n > 0",
+                (task_status.value,),
+            )
+        return row[0]
+
+    async def hunter_workload(self, hunter_id: str) -> int:
+        """Number of tasks the hunter holds claimed or in progress."""
+        row = await self._fetchone(f"SELECT {_HUNTER_WORKLOAD.format(hunter='?')}", (hunter_id,))
+        return row[0]
+
+    @staticmethod
+    def _move_to_archive(conn: sqlite3.Connection, task_ids: list[str]) -> list[str]:
+        """Move archivable tasks and their reports into cold storage; returns the moved IDs.
+
+        A failed task is kept while an unfinished task still depends on it,
+        since removing it from the hot file would unblock that dependent.
+        Copies are written before the originals are deleted and re-archiving
+        replaces a copy, so a crash between the two files' commits can only
+        leave a task in both places, never in neither.
+        """
+        moved = [
+            row["id"]
+            for row in conn.execute(
+                f"SELECT id FROM tasks WHERE id IN (SELECT value FROM json_each(?)) AND {ARCHIVABLE_TASK_FILTER}",
+                (json.dumps(task_ids),),
+            )
+        ]
+        if not moved:
+            return []
+        ids = json.dumps(moved)
+        for table, key in ARCHIVE_TABLES.items():
+            columns = [row["name"] for row in conn.execute(f"PRAGMA main.table_info({table})")]
+            select = columns
+            if table == "tasks":
+                select = [{"status": "?", "is_archived": "1"}.get(c, c) for c in columns]
+            params = (TaskStatus.ARCHIVED.value, ids) if table == "tasks" else (ids,)
+            conn.execute(
+                f"""
+                INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.{table} ({', '.join(columns)})
+                SELECT {', '.join(select)} FROM main.{table} WHERE {key} IN (SELECT value FROM json_each(?))
+                """,
+                params,
+            )
+        for table, key in ARCHIVE_TABLES.items():
+            conn.execute(f"DELETE FROM main.{table} WHERE {key} IN (SELECT value FROM json_each(?))", (ids,))
+        return moved
+
+    async def archive_tasks(self, task_ids: list[str]) -> int:
+        """Move finished tasks and their reports into the archive database.
+
+        Tasks that are not completed, failed or archived, or that do not
+        exist, are skipped. ``get_task`` still finds archived tasks.
+
+        Returns:
+            The number of tasks moved.
+        """
+        if not task_ids:
+            return 0
+        moved = await self._write(lambda conn: self._move_to_archive(conn, list(task_ids)))
+        for task_id in moved:
+            self._invalidate("task", task_id)
+        return len(moved)
+
+    async def archive_tasks_before(self, updated_before: datetime, limit: int = 500) -> int:
+        """Archive up to ``limit`` finished tasks last updated before ``updated_before``, oldest first.
+
+        Failed tasks that unfinished tasks still depend on are not candidates,
+        so they can't fill every batch and hold back the tasks behind them.
+
+        Returns:
+            The number of tasks moved; call again until it is below ``limit``.
+        """
+
+        def archive(conn: sqlite3.Connection) -> list[str]:
+            rows = conn.execute(
+                f"""
+                SELECT id FROM tasks
+                WHERE {ARCHIVABLE_TASK_FILTER} AND updated_at_us < ?
+                ORDER BY updated_at_us
+                LIMIT ?
+                """,
+                (to_epoch_us(updated_before), limit),
+            ).fetchall()
+            return self._move_to_archive(conn, [row["id"] for row in rows])
+
+        moved = await self._write(archive)
+        for task_id in moved:
+            self._invalidate("task", task_id)
+        return len(moved)
+
+    async def incremental_vacuum(self, max_pages: int | None = None) -> int:
+        """Return free pages of the hot database file to the filesystem.
+
+        Needs ``auto_vacuum=INCREMENTAL``, which new files get; a file created
+        before that needs a one-off full ``VACUUM`` (see ``vacuum``).
+
+        Returns:
+            The number of pages released.
+        """
+
+        def vacuum(conn: sqlite3.Connection) -> int:
+            if conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] != 2:
+                return 0
+            before = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+            pages = "" if max_pages is None else f"({int(max_pages)})"
+            # The pragma frees pages one step at a time, so it has to be run to completion
+            conn.execute(f"PRAGMA main.incremental_vacuum{pages}").fetchall()
+            return before - conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+
+        return await self._write(vacuum)
+
+    async def checkpoint(self, mode: str = "PASSIVE") -> dict[str, int]:
+        """Checkpoint the WAL of the hot and archive files into the databases.
+
+        PASSIVE never waits for readers or writers, so it is safe to run on a
+        timer; it just copies what it can.
+
+        Returns:
+            The ``busy``, ``log`` and ``checkpointed`` frame counts reported by SQLite.
+        """
+        mode = mode.upper()
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Unsupported checkpoint mode: {mode}")
+
+        def checkpoint(conn: sqlite3.Connection) -> dict[str, int]:
+            busy, log, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+            return {"busy": busy, "log": log, "checkpointed": checkpointed}
+
+        # A checkpoint cannot run inside a transaction, so bypass _write
+        async with self._pool.writer() as conn:
+            return await anyio.to_thread.run_sync(checkpoint, conn)
+
+    async def vacuum(self) -> None:
+        """Switch the hot file to incremental auto-vacuum and rebuild it with a full VACUUM."""
+
+        def vacuum(conn: sqlite3.Connection) -> None:
+            conn.execute("PRAGMA main.auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM main")
+
+        # VACUUM cannot run inside a transaction, so bypass _write
+        async with self._pool.writer() as conn:
+            await anyio.to_thread.run_sync(vacuum, conn)
+
     async def delete_task(self, task_id: str) -> None:
-        await self._execute_sync("DELETE FROM tasks WHERE id = ?", (task_id,))
+        await self._execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        self._invalidate("task", task_id)
 
     async def delete_hunter(self, hunter_id: str) -> None:
-        await self._execute_sync("DELETE FROM hunters WHERE id = ?", (hunter_id,))
+        await self._execute("DELETE FROM hunters WHERE id = ?", (hunter_id,))
+        self._invalidate("hunter", hunter_id)
 
     async def delete_report(self, report_id: str) -> None:
-        await self._execute_sync("DELETE FROM reports WHERE id = ?", (report_id,))
+        await self._execute("DELETE FROM reports WHERE id = ?", (report_id,))
 
-    async def save_hunter(self, hunter: Hunter) -> None:
-        await self._execute_sync(
-            "INSERT OR REPLACE INTO hunters VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (
-                hunter.id,
-                json.dumps(hunter.skills),
-                hunter.status,
-                json.dumps(hunter.current_tasks),
-                hunter.completed_tasks,
-                hunter.failed_tasks,
-                hunter.created_at.isoformat(),
-                hunter.updated_at.isoformat(),
-                hunter.last_read_discussion_timestamp.isoformat() if hunter.last_read_discussion_timestamp else None,
-            ),
+    @staticmethod
+    def _hunter_params(hunter: Hunter) -> tuple:
+        return (
+            hunter.id,
+            json.dumps(hunter.skills),
+            hunter.status,
+            json.dumps(hunter.current_tasks),
+            hunter.completed_tasks,
+            hunter.failed_tasks,
+            hunter.created_at.isoformat(),
+            hunter.updated_at.isoformat(),
+            hunter.last_read_discussion_timestamp.isoformat() if hunter.last_read_discussion_timestamp else None,
+            hunter.reputation,
+            to_epoch_us(hunter.created_at),
+            to_epoch_us(hunter.updated_at),
+            to_epoch_us(hunter.last_read_discussion_timestamp),
         )
-        # Invalidate hunter cache when saving
-        self._invalidate_cache("hunter:")
+
+    async def save_hunter(self, hunter: Hunter) -> None:
+        await self._execute(SAVE_HUNTER_SQL, self._hunter_params(hunter))
+        self._invalidate("hunter", hunter.id)
+
+    async def save_hunters_many(self, hunters: list[Hunter]) -> None:
+        """Insert or replace a batch of hunters in a single transaction."""
+        if not hunters:
+            return
+        params = [self._hunter_params(hunter) for hunter in hunters]
+        await self._write(lambda conn: conn.executemany(SAVE_HUNTER_SQL, params))
+        for hunter in hunters:
+            self._invalidate("hunter", hunter.id)
 
     async def get_hunter(self, hunter_id: str) -> Hunter | None:
+        # Inside a transaction the block's own uncommitted rows must be read, and never cached
+        in_transaction = self._transaction_connection() is not None
         # Check cache first
+        await self._sync_cache()
         cache_key = self._cache_key("hunter", hunter_id)
-        cached = self._get_from_cache(cache_key)
+        cached = None if in_transaction else self._cache.get(cache_key)
         if cached is not None:
             return cached
-            
-        cursor = await self._execute_sync("SELECT * FROM hunters WHERE id = ?", (hunter_id,))
-        row = await anyio.to_thread.run_sync(cursor.fetchone)
+
+        row = await self._fetchone("SELECT * FROM hunters WHERE id = ?", (hunter_id,))
         if row:
-            data = dict(row)
-            data["skills"] = json.loads(data["skills"])
-            data["current_tasks"] = json.loads(data["current_tasks"])
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-            data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-            if data["last_read_discussion_timestamp"]:
-                data["last_read_discussion_timestamp"] = datetime.fromisoformat(data["last_read_discussion_timestamp"])
-            hunter = Hunter(**data)
+            hunter = self._hunter_from_row(row)
             # Cache the result
-            self._set_cache(cache_key, hunter)
+            if not in_transaction:
+                self._cache.set(cache_key, hunter)
             return hunter
         return None
 
+    async def find_best_hunter(self, skill: str, exclude_hunter_ids: list[str] | None = None) -> Hunter | None:
+        """The active hunter with a positive level in ``skill`` and the highest routing score.
+
+        Walks idx_hunter_skills_rank in score order and stops at the first
+        eligible hunter, so the cost does not depend on the hunter population.
+        """
+        exclude = list(exclude_hunter_ids or [])
+        row = await self._fetchone(
+            f"""
+            SELECT h.* FROM hunter_skills s CROSS JOIN hunters h ON h.id = s.hunter_id
+            WHERE s.skill = ? AND s.level > 0 AND h.status = 'active'
+              AND s.hunter_id NOT IN ({', '.join('?' * len(exclude))})
+            ORDER BY s.score DESC, s.hunter_id
+            LIMIT 1
+            """,
+            (skill, *exclude),
+        )
+        return self._hunter_from_row(row) if row else None
+
     async def save_report(self, report: Report) -> None:
-        await self._execute_sync(
+        await self._execute(
             "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (
                 report.id,
@@ -290,73 +1592,111 @@ class SQLiteStore:
                 report.details,
                 report.result,
                 json.dumps(report.evaluation.model_dump()) if report.evaluation else None,
-                report.created_at.isoformat() if report.created_at else None,
-                report.updated_at.isoformat() if report.updated_at else None,
+                report.created_at,
+                report.updated_at,
             ),
         )
 
     async def get_report(self, report_id: str) -> Report | None:
-        cursor = await self._execute_sync("SELECT * FROM reports WHERE id = ?", (report_id,))
-        row = await anyio.to_thread.run_sync(cursor.fetchone)
+        row = await self._fetchone("SELECT * FROM reports WHERE id = ?", (report_id,))
         if row:
-            data = dict(row)
-            if data["created_at"]:
-                data["created_at"] = datetime.fromisoformat(data["created_at"])
-            if data["updated_at"]:
-                data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-            if data["evaluation"]:
-                try:
-                    eval_data = json.loads(data["evaluation"])
-                    data["evaluation"] = ReportEvaluation(**eval_data)
-                except (json.JSONDecodeError, TypeError):
-                    data["evaluation"] = None
-            return Report(**data)
+            return self._report_from_row(row)
         return None
 
     async def save_discussion_message(self, message: DiscussionMessage) -> None:
-        await self._execute_sync(
-            "INSERT OR REPLACE INTO discussion_messages (id, hunter_id, content, created_at) VALUES (?, ?, ?, ?)",
+        await self._execute(
+            "INSERT INTO discussion_messages (id, hunter_id, content, created_at, created_at_us) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET hunter_id = excluded.hunter_id, content = excluded.content, "
+            "created_at = excluded.created_at, created_at_us = excluded.created_at_us",
             (
                 message.id,
                 message.hunter_id,
                 message.content,
                 message.created_at.isoformat(),
+                to_epoch_us(message.created_at),
             ),
         )
 
     async def get_messages_after_timestamp(self, timestamp: datetime, limit: int = 50) -> list[DiscussionMessage]:
-        cursor = await self._execute_sync(
-            "SELECT * FROM discussion_messages WHERE created_at > ? ORDER BY created_at ASC LIMIT ?",
-            (timestamp.isoformat(), limit)
-        )
-        rows = await anyio.to_thread.run_sync(cursor.fetchall)
-        messages = []
-        for row in rows:
-            data = dict(row)
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-            messages.append(DiscussionMessage(**data))
-        return messages
+        rows = await self._fetchall(MESSAGES_AFTER_SQL, (to_epoch_us(timestamp), limit))
+        return self._message_from_row.many(rows)
 
     async def get_latest_messages(self, limit: int = 100) -> list[DiscussionMessage]:
-        cursor = await self._execute_sync("SELECT * FROM discussion_messages ORDER BY created_at DESC LIMIT ?", (limit,))
-        rows = await anyio.to_thread.run_sync(cursor.fetchall)
-        messages = []
-        for row in reversed(rows):
-            data = dict(row)
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-            messages.append(DiscussionMessage(**data))
-        return messages
+        rows = await self._fetchall("SELECT * FROM discussion_messages ORDER BY created_at_us DESC LIMIT ?", (limit,))
+        return self._message_from_row.many(reversed(rows))
+
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """Turn free text into an FTS5 query matching all of its terms.
+
+        Each term is quoted, so FTS5 operators and punctuation in user input
+        are matched literally instead of raising syntax errors.
+        """
+        terms = text.split()
+        if not terms:
+            raise ValueError("Search query must not be empty")
+        return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+    async def _search(
+        self, sql: str, params: tuple, limit: int, offset: int, mapper: RowMapper[M]
+    ) -> tuple[list[tuple[M, str, float]], int | None]:
+        check_page_size(limit)
+        if offset < 0:
+            raise ValueError("offset must not be negative")
+        # One extra row tells us whether there is a next page
+        rows = await self._fetchall(f"{sql} ORDER BY rank LIMIT ? OFFSET ?", (*params, limit + 1, offset))
+        next_offset = offset + limit if len(rows) > limit else None
+        rows = rows[:limit]
+        hits = [(item, row["snippet"], -row["rank"]) for item, row in zip(mapper.many(rows), rows)]
+        return hits, next_offset
+
+    async def search_tasks(
+        self, query: str, status: str | None = None, limit: int = 20, offset: int = 0
+    ) -> tuple[list[tuple[Task, str, float]], int | None]:
+        """Full-text search over task names and details, best matches first.
+
+        Returns (task, snippet, score) hits, where a higher score is a better
+        bm25 match and name matches weigh double, plus the offset of the next
+        page (None on the last page).
+        """
+        sql = """
+            SELECT t.*, snippet(tasks_fts, -1, '[', ']', '…', 16) AS snippet, bm25(tasks_fts, 2.0, 1.0) AS rank
+            FROM tasks_fts JOIN tasks t ON t.rowid = tasks_fts.rowid
+            WHERE tasks_fts MATCH ?
+        """
+        params: tuple = (self._fts_query(query),)
+        if status:
+            sql += " AND t.status = ?"
+            params += (status,)
+        return await self._search(sql, params, limit, offset, self._task_from_row)
+
+    async def search_discussion(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> tuple[list[tuple[DiscussionMessage, str, float]], int | None]:
+        """Full-text search over discussion messages, best matches first."""
+        sql = """
+            SELECT m.*, snippet(discussion_fts, 0, '[', ']', '…', 16) AS snippet, bm25(discussion_fts) AS rank
+            FROM discussion_fts JOIN discussion_messages m ON m.rowid = discussion_fts.rowid
+            WHERE discussion_fts MATCH ?
+        """
+        return await self._search(sql, (self._fts_query(query),), limit, offset, self._message_from_row)
 
     async def update_hunter_last_read_timestamp(self, hunter_id: str, timestamp: datetime) -> None:
-        await self._execute_sync(
-            "UPDATE hunters SET last_read_discussion_timestamp = ? WHERE id = ?",
-            (timestamp.isoformat(), hunter_id)
+        await self._execute(
+            "UPDATE hunters SET last_read_discussion_timestamp = ?, last_read_discussion_timestamp_us = ? WHERE id = ?",
+            (timestamp.isoformat(), to_epoch_us(timestamp), hunter_id)
         )
+        self._invalidate("hunter", hunter_id)
 
-    async def list_tasks(
-        self, status: str | None = None, required_skill: str | None = None, hunter_id: str | None = None
-    ) -> list[Task]:
-        sql = "SELECT * FROM tasks WHERE 1=1"
+    @staticmethod
+    def _task_filters(
+        status: str | None = None,
+        required_skill: str | None = None,
+        hunter_id: str | None = None,
+        columns: str = "*",
+    ) -> tuple[str, list]:
+        sql = f"SELECT {columns} FROM tasks WHERE 1=1"
         params = []
         if status:
             sql += " AND status = ?"
@@ -367,42 +1707,111 @@ class SQLiteStore:
         if hunter_id:
             sql += " AND hunter_id = ?"
             params.append(hunter_id)
-        cursor = await self._execute_sync(sql, tuple(params))
-        rows = await anyio.to_thread.run_sync(cursor.fetchall)
-        tasks = []
-        for row in rows:
-            data = dict(row)
-            data["status"] = TaskStatus(data["status"])
-            data["depends_on"] = json.loads(data["depends_on"]) if data["depends_on"] else []
-            data["created_at"] = datetime.fromisoformat(data["created_at"]) if data["created_at"] else None
-            data["updated_at"] = datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None
-            if data["lease_expires_at"]:
-                data["lease_expires_at"] = datetime.fromisoformat(data["lease_expires_at"])
-            if data["evaluation"]:
-                try:
-                    eval_data = json.loads(data["evaluation"])
-                    data["evaluation"] = TaskEvaluation(**eval_data) if eval_data else None
-                except (json.JSONDecodeError, TypeError):
-                    data["evaluation"] = None
-            tasks.append(Task(**data))
-        return tasks
+        return sql, params
+
+    @classmethod
+    def _list_tasks_query(
+        cls,
+        status: str | None = None,
+        required_skill: str | None = None,
+        hunter_id: str | None = None,
+        columns: str = "*",
+    ) -> tuple[str, tuple]:
+        """Build the SELECT used by list_tasks."""
+        sql, params = cls._task_filters(status, required_skill, hunter_id, columns)
+        return sql, tuple(params)
+
+    @staticmethod
+    def _keyset_query(sql: str, params: list, cursor: str | None, limit: int) -> tuple[str, tuple]:
+        """Append the keyset condition, ordering and LIMIT for one page to a filtered SELECT."""
+        check_page_size(limit)
+        if cursor:
+            sql += " AND (created_at, id) > (?, ?)"
+            params = [*params, *decode_cursor(cursor)]
+        # One extra row tells us whether there is a next page
+        sql += " ORDER BY created_at, id LIMIT ?"
+        return sql, (*params, limit + 1)
+
+    async def _fetch_page(
+        self, sql: str, params: tuple, limit: int, mapper: RowMapper[M]
+    ) -> tuple[list[M], str | None]:
+        rows = await self._fetchall(sql, params)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return mapper.many(rows), next_cursor
+
+    async def list_tasks(
+        self, status: str | None = None, required_skill: str | None = None, hunter_id: str | None = None
+    ) -> list[Task]:
+        sql, params = self._list_tasks_query(status, required_skill, hunter_id)
+        rows = await self._fetchall(sql, params)
+        return self._task_from_row.many(rows)
+
+    async def list_tasks_page(
+        self,
+        status: str | None = None,
+        required_skill: str | None = None,
+        hunter_id: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> tuple[list[Task], str | None]:
+        """Return one page of tasks ordered by (created_at, id) and the cursor of the next page."""
+        sql, params = self._task_filters(status, required_skill, hunter_id)
+        sql, params = self._keyset_query(sql, params, cursor, limit)
+        return await self._fetch_page(sql, params, limit, self._task_from_row)
+
+    async def list_task_summaries(
+        self, status: str | None = None, required_skill: str | None = None, hunter_id: str | None = None
+    ) -> list[TaskSummary]:
+        """Like list_tasks, but reads only the TaskSummary columns."""
+        sql, params = self._list_tasks_query(status, required_skill, hunter_id, TASK_SUMMARY_COLUMNS)
+        rows = await self._fetchall(sql, params)
+        return self._task_summary_from_row.many(rows)
+
+    async def list_task_summaries_page(
+        self,
+        status: str | None = None,
+        required_skill: str | None = None,
+        hunter_id: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> tuple[list[TaskSummary], str | None]:
+        """Like list_tasks_page, but reads only the TaskSummary columns."""
+        sql, params = self._task_filters(status, required_skill, hunter_id, TASK_SUMMARY_COLUMNS)
+        sql, params = self._keyset_query(sql, params, cursor, limit)
+        return await self._fetch_page(sql, params, limit, self._task_summary_from_row)
+
+    def iter_tasks(
+        self,
+        status: str | None = None,
+        required_skill: str | None = None,
+        hunter_id: str | None = None,
+        summary: bool = False,
+        chunk_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[Task] | AsyncIterator[TaskSummary]:
+        """Stream tasks matching the filters in chunks; see ``_iter_rows``."""
+        columns = TASK_SUMMARY_COLUMNS if summary else "*"
+        sql, params = self._list_tasks_query(status, required_skill, hunter_id, columns)
+        mapper = self._task_summary_from_row if summary else self._task_from_row
+        return self._iter_rows(sql, params, mapper, chunk_size)
 
     async def list_hunters(self) -> list[Hunter]:
-        cursor = await self._execute_sync("SELECT * FROM hunters")
-        rows = await anyio.to_thread.run_sync(cursor.fetchall)
-        hunters = []
-        for row in rows:
-            data = dict(row)
-            data["skills"] = json.loads(data["skills"])
-            data["current_tasks"] = json.loads(data["current_tasks"])
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-            data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-            hunters.append(Hunter(**data))
-        return hunters
+        rows = await self._fetchall("SELECT * FROM hunters")
+        return self._hunter_from_row.many(rows)
 
-    async def list_reports(
-        self, task_id: str | None = None, hunter_id: str | None = None, status: str | None = None, limit: int = 100
-    ) -> list[Report]:
+    async def list_hunters_page(
+        self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+    ) -> tuple[list[Hunter], str | None]:
+        """Return one page of hunters ordered by (created_at, id) and the cursor of the next page."""
+        sql, params = self._keyset_query("SELECT * FROM hunters WHERE 1=1", [], cursor, limit)
+        return await self._fetch_page(sql, params, limit, self._hunter_from_row)
+
+    @staticmethod
+    def _report_filters(
+        task_id: str | None = None, hunter_id: str | None = None, status: str | None = None
+    ) -> tuple[str, list]:
         sql = "SELECT * FROM reports WHERE 1=1"
         params = []
         if task_id:
@@ -414,22 +1823,44 @@ class SQLiteStore:
         if status:
             sql += " AND status = ?"
             params.append(status)
+        return sql, params
+
+    @classmethod
+    def _list_reports_query(
+        cls, task_id: str | None = None, hunter_id: str | None = None, status: str | None = None, limit: int = 100
+    ) -> tuple[str, tuple]:
+        """Build the SELECT used by list_reports."""
+        sql, params = cls._report_filters(task_id, hunter_id, status)
         sql += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
-        cursor = await self._execute_sync(sql, tuple(params))
-        rows = await anyio.to_thread.run_sync(cursor.fetchall)
-        reports = []
-        for row in rows:
-            data = dict(row)
-            if data["created_at"]:
-                data["created_at"] = datetime.fromisoformat(data["created_at"])
-            if data["updated_at"]:
-                data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-            if data["evaluation"]:
-                try:
-                    eval_data = json.loads(data["evaluation"])
-                    data["evaluation"] = ReportEvaluation(**eval_data)
-                except (json.JSONDecodeError, TypeError):
-                    data["evaluation"] = None
-            reports.append(Report(**data))
-        return reports
\ No newline at end of file
+        return sql, (*params, limit)
+
+    async def list_reports(
+        self, task_id: str | None = None, hunter_id: str | None = None, status: str | None = None, limit: int = 100
+    ) -> list[Report]:
+        sql, params = self._list_reports_query(task_id, hunter_id, status, limit)
+        rows = await self._fetchall(sql, params)
+        return self._report_from_row.many(rows)
+
+    def iter_reports(
+        self,
+        task_id: str | None = None,
+        hunter_id: str | None = None,
+        status: str | None = None,
+        chunk_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[Report]:
+        """Stream all reports matching the filters in chunks; see ``_iter_rows``."""
+        sql, params = self._report_filters(task_id, hunter_id, status)
+        return self._iter_rows(sql, tuple(params), self._report_from_row, chunk_size)
+
+    async def list_reports_page(
+        self,
+        task_id: str | None = None,
+        hunter_id: str | None = None,
+        status: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> tuple[list[Report], str | None]:
+        """Return one page of reports ordered by (created_at, id) and the cursor of the next page."""
+        sql, params = self._report_filters(task_id, hunter_id, status)
+        sql, params = self._keyset_query(sql, params, cursor, limit)
+        return await self._fetch_page(sql, params, limit, self._report_from_row)
@@ -0,0 +1,36 @@
+"""
+时间戳转换 - integer microsecond-epoch companions for timestamp columns.
+
+ISO strings only compare correctly as text when every value uses the same
+format and offset, which mixed naive/aware values do not. Range-scanned
+columns therefore also get an ``*_us`` INTEGER column holding microseconds
+since the Unix epoch (UTC), which is what the range queries use.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_epoch_us(value: datetime | str | None) -> int | None:
+    """Microseconds since the epoch for a datetime or ISO string.
+
+    Naive values are taken to be UTC, which is what the store has always
+    meant by them.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    # Integer arithmetic on the timedelta keeps full microsecond precision
+    delta = value - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_epoch_us(value: int | None) -> datetime | None:
+    """Aware UTC datetime for a microsecond epoch value."""
+    if value is None:
+        return None
+    return EPOCH + timedelta(microseconds=value)
@@ -0,0 +1,138 @@
+"""
+Group-commit写队列 - batches writes from many callers into one transaction.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from collections.abc import Callable
+from typing import Any
+
+import anyio
+
+from ..utils.performance_monitor import record_metric
+from .connection_pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+WriteOp = Callable[[sqlite3.Connection], Any]
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Single writer task that commits queued writes in batches.
+
+    Callers submit a write operation and await its result. The writer takes
+    the first queued operation, keeps collecting whatever else arrives within
+    ``window`` seconds (up to ``max_batch`` operations), and runs the whole
+    batch in one ``BEGIN IMMEDIATE … COMMIT`` on the pool's writer connection,
+    so a burst of writes costs one commit instead of one per statement.
+
+    Each operation runs inside its own SAVEPOINT: an operation that raises is
+    rolled back on its own and its caller gets the exception, while the rest
+    of the batch still commits. If the COMMIT itself fails, every caller in
+    the batch gets that error.
+    """
+
+    def __init__(self, pool: ConnectionPool, window: float = 0.002, max_batch: int = 256):
+        self._pool = pool
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self.stats = {"batches": 0, "writes": 0, "max_batch": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="taskhub-group-commit")
+
+    async def stop(self) -> None:
+        """Commit everything already queued, then stop the writer task."""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(self, fn: WriteOp) -> Any:
+        """Queue a write and wait until the batch containing it has committed."""
+        if not self.running:
+            raise RuntimeError("Group-commit writer is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, future))
+        return await future
+
+    async def _collect(self, first: tuple) -> tuple[list[tuple], bool]:
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch, stopping = await self._collect(item)
+            ops = [fn for fn, _ in batch]
+            start = time.perf_counter()
+            try:
+                async with self._pool.writer() as conn:
+                    results = await anyio.to_thread.run_sync(self._commit_batch, conn, ops)
+            except Exception as e:
+                logger.error(f"Group commit of {len(batch)} writes failed: {e}")
+                results = [(False, e)] * len(batch)
+            record_metric("db.group_commit", time.perf_counter() - start)
+
+            self.stats["batches"] += 1
+            self.stats["writes"] += len(batch)
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            for (_, future), (ok, value) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    @staticmethod
+    def _commit_batch(conn: sqlite3.Connection, ops: list[WriteOp]) -> list[tuple[bool, Any]]:
+        results: list[tuple[bool, Any]] = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for fn in ops:
+                conn.execute("SAVEPOINT group_op")
+                try:
+                    results.append((True, fn(conn)))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO group_op")
+                    results.append((False, e))
+                finally:
+                    conn.execute("RELEASE group_op")
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return results
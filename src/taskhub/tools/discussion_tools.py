@@ -10,6 +10,8 @@ from .. import mcp
 
 from taskhub.services import discussion_service
 from taskhub.context import get_app_context
+from ..utils.error_handler import handle_tool_errors, create_success_response, ValidationError
+from ..utils.performance_monitor import monitor_performance
 logger = logging.getLogger(__name__)
 
 # Define the tool functions
@@ -59,3 +61,39 @@ async def post_discussion_message(ctx: Context, message: str) -> dict[str, Any]:
         "status": "Message posted successfully.",
     }
 
+
+@mcp.tool()
+@handle_tool_errors
+@monitor_performance("search_discussion")
+async def search_discussion(ctx: Context, query: str, limit: int = 20, offset: int = 0) -> dict[str, Any]:
+    """
+    Full-text search of the public discussion forum.
+
+    Every word of the query must appear in the message. Results are ranked by
+    relevance (bm25) and each hit carries a snippet with the matched words in
+    [brackets]. When more results exist, the response contains 'next_offset';
+    pass it back as 'offset' for the next page.
+
+    Args:
+        ctx: The application context.
+        query: Words to search for.
+        limit: Maximum number of results to return (1-1000).
+        offset: Number of results to skip.
+
+    Returns:
+        A page of hits, each with the message, a snippet and a relevance score.
+    """
+    context = await get_app_context(ctx)
+    store = context.store
+
+    try:
+        hits, next_offset = await discussion_service.discussion_search(store, query, limit=limit, offset=offset)
+    except ValueError as e:
+        raise ValidationError(str(e), field="query")
+    return create_success_response({
+        "items": [
+            {"message": message.model_dump(), "snippet": snippet, "score": score}
+            for message, snippet, score in hits
+        ],
+        "next_offset": next_offset,
+    })
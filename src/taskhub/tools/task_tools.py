@@ -17,10 +17,16 @@ from .. import mcp
 from taskhub.models.task import TaskStatus
 from taskhub.services import (
     task_publish,
+    task_publish_many,
     task_claim,
+    task_claim_next,
+    task_wait_for,
     task_start,
     task_complete,
+    check_task_fields,
     task_list,
+    task_list_page,
+    task_search,
     get_task,
     report_submit
 )
@@ -34,6 +40,7 @@ from ..utils.error_handler import (
     validate_string_length
 )
 from ..utils.performance_monitor import monitor_performance
+from ..storage.pagination import DEFAULT_PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +96,42 @@ async def publish_task(
     logger.info(f"Task {task.id} published successfully")
     return task.model_dump()
 
+@mcp.tool()
+@handle_tool_errors
+@monitor_performance("publish_tasks")
+async def publish_tasks(ctx: Context, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Publish a batch of tasks in one call.
+    
+    Use this instead of repeated publish_task calls when breaking work down into
+    many tasks. The batch is published atomically: if any task is invalid, none
+    are published.
+    
+    Each task is a dictionary with the same fields as publish_task ('name',
+    'details', 'required_skill', optional 'depends_on') plus an optional 'key'.
+    A task's 'depends_on' may list keys of other tasks in the same batch, which
+    are replaced with their generated task IDs.
+    
+    Args:
+        ctx: The application context.
+        tasks: The tasks to publish.
+        
+    Returns:
+        The newly created task objects, in the same order as the input.
+    """
+    if not tasks:
+        raise ValidationError("tasks must not be empty", field="tasks")
+    logger.info(f"Publishing batch of {len(tasks)} tasks")
+    context = await get_app_context(ctx)
+    store = context.store
+    hunter_id = context.hunter_id
+    
+    try:
+        published = await task_publish_many(store, tasks, hunter_id)
+    except ValueError as e:
+        raise ValidationError(str(e), field="tasks")
+    logger.info(f"{len(published)} tasks published successfully")
+    return create_success_response([task.model_dump() for task in published], "Tasks published successfully")
+
 @mcp.tool()
 @handle_tool_errors
 @monitor_performance("claim_task")
@@ -116,6 +159,66 @@ async def claim_task(ctx: Context, task_id: str) -> Dict[str, Any]:
     logger.info(f"Task {task_id} claimed successfully by hunter {hunter_id}")
     return task.model_dump()
 
+@mcp.tool()
+@handle_tool_errors
+@monitor_performance("claim_next_task")
+async def claim_next_task(ctx: Context, skill: Optional[str] = None) -> Dict[str, Any]:
+    """Claim the next available task in a single call.
+    
+    This tool picks the highest-priority pending task whose dependencies are all
+    completed and claims it for the hunter atomically. Use it instead of listing
+    tasks and claiming one of them, which can race with other hunters.
+    
+    Args:
+        ctx: The application context.
+        skill: Optional skill to look for. Defaults to any of the hunter's skills.
+        
+    Returns:
+        The claimed task, or no data if there is no ready task right now.
+    """
+    context = await get_app_context(ctx)
+    store = context.store
+    hunter_id = context.hunter_id
+    task = await task_claim_next(store, hunter_id, skill)
+    if not task:
+        logger.info(f"No ready task for hunter {hunter_id}")
+        return create_success_response(None, "No ready task available")
+    logger.info(f"Task {task.id} claimed successfully by hunter {hunter_id}")
+    return create_success_response(task.model_dump(), "Task claimed successfully")
+
+@mcp.tool()
+@handle_tool_errors
+@monitor_performance("wait_for_task")
+async def wait_for_task(
+    ctx: Context, skills: Optional[List[str]] = None, timeout: float = 30
+) -> Dict[str, Any]:
+    """Wait for a task and claim it as soon as one is available.
+    
+    Use this instead of polling list_tasks or claim_next_task in a loop. The
+    call returns immediately if a ready task exists; otherwise it waits until
+    a matching task is published or released by an expired claim, and claims
+    it for the hunter atomically.
+    
+    Args:
+        ctx: The application context.
+        skills: Optional skills to wait for. Defaults to all of the hunter's skills.
+        timeout: Seconds to wait before giving up (capped by the server, 60 by default).
+        
+    Returns:
+        The claimed task, or no data if no task became available within the timeout.
+    """
+    if timeout < 0:
+        raise ValidationError("timeout must not be negative", field="timeout")
+    context = await get_app_context(ctx)
+    store = context.store
+    hunter_id = context.hunter_id
+    task = await task_wait_for(store, hunter_id, skills, timeout)
+    if not task:
+        logger.info(f"No task became available for hunter {hunter_id} within {timeout}s")
+        return create_success_response(None, "No task became available before the timeout")
+    logger.info(f"Task {task.id} claimed successfully by hunter {hunter_id} after waiting")
+    return create_success_response(task.model_dump(), "Task claimed successfully")
+
 @mcp.tool()
 @handle_tool_errors
 @monitor_performance("start_task")
@@ -210,8 +313,7 @@ async def submit_report(
     
     hunter_id = context.hunter_id
     
-    await store.begin()
-    try:
+    async with store.transaction():
         # 1. 提交原始报告
         report = await report_submit(store, task_id, hunter_id, status, result, details)
         
@@ -220,7 +322,7 @@ async def submit_report(
             original_task = await store.get_task(task_id)
             
             # 3. 上下文感知触发：仅为高优、非评价任务创建评价任务
-            if original_task and original_task.priority > 3 and original_task.type != TaskType.EVALUATION:
+            if original_task and original_task.priority > 3 and original_task.task_type != TaskType.EVALUATION:
                 # 4. 智能路由：找到最佳评价者
                 best_evaluator = await hunter_service.find_best_hunter_for_task(
                     store,
@@ -240,20 +342,12 @@ async def submit_report(
                     details=eval_task_details,
                     required_skill=original_task.required_skill,
                     publisher_id="system_automata",
-                    type=TaskType.EVALUATION,
-                    parent_task_id=original_task.id,
-                    assignee_id=assignee_id
+                    task_type=TaskType.EVALUATION,
                 )
-                logger.info(f"Automated evaluation task created and assigned to {assignee_id}")
-        
-        await store.commit()
-        logger.info(f"Report submitted successfully with ID: {report.id}")
-        return report.model_dump()
-        
-    except Exception as e:
-        await store.rollback()
-        logger.error(f"Failed to submit report: {str(e)}")
-        raise
+                logger.info(f"Automated evaluation task created, suggested evaluator: {assignee_id}")
+    
+    logger.info(f"Report submitted successfully with ID: {report.id}")
+    return report.model_dump()
 
 @mcp.tool()
 @handle_tool_errors
@@ -261,47 +355,107 @@ async def submit_report(
 async def list_tasks(
     ctx: Context,
     status: Optional[str] = None,
-    priority: Optional[str] = None,
+    required_skill: Optional[str] = None,
     assignee_id: Optional[str] = None,
-    tags: Optional[List[str]] = None
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    fields: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
-    """List tasks with optional filtering.
+    """List tasks with optional filtering, one page at a time.
+    
+    Tasks are returned oldest first. When more tasks match, the response contains a
+    'next_cursor'; pass it back as 'cursor' to get the next page.
     
     Args:
         ctx: The application context.
         status: Optional task status filter.
-        priority: Optional task priority filter.
+        required_skill: Optional required skill filter.
         assignee_id: Optional assignee ID filter.
-        tags: Optional tags filter.
+        limit: Maximum number of tasks to return (1-1000).
+        cursor: Cursor from the previous page, omit for the first page.
+        summary: Return only id, name, skill, status, priority, assignee, publisher and timestamps.
+        fields: Optional list of task fields to return for each task.
         
     Returns:
-        List of task dictionaries.
+        A page of task dictionaries and the cursor of the next page.
     """
     context = await get_app_context(ctx)
     store = context.store
     
     # Parse filters
-    filters = {}
+    task_status = None
     if status:
         try:
-            filters["status"] = TaskStatus(status)
+            task_status = TaskStatus(status)
         except ValueError:
             raise ValidationError(f"Invalid status: {status}", field="status")
-    if priority:
+    
+    try:
+        summary = check_task_fields(fields) or (summary and not fields)
+    except ValueError as e:
+        raise ValidationError(str(e), field="fields")
+
+    try:
+        tasks, next_cursor = await task_list_page(
+            store, task_status, required_skill, assignee_id, limit=limit, cursor=cursor, summary=summary
+        )
+    except ValueError as e:
+        raise ValidationError(str(e), field="cursor" if cursor else "limit")
+    include = set(fields) if fields else None
+    return create_success_response({
+        "items": [task.model_dump(include=include) for task in tasks],
+        "next_cursor": next_cursor,
+    })
+
+@mcp.tool()
+@handle_tool_errors
+@monitor_performance("search_tasks")
+async def search_tasks(
+    ctx: Context,
+    query: str,
+    status: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """Full-text search for tasks by name and details.
+    
+    Every word of the query must appear in the task. Results are ranked by
+    relevance (bm25, matches in the name count double) and each hit carries a
+    snippet with the matched words in [brackets]. When more results exist, the
+    response contains 'next_offset'; pass it back as 'offset' for the next page.
+    
+    Args:
+        ctx: The application context.
+        query: Words to search for.
+        status: Optional task status filter.
+        limit: Maximum number of results to return (1-1000).
+        offset: Number of results to skip.
+        
+    Returns:
+        A page of hits, each with the task, a snippet and a relevance score.
+    """
+    context = await get_app_context(ctx)
+    store = context.store
+
+    task_status = None
+    if status:
         try:
-            from taskhub.models.task import TaskPriority
-            filters["priority"] = TaskPriority(priority)
+            task_status = TaskStatus(status)
         except ValueError:
-            raise ValidationError(f"Invalid priority: {priority}", field="priority")
-    if assignee_id:
-        filters["assignee_id"] = assignee_id
-    if tags:
-        if not isinstance(tags, list):
-            raise ValidationError("tags must be a list", field="tags")
-        filters["tags"] = tags
-    
-    tasks = await task_list(store, **filters)
-    return create_success_response([task.model_dump() for task in tasks])
+            raise ValidationError(f"Invalid status: {status}", field="status")
+
+    try:
+        hits, next_offset = await task_search(store, query, task_status, limit=limit, offset=offset)
+    except ValueError as e:
+        raise ValidationError(str(e), field="query")
+    return create_success_response({
+        "items": [
+            {"task": task.model_dump(), "snippet": snippet, "score": score}
+            for task, snippet, score in hits
+        ],
+        "next_offset": next_offset,
+    })
 
 @mcp.tool()
 @handle_tool_errors
@@ -22,7 +22,11 @@ DEFAULT_CONFIG = {
     "task": {
         "default_lease_duration": 30,
         "max_lease_duration": 120,
-        "cleanup_interval": 300
+        "cleanup_interval": 300,
+        "max_lease_expiries": 3,  # A claim that expires this many times fails the task
+        "lease_resync_interval": 60,  # Seconds between reloads of claims made by other processes
+        "wait_max_timeout": 60,  # Longest wait_for_task long-poll, in seconds
+        "wait_poll_interval": 5  # Seconds between claim retries of a waiting hunter without a wakeup
     },
     "database": {
         "directory": "data",
@@ -32,6 +36,23 @@ DEFAULT_CONFIG = {
     "workflow": {
         "evaluation_task_timeout_hours": 24  # Timeout in hours
     },
+    "namespaces": {
+        "max_open_stores": 64,  # Least recently used idle stores are closed beyond this
+        "idle_timeout": 600  # Seconds before an unused store is closed
+    },
+    "archive": {
+        "after_days": 30,  # Finished tasks untouched for this long move to the archive database
+        "batch_size": 500,
+        "interval": 3600  # Seconds between archival runs
+    },
+    "scheduler": {
+        "max_workers": 4,  # Namespaces maintained concurrently
+        "jitter": 30,  # Random spread of job start times, in seconds
+        "checkpoint_interval": 300,
+        "change_log_prune_interval": 600,  # Trims change_log to cache.change_log_retention entries
+        "leader_retry_interval": 30,
+        "lock_file": "data/.scheduler.lock"  # Only the process holding this lock runs jobs
+    },
     "llm": {
         "api_key": "your_default_key_for_dev",  # Should be set via environment variables in production
         "model_name": "gpt-3.5-turbo"
@@ -95,6 +116,24 @@ class TaskhubConfig:
             else:
                 base[key] = value
     
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a configuration value using dot notation, e.g. ``task.default_lease_duration``.
+        
+        Args:
+            key: Dotted configuration key.
+            default: Value returned when the key is not set.
+            
+        Returns:
+            The configuration value.
+        """
+        value: Any = self.config
+        for part in key.split('.'):
+            if isinstance(value, dict) and part in value:
+                value = value[part]
+            else:
+                return default
+        return value
+    
     def get_database_path(self, namespace: str) -> str:
         """Get the database path for a given namespace.
         
@@ -116,6 +116,11 @@ def performance_context(operation_name: str):
         _metrics.record_call(operation_name, duration, error)
 
 
+def record_metric(operation_name: str, duration: float, error: bool = False) -> None:
+    """Record a measurement taken outside of the decorators, e.g. a pool wait time."""
+    _metrics.record_call(operation_name, duration, error)
+
+
 def get_performance_summary() -> Dict[str, Any]:
     """Get a summary of all performance metrics."""
     return {
@@ -138,6 +143,7 @@ _metrics.record_call("__startup_time", 0.0)
 __all__ = [
     "monitor_performance",
     "performance_context",
+    "record_metric",
     "get_performance_summary",
     "reset_performance_metrics",
     "PerformanceMetrics"
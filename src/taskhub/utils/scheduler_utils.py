@@ -5,35 +5,294 @@ This module provides shared utilities for running scheduled tasks,
 eliminating code duplication across different modules.
 """
 
+import asyncio
 import logging
+import os
+import random
+import time
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
 from taskhub.storage.sqlite_store import SQLiteStore
 from taskhub.services import system_service
 from taskhub.utils.config import config
+from taskhub.utils.performance_monitor import record_metric
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 logger = logging.getLogger(__name__)
 
+Job = Callable[[SQLiteStore], Awaitable[Any]]
+StoreProvider = Callable[[str], AbstractAsyncContextManager[SQLiteStore]]
+
+
+def list_namespaces() -> List[str]:
+    """
+    Namespaces that have a database file, found from ``database.directory`` and
+    ``database.filename_pattern``. Archive files (see SQLiteStore.archive_path)
+    are not namespaces and are skipped.
+    """
+    directory = Path(config.get("database.directory", "data"))
+    prefix, _, suffix = config.get("database.filename_pattern", "taskhub_{namespace}.db").partition("{namespace}")
+    if not directory.is_dir():
+        return []
+    names = {
+        path.name[len(prefix):len(path.name) - len(suffix)]
+        for path in directory.glob(f"{prefix}*{suffix}")
+        if len(path.name) > len(prefix) + len(suffix)
+    }
+    return sorted(name for name in names if not (name.endswith("_archive") and name[:-len("_archive")] in names))
+
+
+class LeaderLock:
+    """
+    Host-wide leader election through an exclusive, non-blocking lock on a file.
+    
+    The operating system releases the lock when the holding process exits, so
+    another process can take over on its next attempt.
+    """
+    
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._file = None
+    
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+    
+    def acquire(self) -> bool:
+        """Try to become leader; returns whether this process holds the lock."""
+        if self._file is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            file.close()
+            return False
+        file.seek(0)
+        file.truncate()
+        file.write(f"{os.getpid()}\n")
+        file.flush()
+        self._file = file
+        return True
+    
+    def release(self) -> None:
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+@dataclass
+class MaintenanceJob:
+    """A maintenance job run against every namespace store on an interval."""
+    name: str
+    func: Job
+    interval: float
+    jitter: float
+    runs: int = 0
+    errors: int = 0
+    last_run: Optional[str] = None
+    last_duration: float = 0.0
+    last_results: Dict[str, Any] = field(default_factory=dict)
 
-async def run_stale_task_check():
+
+class MaintenanceScheduler:
     """
-    Scheduler job wrapper to create a store instance and run the stale task check.
+    Runs registered maintenance jobs on intervals across all namespace databases.
     
-    This function is designed to be used as a scheduled job that runs independently
-    of the main application context. It creates its own database store instance
-    and performs the stale task escalation check.
+    Each job run fans out over every namespace from ``list_namespaces``,
+    at most ``max_workers`` namespaces at a time, and is spread by a random
+    jitter so processes and jobs don't fire in lockstep. Only the process
+    holding the leader lock schedules jobs; the others retry every
+    ``leader_retry_interval`` seconds and take over when the leader exits.
+    Stores come from ``store_provider`` (e.g. ``StoreRegistry.maintenance``),
+    so already open namespace stores are reused.
+    """
+    
+    def __init__(
+        self,
+        store_provider: StoreProvider,
+        max_workers: int = 4,
+        lock_path: Path | str = "data/.scheduler.lock",
+        leader_retry_interval: float = 30,
+        namespaces: Callable[[], List[str]] = list_namespaces,
+    ):
+        self.store_provider = store_provider
+        self.max_workers = max(1, max_workers)
+        self.leader_lock = LeaderLock(lock_path)
+        self.leader_retry_interval = leader_retry_interval
+        self.namespaces = namespaces
+        self.jobs: Dict[str, MaintenanceJob] = {}
+        self._scheduler: Optional[AsyncIOScheduler] = None
+        # Job runs in flight, awaited by stop() before the stores can be closed
+        self._running: set[asyncio.Task] = set()
+    
+    @property
+    def is_leader(self) -> bool:
+        return self.leader_lock.held
+    
+    def register_job(self, name: str, func: Job, interval: float, jitter: float = 0) -> None:
+        """Register ``func(store)`` to run every ``interval`` seconds (± ``jitter``) on every namespace."""
+        self.jobs[name] = MaintenanceJob(name, func, interval, jitter)
+        if self._scheduler is not None and self.is_leader:
+            self._schedule(self.jobs[name])
+    
+    async def _run_on(self, job: MaintenanceJob, namespace: str, workers: asyncio.Semaphore) -> Any:
+        async with workers:
+            try:
+                async with self.store_provider(namespace) as store:
+                    return await job.func(store)
+            except Exception as e:
+                job.errors += 1
+                logger.error(f"Scheduled job {job.name} failed for namespace {namespace}: {e}")
+                return {"error": str(e)}
+    
+    async def run_job(self, name: str) -> Dict[str, Any]:
+        """Run a job once on every namespace; returns the result (or error) per namespace."""
+        job = self.jobs[name]
+        start = time.perf_counter()
+        namespaces = self.namespaces()
+        workers = asyncio.Semaphore(self.max_workers)
+        current = asyncio.current_task()
+        self._running.add(current)
+        try:
+            results = await asyncio.gather(*[self._run_on(job, namespace, workers) for namespace in namespaces])
+        finally:
+            self._running.discard(current)
+        job.runs += 1
+        job.last_run = datetime.now().isoformat()
+        job.last_duration = time.perf_counter() - start
+        job.last_results = dict(zip(namespaces, results))
+        record_metric(f"scheduler.{name}", job.last_duration)
+        logger.info(f"Scheduled job {name} ran on {len(namespaces)} namespaces in {job.last_duration:.2f}s")
+        return job.last_results
+    
+    def _schedule(self, job: MaintenanceJob) -> None:
+        self._scheduler.add_job(
+            self.run_job,
+            IntervalTrigger(seconds=job.interval, jitter=job.jitter or None),
+            args=[job.name],
+            id=job.name,
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            # First run shortly after startup rather than a full interval later
+            next_run_time=datetime.now() + timedelta(seconds=random.uniform(0, job.jitter)),
+        )
+    
+    def _try_lead(self) -> None:
+        if not self.leader_lock.acquire():
+            return
+        logger.info(f"Became scheduler leader (pid {os.getpid()})")
+        if self._scheduler.get_job("leader_retry"):
+            self._scheduler.remove_job("leader_retry")
+        for job in self.jobs.values():
+            self._schedule(job)
+    
+    def start(self) -> None:
+        """Start scheduling; jobs only run while this process is the leader."""
+        if self._scheduler is not None:
+            return
+        self._scheduler = AsyncIOScheduler()
+        self._scheduler.start()
+        self._try_lead()
+        if not self.is_leader:
+            logger.info("Another process is the scheduler leader; standing by")
+            self._scheduler.add_job(
+                self._try_lead, IntervalTrigger(seconds=self.leader_retry_interval), id="leader_retry"
+            )
+    
+    async def stop(self) -> None:
+        """Stop scheduling and wait for job runs in flight, which may still be using stores."""
+        if self._scheduler is None:
+            return
+        self._scheduler.shutdown(wait=False)
+        self._scheduler = None
+        running = [task for task in self._running if task is not asyncio.current_task()]
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        self.leader_lock.release()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "leader": self.is_leader,
+            "max_workers": self.max_workers,
+            "jobs": {
+                name: {
+                    "interval": job.interval,
+                    "runs": job.runs,
+                    "errors": job.errors,
+                    "last_run": job.last_run,
+                    "last_duration": job.last_duration,
+                }
+                for name, job in self.jobs.items()
+            },
+        }
+
+
+async def _archive_job(store: SQLiteStore) -> dict:
+    return await system_service.archive_old_tasks(
+        store,
+        timedelta(days=config.get("archive.after_days", 30)),
+        batch_size=config.get("archive.batch_size", 500),
+    )
+
+
+async def _checkpoint_job(store: SQLiteStore) -> dict:
+    return await store.checkpoint()
+
+
+async def _prune_change_log_job(store: SQLiteStore) -> dict:
+    return {"pruned": await store.prune_change_log()}
+
+
+def create_maintenance_scheduler(store_provider: StoreProvider) -> MaintenanceScheduler:
+    """
+    Build the scheduler with the standard maintenance jobs, configured from
+    the ``scheduler`` section:
     
-    Note: In multi-tenant scenarios, this uses the default namespace. For more
-    complex multi-tenant setups, consider extending this function.
+    - stale_sweep: expire due leases, then fail stale tasks, every ``task.cleanup_interval`` seconds
+    - archival: move old finished tasks to the archive, every ``archive.interval`` seconds
+    - wal_checkpoint: passive WAL checkpoint, every ``scheduler.checkpoint_interval`` seconds
+    - change_log_prune: trim change_log, every ``scheduler.change_log_prune_interval`` seconds
     """
-    # Note: Scheduler jobs run independently and need their own store instance
-    # We assume the default namespace is 'default' for multi-tenant scenarios
-    db_path = config.get_database_path(config.get_default_namespace())
-    store = SQLiteStore(db_path)
-    await store.connect()
-    try:
-        await system_service.check_and_escalate_stale_tasks(store)
-        logger.info("Successfully completed stale task check")
-    except Exception as e:
-        logger.error(f"Error during stale task check: {e}")
-        raise
-    finally:
-        await store.close()
\ No newline at end of file
+    jitter = config.get("scheduler.jitter", 30)
+    scheduler = MaintenanceScheduler(
+        store_provider,
+        max_workers=config.get("scheduler.max_workers", 4),
+        lock_path=config.get("scheduler.lock_file", "data/.scheduler.lock"),
+        leader_retry_interval=config.get("scheduler.leader_retry_interval", 30),
+    )
+    scheduler.register_job(
+        "stale_sweep", system_service.check_and_escalate_stale_tasks, config.get("task.cleanup_interval", 300), jitter
+    )
+    scheduler.register_job("archival", _archive_job, config.get("archive.interval", 3600), jitter)
+    scheduler.register_job("wal_checkpoint", _checkpoint_job, config.get("scheduler.checkpoint_interval", 300), jitter)
+    scheduler.register_job(
+        "change_log_prune", _prune_change_log_job, config.get("scheduler.change_log_prune_interval", 600), jitter
+    )
+    return scheduler
@@ -0,0 +1,148 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+
+from taskhub.models.task import TaskStatus
+from taskhub.services import hunter_register, report_submit, task_claim, task_complete, task_publish, task_start
+from taskhub.services.lease_manager import LeaseManager
+from taskhub.storage.sqlite_store import SQLiteStore
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path) -> AsyncGenerator[SQLiteStore, None]:
+    """创建一个临时文件数据库用于测试"""
+    store = SQLiteStore(db_path=str(tmp_path / "taskhub_test.db"))
+    await store.connect()
+    await hunter_register(store, "publisher", {"python": 50})
+    await hunter_register(store, "hunter-0", {"python": 10})
+    yield store
+    await store.close()
+
+
+async def _claim(db: SQLiteStore, lease: timedelta) -> str:
+    task = await task_publish(db, "Task", "Details", "python", "publisher")
+    claimed = await db.claim_task(task.id, "hunter-0", "lease-1", datetime.now(timezone.utc) + lease)
+    await db.save_hunter((await db.get_hunter("hunter-0")).model_copy(update={"current_tasks": [task.id]}))
+    return claimed.id
+
+
+@pytest.mark.asyncio
+async def test_expired_claim_returns_to_pending(db: SQLiteStore):
+    manager = LeaseManager(db)
+    db.add_claim_listener(manager.track)
+    task_id = await _claim(db, timedelta(minutes=5))
+    assert len(manager) == 1
+
+    assert await manager.expire_due() == []
+    expired = await manager.expire_due(datetime.now(timezone.utc) + timedelta(minutes=6))
+
+    assert [t.id for t in expired] == [task_id]
+    task = await db.get_task(task_id)
+    assert task.status == TaskStatus.PENDING
+    assert task.hunter_id is None and task.lease_id is None
+    assert (await db.get_hunter("hunter-0")).current_tasks == []
+    assert await db.task_counts() == {"pending": 1}
+
+
+@pytest.mark.asyncio
+async def test_started_task_is_not_expired(db: SQLiteStore):
+    manager = LeaseManager(db)
+    db.add_claim_listener(manager.track)
+    task_id = await _claim(db, timedelta(minutes=5))
+    await task_start(db, task_id, "hunter-0")
+
+    assert await manager.expire_due(datetime.now(timezone.utc) + timedelta(hours=1)) == []
+    assert (await db.get_task(task_id)).status == TaskStatus.IN_PROGRESS
+
+
+@pytest.mark.asyncio
+async def test_task_fails_after_max_expiries(db: SQLiteStore):
+    manager = LeaseManager(db, max_expiries=2)
+    task = await task_publish(db, "Task", "Details", "python", "publisher")
+    later = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    for attempt, expected in enumerate([TaskStatus.PENDING, TaskStatus.FAILED]):
+        await db.claim_task(task.id, "hunter-0", f"lease-{attempt}", datetime.now(timezone.utc))
+        await manager.resync()
+        [expired] = await manager.expire_due(later)
+        assert expired.status == expected
+    assert manager.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_loop_wakes_for_new_claim(db: SQLiteStore):
+    manager = LeaseManager(db, resync_interval=3600)
+    manager.start()
+    try:
+        await asyncio.sleep(0.05)  # 进入空闲等待
+        task = await task_publish(db, "Task", "Details", "python", "publisher")
+        await db.claim_task(task.id, "hunter-0", "lease-1", datetime.now(timezone.utc) + timedelta(milliseconds=100))
+
+        for _ in range(100):
+            if (await db.get_task(task.id)).status == TaskStatus.PENDING:
+                break
+            await asyncio.sleep(0.02)
+        assert (await db.get_task(task.id)).status == TaskStatus.PENDING
+    finally:
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_start_after_expiry_and_reclaim_is_rejected(db: SQLiteStore):
+    await hunter_register(db, "hunter-1", {"python": 10})
+    manager = LeaseManager(db)
+    db.add_claim_listener(manager.track)
+    task_id = await _claim(db, timedelta(minutes=5))
+    stale = await db.get_task(task_id)
+
+    await manager.expire_due(datetime.now(timezone.utc) + timedelta(minutes=6))
+    reclaimed = await task_claim(db, task_id, "hunter-1")
+
+    # hunter-0 acts on the claim it read before the expiry
+    assert await db.transition_task(
+        task_id, "hunter-0", stale.lease_id, TaskStatus.CLAIMED, TaskStatus.IN_PROGRESS
+    ) is None
+    with pytest.raises(ValueError):
+        await task_start(db, task_id, "hunter-0")
+    with pytest.raises(ValueError):
+        await task_complete(db, task_id, "done", "completed", "hunter-0")
+
+    task = await db.get_task(task_id)
+    assert task.status == TaskStatus.CLAIMED
+    assert (task.hunter_id, task.lease_id) == ("hunter-1", reclaimed.lease_id)
+
+    started = await task_start(db, task_id, "hunter-1")
+    assert started.status == TaskStatus.IN_PROGRESS
+    completed = await task_complete(db, task_id, "done", "completed", "hunter-1")
+    assert completed.status == TaskStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_late_report_after_sweep_or_expiry_is_rejected(db: SQLiteStore):
+    await hunter_register(db, "hunter-1", {"python": 10})
+    await hunter_register(db, "system")
+    manager = LeaseManager(db)
+    db.add_claim_listener(manager.track)
+
+    # Swept to FAILED while in progress: the task keeps its hunter, but a report can't revive it
+    swept = await task_claim(db, (await task_publish(db, "Swept", "Details", "python", "publisher")).id, "hunter-0")
+    await task_start(db, swept.id, "hunter-0")
+    await db.fail_stale_tasks(TaskStatus.IN_PROGRESS, datetime.now(timezone.utc) + timedelta(minutes=1))
+    with pytest.raises(ValueError, match="no longer held"):
+        await report_submit(db, swept.id, "hunter-0", "completed", result="done")
+    assert (await db.get_task(swept.id)).status == TaskStatus.FAILED
+    assert await db.list_reports(task_id=swept.id) == []
+
+    # Expired and claimed again: the old holder's report must not restore its claim
+    task_id = await _claim(db, timedelta(minutes=5))
+    await manager.expire_due(datetime.now(timezone.utc) + timedelta(minutes=6))
+    reclaimed = await task_claim(db, task_id, "hunter-1")
+    with pytest.raises(ValueError):
+        await report_submit(db, task_id, "hunter-0", "completed", result="done")
+
+    task = await db.get_task(task_id)
+    assert task.status == TaskStatus.CLAIMED
+    assert (task.hunter_id, task.lease_id) == ("hunter-1", reclaimed.lease_id)
@@ -0,0 +1,64 @@
+from taskhub.storage.ready_queue import ReadyQueue
+
+
+def test_peek_orders_by_priority_then_age():
+    queue = ReadyQueue()
+    queue.add("old-low", "python", 1, 100)
+    queue.add("new-high", "python", 5, 300)
+    queue.add("old-high", "python", 5, 200)
+    queue.add("rust", "rust", 9, 50)
+
+    assert queue.peek(["python"]) == "old-high"
+    assert queue.peek(["python", "rust"]) == "rust"
+    assert queue.peek(["go"]) is None
+
+
+def test_discard_and_update_are_lazy_but_exact():
+    queue = ReadyQueue()
+    queue.add("a", "python", 5, 100)
+    queue.add("b", "python", 3, 100)
+
+    queue.discard("a")
+    assert queue.peek(["python"]) == "b"
+
+    # Re-prioritised and moved to another skill: the old heap item is dead
+    queue.add("b", "rust", 1, 100)
+    assert queue.peek(["python"]) is None
+    assert queue.peek(["rust"]) == "b"
+    assert len(queue) == 1
+
+
+def test_peek_skips_own_tasks_without_losing_them():
+    queue = ReadyQueue()
+    queue.add("mine", "python", 9, 100, publisher="me")
+    queue.add("theirs", "python", 1, 100, publisher="other")
+
+    assert queue.peek(["python"], exclude_publisher="me") == "theirs"
+    assert queue.peek(["python"]) == "mine"
+
+
+def test_dead_items_are_compacted():
+    queue = ReadyQueue()
+    for i in range(200):
+        queue.add(f"task-{i}", "python", i % 7, i)
+    for i in range(190):
+        queue.discard(f"task-{i}")
+
+    stats = queue.stats()
+    assert stats["ready"] == 10
+    assert stats["heap_items"] <= 4 * 10 + 64
+    assert stats["rebuilds"] >= 1
+    assert queue.peek(["python"]) == "task-195"  # 195 % 7 == 6
+
+
+def test_own_tasks_are_skipped_as_one_bucket():
+    queue = ReadyQueue()
+    for i in range(1000):
+        queue.add(f"mine-{i}", "python", 9, i, publisher="me")
+    queue.add("theirs", "python", 1, 0, publisher="other")
+    queue.add("anonymous", "python", 0, 0)
+
+    assert queue.peek(["python"], exclude_publisher="me") == "theirs"
+    queue.discard("theirs")
+    assert queue.peek(["python"], exclude_publisher="me") == "anonymous"
+    assert queue.peek(["python"]) == "mine-0"
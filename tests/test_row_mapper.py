@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from taskhub.models.hunter import Hunter
+from taskhub.models.report import Report, ReportEvaluation
+from taskhub.models.task import Task, TaskEvaluation, TaskStatus
+from taskhub.storage.sqlite_store import SQLiteStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteStore(db_path=str(tmp_path / "taskhub_test.db"))
+
+
+@pytest.mark.asyncio
+async def test_task_round_trip_matches_validated_model(store: SQLiteStore):
+    await store.connect()
+    try:
+        task = Task(
+            id="t1",
+            name="Task",
+            details="Details",
+            required_skill="python",
+            status=TaskStatus.CLAIMED,
+            priority=7,
+            hunter_id="h1",
+            lease_expires_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            depends_on=["t0"],
+            evaluation=TaskEvaluation(score=90, feedback="ok", evaluator_id="h2"),
+        )
+        await store.save_task(task)
+        loaded = (await store.list_tasks())[0]
+    finally:
+        await store.close()
+
+    assert loaded == task
+    assert Task.model_validate(loaded.model_dump()) == task
+    assert isinstance(loaded.status, TaskStatus)
+
+
+@pytest.mark.asyncio
+async def test_hunter_and_report_round_trip(store: SQLiteStore):
+    await store.connect()
+    try:
+        hunter = Hunter(id="h1", skills={"python": 10}, current_tasks=["t1"])
+        await store.save_hunter(hunter)
+        report = Report(
+            id="r1",
+            task_id="t1",
+            hunter_id="h1",
+            status="submitted",
+            evaluation=ReportEvaluation(score=80, feedback="fine", evaluator_id="h2"),
+        )
+        await store.save_report(report)
+        loaded_hunter = (await store.list_hunters())[0]
+        loaded_report = (await store.list_reports())[0]
+    finally:
+        await store.close()
+
+    assert loaded_hunter == hunter
+    assert loaded_report == report
+
+
+@pytest.mark.asyncio
+async def test_null_columns_fall_back_to_model_defaults(store: SQLiteStore):
+    await store.connect()
+    try:
+        await store._execute(
+            "INSERT INTO tasks (id, name, details, required_skill, status, created_at, updated_at, priority) "
+            "VALUES ('t1', 'Task', 'Details', 'python', 'pending', ?, ?, NULL)",
+            (datetime.now(timezone.utc).isoformat(),) * 2,
+        )
+        task = await store.get_task("t1")
+    finally:
+        await store.close()
+
+    assert task.priority == 0
+    assert task.depends_on == []
+    assert task.evaluation is None
@@ -0,0 +1,153 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from taskhub.models.task import Task
+from taskhub.storage.sqlite_store import SQLiteStore
+from taskhub.utils import scheduler_utils
+from taskhub.utils.scheduler_utils import LeaderLock, MaintenanceScheduler, list_namespaces
+
+
+def test_leader_lock_is_exclusive(tmp_path):
+    path = tmp_path / "scheduler.lock"
+    leader = LeaderLock(path)
+    standby = LeaderLock(path)
+
+    assert leader.acquire()
+    assert not standby.acquire()
+    assert not standby.held
+
+    leader.release()
+    assert standby.acquire()
+    standby.release()
+
+
+def test_list_namespaces_skips_archive_files(tmp_path, monkeypatch):
+    database = {"directory": str(tmp_path), "filename_pattern": "taskhub_{namespace}.db"}
+    monkeypatch.setitem(scheduler_utils.config.config, "database", database)
+    for name in ("taskhub_alpha.db", "taskhub_alpha_archive.db", "taskhub_beta.db", "other.db", "taskhub_.db"):
+        (tmp_path / name).touch()
+
+    assert list_namespaces() == ["alpha", "beta"]
+
+
+@pytest.mark.asyncio
+async def test_run_job_covers_every_namespace_with_bounded_workers(tmp_path):
+    active = 0
+    peak = 0
+
+    @asynccontextmanager
+    async def provider(namespace):
+        yield namespace
+
+    async def job(namespace):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if namespace == "broken":
+            raise RuntimeError("boom")
+        return namespace.upper()
+
+    namespaces = ["a", "b", "c", "d", "e", "broken"]
+    scheduler = MaintenanceScheduler(
+        provider, max_workers=2, lock_path=tmp_path / "lock", namespaces=lambda: namespaces
+    )
+    scheduler.register_job("upper", job, interval=60)
+
+    results = await scheduler.run_job("upper")
+
+    assert peak == 2
+    assert results["a"] == "A"
+    assert results["broken"] == {"error": "boom"}
+    stats = scheduler.stats()["jobs"]["upper"]
+    assert stats["runs"] == 1
+    assert stats["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_only_one_scheduler_leads(tmp_path):
+    @asynccontextmanager
+    async def provider(namespace):
+        yield namespace
+
+    lock_path = tmp_path / "lock"
+    leader = MaintenanceScheduler(provider, lock_path=lock_path, namespaces=lambda: [])
+    standby = MaintenanceScheduler(provider, lock_path=lock_path, namespaces=lambda: [])
+    leader.start()
+    standby.start()
+    try:
+        assert leader.is_leader
+        assert not standby.is_leader
+
+        await leader.stop()
+        standby._try_lead()
+        assert standby.is_leader
+    finally:
+        await leader.stop()
+        await standby.stop()
+
+
+@pytest.mark.asyncio
+async def test_store_checkpoint(tmp_path):
+    store = SQLiteStore(str(tmp_path / "checkpoint.db"))
+    await store.connect()
+    try:
+        result = await store.checkpoint()
+        assert result["busy"] == 0
+        with pytest.raises(ValueError):
+            await store.checkpoint("BOGUS")
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_change_log_prune_job(tmp_path):
+    store = SQLiteStore(str(tmp_path / "prune.db"))
+    await store.connect()
+    try:
+        store._change_log_retention = 2
+        for i in range(5):
+            await store.save_task(Task(id=f"task-{i}", name="Task", details="d", required_skill="python"))
+
+        @asynccontextmanager
+        async def provider(namespace):
+            yield store
+
+        scheduler = scheduler_utils.create_maintenance_scheduler(provider)
+        scheduler.namespaces = lambda: ["default"]
+        results = await scheduler.run_job("change_log_prune")
+
+        assert results["default"]["pruned"] > 0
+        assert await store.prune_change_log() == 0
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_running_jobs(tmp_path):
+    started = asyncio.Event()
+    finished = []
+
+    @asynccontextmanager
+    async def provider(namespace):
+        yield namespace
+
+    async def job(namespace):
+        started.set()
+        await asyncio.sleep(0.1)
+        finished.append(namespace)
+
+    scheduler = MaintenanceScheduler(provider, lock_path=tmp_path / "lock", namespaces=lambda: ["a"])
+    scheduler.register_job("slow", job, interval=60)
+    scheduler.start()
+    running = asyncio.create_task(scheduler.run_job("slow"))
+    await started.wait()
+
+    await scheduler.stop()
+
+    # The store provider can be closed now: the run finished before stop returned
+    assert running.done()
+    assert "a" in finished
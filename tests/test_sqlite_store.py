@@ -0,0 +1,971 @@
+import asyncio
+import contextvars
+import sqlite3
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+
+from taskhub.models.discussion import DiscussionMessage
+from taskhub.models.hunter import Hunter
+from taskhub.models.report import Report
+from taskhub.models.task import Task, TaskStatus, TaskSummary
+from taskhub.storage import sqlite_store
+from taskhub.storage.sqlite_store import INDEXES, MESSAGES_AFTER_SQL, SQLiteStore
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path) -> AsyncGenerator[SQLiteStore, None]:
+    """创建一个临时文件数据库用于测试"""
+    store = SQLiteStore(db_path=str(tmp_path / "taskhub_test.db"))
+    await store.connect()
+    yield store
+    await store.close()
+
+
+def _query_plan(store: SQLiteStore, sql: str, params: tuple) -> str:
+    conn = sqlite3.connect(store.db_path)
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    finally:
+        conn.close()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_managed_indexes_created(db: SQLiteStore):
+    conn = sqlite3.connect(db.db_path)
+    try:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        conn.close()
+    assert set(INDEXES) <= names
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"status": "pending"},
+        {"status": "pending", "required_skill": "python"},
+        {"hunter_id": "hunter-1"},
+        {"hunter_id": "hunter-1", "status": "claimed"},
+    ],
+)
+async def test_list_tasks_uses_index(db: SQLiteStore, filters):
+    sql, params = db._list_tasks_query(**filters)
+    plan = _query_plan(db, sql, params)
+    assert "USING INDEX" in plan, plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"task_id": "task-1"},
+        {"hunter_id": "hunter-1"},
+        {"status": "submitted"},
+    ],
+)
+async def test_list_reports_uses_index(db: SQLiteStore, filters):
+    sql, params = db._list_reports_query(**filters)
+    plan = _query_plan(db, sql, params)
+    assert "USING INDEX" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_messages_after_timestamp_uses_index(db: SQLiteStore):
+    plan = _query_plan(db, MESSAGES_AFTER_SQL, (datetime.now(timezone.utc).isoformat(), 50))
+    assert "USING INDEX" in plan, plan
+
+
+def _lease_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+@pytest.mark.asyncio
+async def test_claim_task_is_compare_and_swap(db: SQLiteStore):
+    await db.save_task(Task(id="task-1", name="Task", details="Details", required_skill="python"))
+
+    results = await asyncio.gather(
+        *[db.claim_task("task-1", f"hunter-{i}", f"lease-{i}", _lease_expiry()) for i in range(5)]
+    )
+
+    winners = [task for task in results if task is not None]
+    assert len(winners) == 1
+    stored = await db.get_task("task-1")
+    assert stored.status == TaskStatus.CLAIMED
+    assert stored.hunter_id == winners[0].hunter_id
+    assert stored.lease_id == winners[0].lease_id
+
+
+@pytest.mark.asyncio
+async def test_claim_task_rejects_own_task(db: SQLiteStore):
+    await db.save_task(
+        Task(id="task-1", name="Task", details="Details", required_skill="python", published_by_hunter_id="hunter-1")
+    )
+
+    assert await db.claim_task("task-1", "hunter-1", "lease-1", _lease_expiry()) is None
+
+
+@pytest.mark.asyncio
+async def test_claim_next_task_prefers_priority_and_skips_blocked(db: SQLiteStore):
+    await db.save_task(Task(id="dep", name="Dependency", details="d", required_skill="rust"))
+    await db.save_task(Task(id="low", name="Low", details="d", required_skill="python", priority=1))
+    await db.save_task(
+        Task(id="blocked", name="Blocked", details="d", required_skill="python", priority=9, depends_on=["dep"])
+    )
+    await db.save_task(
+        Task(id="own", name="Own", details="d", required_skill="python", priority=5, published_by_hunter_id="me")
+    )
+    await db.save_task(Task(id="high", name="High", details="d", required_skill="python", priority=3))
+
+    first = await db.claim_next_task("me", ["python"], "lease-1", _lease_expiry())
+    second = await db.claim_next_task("me", ["python"], "lease-2", _lease_expiry())
+    third = await db.claim_next_task("me", ["python"], "lease-3", _lease_expiry())
+
+    assert [first.id, second.id] == ["high", "low"]
+    assert third is None
+
+
+@pytest.mark.asyncio
+async def test_claim_next_task_follows_dependency_completion(db: SQLiteStore):
+    await db.save_task(Task(id="dep", name="Dependency", details="d", required_skill="rust"))
+    await db.save_task(Task(id="child", name="Child", details="d", required_skill="python", depends_on=["dep"]))
+    assert await db.claim_next_task("me", ["python"], "lease-1", _lease_expiry()) is None
+
+    dep = await db.get_task("dep")
+    dep.status = TaskStatus.COMPLETED
+    await db.save_task(dep)
+
+    claimed = await db.claim_next_task("me", ["python"], "lease-2", _lease_expiry())
+    assert claimed.id == "child"
+    assert db.ready_queue_stats()["ready"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ready_queue_sees_other_stores_writes(db: SQLiteStore):
+    await db.save_task(Task(id="task-1", name="Task", details="d", required_skill="python", priority=1))
+    await db.rebuild_ready_queue()
+    assert db.ready_queue_stats()["ready"] == 1
+    other = SQLiteStore(db_path=str(db.db_path))
+    await other.connect()
+    try:
+        # Published and claimed elsewhere after the queue was built
+        await other.save_task(Task(id="task-2", name="Task", details="d", required_skill="python", priority=5))
+        assert (await other.claim_task("task-1", "other", "lease-0", _lease_expiry())).id == "task-1"
+
+        claimed = await db.claim_next_task("me", ["python"], "lease-1", _lease_expiry())
+        assert claimed.id == "task-2"
+        assert await db.claim_next_task("me", ["python"], "lease-2", _lease_expiry()) is None
+    finally:
+        await other.close()
+
+
+@pytest.mark.asyncio
+async def test_claim_next_task_in_transaction_sees_own_writes(db: SQLiteStore):
+    async with db.transaction():
+        await db.save_task(Task(id="task-1", name="Task", details="d", required_skill="python"))
+        claimed = await db.claim_next_task("me", ["python"], "lease-1", _lease_expiry())
+    assert claimed.id == "task-1"
+    assert await db.claim_next_task("me", ["python"], "lease-2", _lease_expiry()) is None
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_readers_and_closes_all(tmp_path):
+    store = SQLiteStore(db_path=str(tmp_path / "pool.db"))
+    await store.connect()
+    await store.save_task(Task(id="task-1", name="Task", details="Details", required_skill="python"))
+
+    await asyncio.gather(*[store.list_tasks() for _ in range(20)])
+
+    stats = store.pool_stats()
+    assert 1 <= stats["open_readers"] <= stats["size"]
+    assert stats["reader"]["acquired"] >= 20
+    assert stats["writer"]["acquired"] >= 1
+
+    await store.close()
+    assert store.pool_stats()["open_readers"] == 0
+    with pytest.raises(RuntimeError):
+        await store.get_task("task-1")
+
+
+@pytest.mark.asyncio
+async def test_memory_database_shares_writer_connection():
+    store = SQLiteStore(db_path=":memory:")
+    await store.connect()
+    try:
+        await store.save_task(Task(id="task-1", name="Task", details="Details", required_skill="python"))
+        assert (await store.get_task("task-1")) is not None
+        assert store.pool_stats()["open_readers"] == 0
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_group_commit_batches_concurrent_writes(tmp_path):
+    store = SQLiteStore(db_path=str(tmp_path / "group.db"), group_commit=True)
+    await store.connect()
+    try:
+        await asyncio.gather(
+            *[
+                store.save_task(Task(id=f"task-{i}", name="Task", details="Details", required_skill="python"))
+                for i in range(50)
+            ]
+        )
+        assert len(await store.list_tasks()) == 50
+        stats = store.pool_stats()["group_commit"]
+        assert stats["writes"] >= 50
+        assert stats["batches"] < 50
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_group_commit_isolates_failing_write(tmp_path):
+    store = SQLiteStore(db_path=str(tmp_path / "group.db"), group_commit=True)
+    await store.connect()
+    try:
+        results = await asyncio.gather(
+            store.save_task(Task(id="task-1", name="Task", details="Details", required_skill="python")),
+            store._execute("INSERT INTO no_such_table VALUES (1)"),
+            store.save_task(Task(id="task-2", name="Task", details="Details", required_skill="python")),
+            return_exceptions=True,
+        )
+        assert isinstance(results[1], sqlite3.OperationalError)
+        assert {task.id for task in await store.list_tasks()} == {"task-1", "task-2"}
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_page_walks_all_tasks(db: SQLiteStore):
+    created = datetime(2025, 8, 1, tzinfo=timezone.utc)
+    for i in range(25):
+        # Pairs of tasks share a timestamp so the id tie-breaker is exercised
+        await db.save_task(
+            Task(
+                id=f"task-{i:02d}",
+                name="Task",
+                details="Details",
+                required_skill="python",
+                created_at=created + timedelta(seconds=i // 2),
+            )
+        )
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        tasks, cursor = await db.list_tasks_page(status="pending", limit=10, cursor=cursor)
+        seen.extend(task.id for task in tasks)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == [f"task-{i:02d}" for i in range(25)]
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_page_is_index_ordered(db: SQLiteStore):
+    sql, params = db._task_filters(status="pending", required_skill="python")
+    sql, params = db._keyset_query(sql, params, None, 10)
+    plan = _query_plan(db, sql, params)
+    assert "USING INDEX" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_list_page_rejects_bad_cursor_and_limit(db: SQLiteStore):
+    with pytest.raises(ValueError):
+        await db.list_tasks_page(cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        await db.list_hunters_page(limit=0)
+
+
+@pytest.mark.asyncio
+async def test_transaction_commits_once_and_sees_own_writes(db: SQLiteStore):
+    async with db.transaction():
+        await db.save_task(Task(id="task-1", name="Task", details="Details", required_skill="python"))
+        assert (await db.get_task("task-1")) is not None
+        assert await db.claim_task("task-1", "hunter-1", "lease-1", _lease_expiry()) is not None
+
+    stored = await db.get_task("task-1")
+    assert stored.status == TaskStatus.CLAIMED
+
+
+@pytest.mark.asyncio
+async def test_transaction_rolls_back_on_error(db: SQLiteStore):
+    with pytest.raises(RuntimeError):
+        async with db.transaction():
+            await db.save_task(Task(id="task-1", name="Task", details="Details", required_skill="python"))
+            assert (await db.get_task("task-1")) is not None
+            raise RuntimeError("boom")
+
+    assert await db.get_task("task-1") is None
+    assert await db.list_tasks() == []
+
+
+@pytest.mark.asyncio
+async def test_transaction_does_not_leak_uncommitted_rows_through_cache(db: SQLiteStore):
+    await db.save_task(Task(id="t1", name="T", details="D", required_skill="python"))
+    assert (await db.get_task("t1")).status == TaskStatus.PENDING
+    in_block = asyncio.Event()
+    read = asyncio.Event()
+
+    async def outside() -> TaskStatus:
+        # Started before the block, so it doesn't share its transaction
+        await in_block.wait()
+        status = (await db.get_task("t1")).status
+        read.set()
+        return status
+
+    reader = asyncio.create_task(outside())
+    with pytest.raises(RuntimeError):
+        async with db.transaction():
+            task = await db.get_task("t1")
+            task.status = TaskStatus.COMPLETED
+            await db.save_task(task)
+            assert (await db.get_task("t1")).status == TaskStatus.COMPLETED
+            in_block.set()
+            await read.wait()
+            raise RuntimeError("boom")
+
+    assert await reader == TaskStatus.PENDING
+    assert (await db.get_task("t1")).status == TaskStatus.PENDING
+
+    async with db.transaction():
+        task = await db.get_task("t1")
+        task.status = TaskStatus.COMPLETED
+        await db.save_task(task)
+        # Another request caches the committed row before the block commits
+        await asyncio.create_task(db.get_task("t1"), context=contextvars.Context())
+    assert (await db.get_task("t1")).status == TaskStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_save_invalidates_only_saved_task(db: SQLiteStore):
+    for i in range(3):
+        await db.save_task(Task(id=f"t{i}", name="T", details="D", required_skill="python"))
+    for i in range(3):
+        await db.get_task(f"t{i}")
+
+    task = await db.get_task("t0")
+    task.name = "Renamed"
+    await db.save_task(task)
+
+    assert "task:t0" not in db._cache
+    assert "task:t1" in db._cache and "task:t2" in db._cache
+    assert (await db.get_task("t0")).name == "Renamed"
+    stats = db.cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+
+
+@pytest.mark.asyncio
+async def test_claim_invalidates_cached_task(db: SQLiteStore):
+    await db.save_task(Task(id="t1", name="T", details="D", required_skill="python"))
+    assert (await db.get_task("t1")).status == TaskStatus.PENDING
+
+    await db.claim_task("t1", "hunter-1", "lease", datetime.now(timezone.utc) + timedelta(hours=1))
+
+    assert (await db.get_task("t1")).status == TaskStatus.CLAIMED
+
+
+@pytest.mark.asyncio
+async def test_external_write_invalidates_only_changed_entry(db: SQLiteStore):
+    for i in range(2):
+        await db.save_task(Task(id=f"t{i}", name="T", details="D", required_skill="python"))
+        await db.get_task(f"t{i}")
+
+    # Another process writing to the same file
+    other = SQLiteStore(db_path=str(db.db_path))
+    await other.connect()
+    try:
+        task = await other.get_task("t0")
+        task.name = "Changed elsewhere"
+        await other.save_task(task)
+    finally:
+        await other.close()
+
+    assert (await db.get_task("t0")).name == "Changed elsewhere"
+    assert "task:t1" in db._cache
+
+
+@pytest.mark.asyncio
+async def test_pruned_change_log_clears_cache(db: SQLiteStore):
+    await db.save_task(Task(id="t0", name="T", details="D", required_skill="python"))
+    await db.get_task("t0")
+    db._change_seq = 0  # as if this store missed entries that were since pruned
+
+    conn = sqlite3.connect(db.db_path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM change_log")
+            conn.execute("INSERT INTO change_log (entity, entity_id) VALUES ('hunter', 'h')")
+    finally:
+        conn.close()
+
+    await db._sync_cache()
+    assert len(db._cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_sync_reads_a_bounded_range(db: SQLiteStore, monkeypatch):
+    monkeypatch.setattr(sqlite_store, "CACHE_SYNC_LIMIT", 3)
+    await db.save_task(Task(id="t0", name="T", details="D", required_skill="python"))
+    await db.get_task("t0")
+    await db._sync_cache()
+
+    conn = sqlite3.connect(db.db_path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO change_log (entity, entity_id) VALUES ('hunter', ?)", [(f"h{i}",) for i in range(10)]
+            )
+        last = conn.execute("SELECT MAX(seq) FROM change_log").fetchone()[0]
+    finally:
+        conn.close()
+
+    # Too many changes to name one by one: the cache is dropped and the log skipped to its end
+    await db._sync_cache()
+    assert len(db._cache) == 0
+    assert db._change_seq == last
+
+
+@pytest.mark.asyncio
+async def test_prune_change_log_keeps_recent_entries(db: SQLiteStore):
+    db._change_log_retention = 3
+    for i in range(10):
+        await db.save_task(Task(id=f"t{i}", name="T", details="D", required_skill="python"))
+    assert await db.prune_change_log() == 7
+    rows = await db._fetchall("SELECT entity_id FROM change_log ORDER BY seq")
+    assert [row["entity_id"] for row in rows] == ["t7", "t8", "t9"]
+
+
+@pytest.mark.asyncio
+async def test_unmet_dependencies_follow_task_lifecycle(db: SQLiteStore):
+    await db.save_task(Task(id="a", name="A", details="D", required_skill="python"))
+    await db.save_task(Task(id="c", name="C", details="D", required_skill="python", depends_on=["a", "b"]))
+    assert await db.get_unmet_dependencies("c") == 1  # "b" doesn't exist yet
+
+    await db.save_task(Task(id="b", name="B", details="D", required_skill="python"))
+    assert await db.get_unmet_dependencies("c") == 2
+
+    for task_id in ("a", "b"):
+        task = await db.get_task(task_id)
+        task.status = TaskStatus.COMPLETED
+        await db.save_task(task)
+    assert await db.get_unmet_dependencies("c") == 0
+    assert [t.id for t in await db.list_ready_tasks("python")] == ["c"]
+
+    # Reopening a dependency blocks the dependent again
+    task = await db.get_task("a")
+    task.status = TaskStatus.PENDING
+    await db.save_task(task)
+    assert await db.get_unmet_dependencies("c") == 1
+
+    task = await db.get_task("c")
+    task.depends_on = ["b"]
+    await db.save_task(task)
+    assert await db.get_unmet_dependencies("c") == 0
+
+
+@pytest.mark.asyncio
+async def test_claim_task_rejects_blocked_task(db: SQLiteStore):
+    await db.save_task(Task(id="a", name="A", details="D", required_skill="python"))
+    await db.save_task(Task(id="b", name="B", details="D", required_skill="python", depends_on=["a"]))
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    assert await db.claim_task("b", "hunter-1", "lease", expires) is None
+    await db.delete_task("a")
+    assert await db.claim_task("b", "hunter-1", "lease", expires) is not None
+
+
+@pytest.mark.asyncio
+async def test_ready_tasks_query_uses_index(db: SQLiteStore):
+    plan = _query_plan(
+        db,
+        "SELECT * FROM tasks WHERE status = ? AND unmet_dependencies = 0 AND required_skill = ? "
+        "ORDER BY priority DESC, created_at LIMIT 10",
+        ("pending", "python"),
+    )
+    assert "idx_tasks_ready" in plan and "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_rebuild_dependencies_backfills_counters(db: SQLiteStore):
+    await db.save_task(Task(id="a", name="A", details="D", required_skill="python"))
+    await db.save_task(Task(id="b", name="B", details="D", required_skill="python", depends_on=["a"]))
+    await db._execute("DELETE FROM task_dependencies")
+    await db._execute("UPDATE tasks SET unmet_dependencies = 0")
+
+    await db.rebuild_dependencies()
+    assert await db.get_unmet_dependencies("b") == 1
+
+
+@pytest.mark.asyncio
+async def test_find_best_hunter_ranks_by_reputation_and_workload(db: SQLiteStore):
+    await db.save_hunter(Hunter(id="novice", skills={"python": 10}, reputation=10))
+    await db.save_hunter(Hunter(id="busy", skills={"python": 90}, reputation=50))
+    await db.save_task(
+        Task(id="t1", name="T", details="D", required_skill="python", status=TaskStatus.CLAIMED, hunter_id="busy")
+    )
+    await db.save_hunter(Hunter(id="expert", skills={"python": 90}, reputation=50))
+    await db.save_hunter(Hunter(id="retired", skills={"python": 90}, reputation=99, status="inactive"))
+    await db.save_hunter(Hunter(id="unskilled", skills={"python": 0}, reputation=99))
+
+    assert (await db.find_best_hunter("python")).id == "expert"
+    assert (await db.find_best_hunter("python", ["expert"])).id == "busy"
+    assert (await db.find_best_hunter("python", ["expert", "busy"])).id == "novice"
+    assert await db.find_best_hunter("rust") is None
+
+
+@pytest.mark.asyncio
+async def test_hunter_skills_follow_hunter_saves(db: SQLiteStore):
+    hunter = Hunter(id="h1", skills={"python": 10})
+    await db.save_hunter(hunter)
+    hunter.skills = {"rust": 20}
+    await db.save_hunter(hunter)
+
+    rows = await db._fetchall("SELECT skill, level FROM hunter_skills WHERE hunter_id = 'h1'")
+    assert [tuple(row) for row in rows] == [("rust", 20)]
+
+    await db.delete_hunter("h1")
+    assert await db._fetchall("SELECT * FROM hunter_skills") == []
+
+
+@pytest.mark.asyncio
+async def test_find_best_hunter_uses_rank_index(db: SQLiteStore):
+    plan = _query_plan(
+        db,
+        "SELECT h.* FROM hunter_skills s CROSS JOIN hunters h ON h.id = s.hunter_id "
+        "WHERE s.skill = ? AND s.level > 0 AND h.status = 'active' AND s.hunter_id NOT IN (?) "
+        "ORDER BY s.score DESC, s.hunter_id LIMIT 1",
+        ("python", "h1"),
+    )
+    assert "idx_hunter_skills_rank" in plan and "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_stale_tasks_compare_naive_and_aware_timestamps(db: SQLiteStore):
+    now = datetime.now(timezone.utc)
+    old_naive = (now - timedelta(hours=30)).replace(tzinfo=None)
+    old_shifted = (now - timedelta(hours=30)).astimezone(timezone(timedelta(hours=-5)))
+    for task_id, updated_at in (("naive", old_naive), ("shifted", old_shifted), ("fresh", now)):
+        await db.save_task(
+            Task(
+                id=task_id,
+                name="T",
+                details="D",
+                required_skill="python",
+                status=TaskStatus.IN_PROGRESS,
+                updated_at=updated_at,
+            )
+        )
+
+    stale = await db.fail_stale_tasks(TaskStatus.IN_PROGRESS, now - timedelta(hours=24))
+    assert sorted(stale) == ["naive", "shifted"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM tasks WHERE status = ? AND updated_at_us < ?",
+        "SELECT * FROM tasks WHERE status IN (?, ?) AND lease_expires_at_us <= ?",
+    ],
+)
+async def test_epoch_range_queries_use_index(db: SQLiteStore, sql):
+    plan = _query_plan(db, sql, ("claimed",) * (sql.count("?") - 1) + (0,))
+    assert "USING INDEX" in plan and "_us<" in plan.replace(" ", ""), plan
+
+
+@pytest.mark.asyncio
+async def test_epoch_columns_backfilled_for_legacy_database(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(
+            "CREATE TABLE discussion_messages (id TEXT PRIMARY KEY, hunter_id TEXT NOT NULL, "
+            "content TEXT NOT NULL, created_at TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO discussion_messages VALUES ('m1', 'h1', 'hello', ?)",
+            (datetime(2025, 1, 1, 12, 0).isoformat(),),
+        )
+    conn.close()
+
+    store = SQLiteStore(db_path=str(path))
+    await store.connect()
+    try:
+        messages = await store.get_messages_after_timestamp(datetime(2025, 1, 1, 11, 0, tzinfo=timezone.utc))
+    finally:
+        await store.close()
+    assert [m.id for m in messages] == ["m1"]
+
+
+@pytest.mark.asyncio
+async def test_task_counts(db: SQLiteStore):
+    specs = [
+        ("t0", "python", "alice", TaskStatus.PENDING, None),
+        ("t1", "python", "alice", TaskStatus.IN_PROGRESS, "h1"),
+        ("t2", "rust", "bob", TaskStatus.IN_PROGRESS, "h1"),
+        ("t3", "rust", "bob", TaskStatus.PENDING, None),
+        ("t4", "rust", "alice", TaskStatus.COMPLETED, "h2"),
+    ]
+    for task_id, skill, publisher, status, hunter_id in specs:
+        await db.save_task(
+            Task(
+                id=task_id,
+                name="T",
+                details="D",
+                required_skill=skill,
+                published_by_hunter_id=publisher,
+                status=status,
+                hunter_id=hunter_id,
+            )
+        )
+
+    assert await db.task_counts() == {"pending": 2, "in_progress": 2, "completed": 1}
+    assert await db.task_counts(by="skill") == {
+        "python": {"pending": 1, "in_progress": 1},
+        "rust": {"pending": 1, "in_progress": 1, "completed": 1},
+    }
+    assert (await db.task_counts(by="publisher"))["alice"] == {"pending": 1, "in_progress": 1, "completed": 1}
+    assert await db.count_hunters(TaskStatus.IN_PROGRESS) == 1
+    with pytest.raises(ValueError):
+        await db.task_counts(by="name")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("column", ["status", "status, required_skill", "status, published_by_hunter_id"])
+async def test_task_counts_scan_covering_index(db: SQLiteStore, column):
+    plan = _query_plan(db, f"SELECT {column}, COUNT(*) FROM tasks GROUP BY {column}", ())
+    assert "COVERING INDEX" in plan and "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_task_counters_follow_task_changes(db: SQLiteStore):
+    await db.save_task(Task(id="t1", name="T", details="D", required_skill="python"))
+    await db.save_task(Task(id="t2", name="T", details="D", required_skill="python"))
+    await db.claim_task("t1", "h1", "lease", datetime.now(timezone.utc) + timedelta(hours=1))
+    assert await db.hunter_workload("h1") == 1
+
+    task = await db.get_task("t1")
+    task.status = TaskStatus.COMPLETED
+    await db.save_task(task)
+    await db.delete_task("t2")
+
+    assert await db.task_counts() == {"completed": 1}
+    assert await db.task_counts(by="hunter") == {"h1": {"completed": 1}}
+    assert await db.hunter_workload("h1") == 0
+
+
+@pytest.mark.asyncio
+async def test_workload_changes_rescore_hunters(db: SQLiteStore):
+    await db.save_hunter(Hunter(id="a", skills={"python": 10}, reputation=10))
+    await db.save_hunter(Hunter(id="b", skills={"python": 10}, reputation=10))
+    assert (await db.find_best_hunter("python")).id == "a"
+
+    await db.save_task(Task(id="t1", name="T", details="D", required_skill="python"))
+    await db.claim_task("t1", "a", "lease", datetime.now(timezone.utc) + timedelta(hours=1))
+    assert (await db.find_best_hunter("python")).id == "b"
+
+
+@pytest.mark.asyncio
+async def test_rebuild_task_counters_repairs_drift(db: SQLiteStore):
+    await db.save_task(Task(id="t1", name="T", details="D", required_skill="python"))
+    await db._execute("UPDATE task_counters SET n = 42")
+
+    await db.rebuild_task_counters()
+    assert await db.task_counts() == {"pending": 1}
+    assert await db.task_counts(by="skill") == {"python": {"pending": 1}}
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_ranks_and_pages(db: SQLiteStore):
+    await db.save_task(Task(id="t1", name="Fix parser", details="The tokenizer crashes on quotes", required_skill="python"))
+    await db.save_task(Task(id="t2", name="Write docs", details="Explain how the parser works", required_skill="docs"))
+    await db.save_task(Task(id="t3", name="Deploy", details="Ship it", required_skill="ops"))
+
+    hits, next_offset = await db.search_tasks("parser", limit=1)
+    assert [task.id for task, _, _ in hits] == ["t1"]  # name matches rank first
+    assert "[parser]" in hits[0][1].lower()
+    assert next_offset == 1
+
+    hits, next_offset = await db.search_tasks("parser", limit=1, offset=next_offset)
+    assert [task.id for task, _, _ in hits] == ["t2"]
+    assert next_offset is None
+
+    # Operators and quotes are matched as plain words instead of being parsed
+    hits, _ = await db.search_tasks('parser" OR', limit=10)
+    assert hits == []
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_updates_and_deletes(db: SQLiteStore):
+    task = Task(id="t1", name="Old name", details="D", required_skill="python")
+    await db.save_task(task)
+    task.name = "Fresh name"
+    await db.save_task(task)
+
+    assert (await db.search_tasks("old"))[0] == []
+    assert [t.id for t, _, _ in (await db.search_tasks("fresh"))[0]] == ["t1"]
+
+    await db.delete_task("t1")
+    assert (await db.search_tasks("fresh"))[0] == []
+
+
+@pytest.mark.asyncio
+async def test_search_discussion(db: SQLiteStore):
+    await db.save_discussion_message(DiscussionMessage(id="m1", hunter_id="h1", content="Who knows the deploy script?"))
+    await db.save_discussion_message(DiscussionMessage(id="m2", hunter_id="h2", content="Lunch at noon"))
+
+    hits, _ = await db.search_discussion("deploy")
+    assert [m.id for m, _, _ in hits] == ["m1"]
+    with pytest.raises(ValueError):
+        await db.search_discussion("   ")
+
+
+@pytest.mark.asyncio
+async def test_search_index_built_for_existing_rows(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(
+            "CREATE TABLE discussion_messages (id TEXT PRIMARY KEY, hunter_id TEXT NOT NULL, "
+            "content TEXT NOT NULL, created_at TEXT NOT NULL)"
+        )
+        conn.execute("INSERT INTO discussion_messages VALUES ('m1', 'h1', 'legacy message', '2025-01-01T00:00:00')")
+    conn.close()
+
+    store = SQLiteStore(db_path=str(path))
+    await store.connect()
+    try:
+        hits, _ = await store.search_discussion("legacy")
+    finally:
+        await store.close()
+    assert [m.id for m, _, _ in hits] == ["m1"]
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_tasks_and_reports(db: SQLiteStore):
+    await db.save_task(Task(id="t1", name="Done", details="D", required_skill="python", status=TaskStatus.COMPLETED))
+    await db.save_task(Task(id="t2", name="Open", details="D", required_skill="python"))
+    await db.save_report(Report(id="r1", task_id="t1", hunter_id="h1", status="submitted"))
+    assert (await db.get_task("t1")).status == TaskStatus.COMPLETED  # cached before the move
+
+    assert await db.archive_tasks(["t1", "t2", "missing"]) == 1
+
+    archived = await db.get_task("t1")
+    assert archived.status == TaskStatus.ARCHIVED
+    assert archived.is_archived
+    assert [t.id for t in await db.list_tasks()] == ["t2"]
+    assert await db.get_report("r1") is None
+    assert await db.task_counts() == {"pending": 1}
+    assert (await db.search_tasks("done"))[0] == []
+
+    conn = sqlite3.connect(db.archive_path)
+    try:
+        assert conn.execute("SELECT task_id FROM reports").fetchall() == [("t1",)]
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_tasks_before_by_age(db: SQLiteStore):
+    now = datetime.now(timezone.utc)
+    for i, age in enumerate([40, 35, 1]):
+        await db.save_task(
+            Task(
+                id=f"t{i}",
+                name="T",
+                details="D",
+                required_skill="python",
+                status=TaskStatus.FAILED,
+                updated_at=now - timedelta(days=age),
+            )
+        )
+
+    assert await db.archive_tasks_before(now - timedelta(days=30), limit=1) == 1
+    assert await db.archive_tasks_before(now - timedelta(days=30), limit=1) == 1
+    assert await db.archive_tasks_before(now - timedelta(days=30), limit=1) == 0
+    assert [t.id for t in await db.list_tasks()] == ["t2"]
+
+
+@pytest.mark.asyncio
+async def test_archive_keeps_failed_task_with_pending_dependent(db: SQLiteStore):
+    await db.save_task(Task(id="dep", name="T", details="D", required_skill="python", status=TaskStatus.FAILED))
+    await db.save_task(Task(id="t1", name="T", details="D", required_skill="python", depends_on=["dep"]))
+
+    assert await db.archive_tasks(["dep"]) == 0
+    assert await db.get_unmet_dependencies("t1") == 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_vacuum_after_archive(db: SQLiteStore):
+    await db.save_tasks_many(
+        [
+            Task(id=f"t{i}", name="T", details="x" * 2000, required_skill="python", status=TaskStatus.COMPLETED)
+            for i in range(200)
+        ]
+    )
+    await db.archive_tasks([f"t{i}" for i in range(200)])
+
+    assert await db.incremental_vacuum() > 0
+
+
+@pytest.mark.asyncio
+async def test_archive_schema_follows_new_columns(tmp_path):
+    path = tmp_path / "taskhub.db"
+    store = SQLiteStore(db_path=str(path))
+    await store.connect()
+    await store.close()
+    conn = sqlite3.connect(tmp_path / "taskhub_archive.db")
+    with conn:
+        conn.execute("ALTER TABLE tasks DROP COLUMN priority")
+    conn.close()
+
+    store = SQLiteStore(db_path=str(path))
+    await store.connect()
+    try:
+        await store.save_task(Task(id="t1", name="T", details="D", required_skill="python", priority=3, status=TaskStatus.COMPLETED))
+        assert await store.archive_tasks(["t1"]) == 1
+        assert (await store.get_task("t1")).priority == 3
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_in_memory_store():
+    store = SQLiteStore(db_path=":memory:")
+    await store.connect()
+    try:
+        await store.save_task(Task(id="t1", name="T", details="D", required_skill="python", status=TaskStatus.COMPLETED))
+        assert await store.archive_tasks(["t1"]) == 1
+        assert (await store.get_task("t1")).status == TaskStatus.ARCHIVED
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_list_task_summaries_projects_columns(db: SQLiteStore):
+    await db.save_task(Task(id="t1", name="A", details="long " * 100, required_skill="python", priority=2))
+    await db.save_task(Task(id="t2", name="B", details="D", required_skill="rust", hunter_id="h1"))
+
+    summaries = await db.list_task_summaries()
+    assert [type(s) for s in summaries] == [TaskSummary, TaskSummary]
+    assert [(s.id, s.name, s.priority, s.hunter_id) for s in summaries] == [("t1", "A", 2, None), ("t2", "B", 0, "h1")]
+    assert summaries[0].status == TaskStatus.PENDING
+
+    page, cursor = await db.list_task_summaries_page(limit=1)
+    assert [s.id for s in page] == ["t1"]
+    page, cursor = await db.list_task_summaries_page(limit=1, cursor=cursor)
+    assert [s.id for s in page] == ["t2"]
+    assert cursor is None
+
+    sql, params = db._list_tasks_query(status="pending", columns="id, name")
+    assert sql.startswith("SELECT id, name FROM tasks")
+
+
+@pytest.mark.asyncio
+async def test_iter_tasks_streams_in_chunks(db: SQLiteStore):
+    await db.save_tasks_many(
+        [Task(id=f"t{i:02}", name="T", details="D", required_skill="python" if i % 2 else "rust") for i in range(25)]
+    )
+
+    ids = [task.id async for task in db.iter_tasks(chunk_size=4)]
+    assert sorted(ids) == [f"t{i:02}" for i in range(25)]
+    summaries = [task async for task in db.iter_tasks(required_skill="rust", summary=True, chunk_size=4)]
+    assert len(summaries) == 13 and all(isinstance(t, TaskSummary) for t in summaries)
+
+    # Writes made while streaming do not block on the reader
+    async for task in db.iter_tasks(status=TaskStatus.PENDING, chunk_size=4):
+        task.status = TaskStatus.FAILED
+        await db.save_task(task)
+    assert await db.task_counts() == {"failed": 25}
+    assert db.pool_stats()["idle_readers"] == db.pool_stats()["open_readers"]
+
+
+@pytest.mark.asyncio
+async def test_iter_reports(db: SQLiteStore):
+    for i in range(5):
+        await db.save_report(Report(id=f"r{i}", task_id="t1" if i < 3 else "t2", hunter_id="h1", status="submitted"))
+
+    assert sorted([r.id async for r in db.iter_reports(task_id="t1", chunk_size=2)]) == ["r0", "r1", "r2"]
+
+
+@pytest.mark.asyncio
+async def test_iter_tasks_in_memory_and_transaction():
+    store = SQLiteStore(db_path=":memory:")
+    await store.connect()
+    try:
+        await store.save_task(Task(id="t1", name="T", details="D", required_skill="python"))
+        async for task in store.iter_tasks():
+            await store.save_task(task)
+        async with store.transaction():
+            assert [t.id async for t in store.iter_tasks()] == ["t1"]
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_fail_stale_tasks_is_one_indexed_update(db: SQLiteStore):
+    now = datetime.now(timezone.utc)
+    await db.save_task(
+        Task(id="old", name="T", details="D", required_skill="python", status=TaskStatus.CLAIMED, updated_at=now - timedelta(hours=3))
+    )
+    await db.save_task(Task(id="new", name="T", details="D", required_skill="python", status=TaskStatus.CLAIMED))
+    assert (await db.get_task("old")).status == TaskStatus.CLAIMED
+
+    assert await db.fail_stale_tasks(TaskStatus.CLAIMED, now - timedelta(hours=2)) == ["old"]
+    assert (await db.get_task("old")).status == TaskStatus.FAILED
+    assert await db.task_counts() == {"claimed": 1, "failed": 1}
+
+    plan = _query_plan(db, "SELECT id FROM tasks WHERE status = ? AND updated_at_us < ?", ("claimed", 0))
+    assert "idx_tasks_status_updated" in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_fail_stale_tasks_releases_lease_and_hunter(db: SQLiteStore):
+    await db.save_hunter(Hunter(id="h1", skills={"python": 10}, current_tasks=["stale", "other"]))
+    await db.save_task(Task(id="stale", name="T", details="D", required_skill="python"))
+    await db.claim_task("stale", "h1", "lease-1", _lease_expiry())
+    assert (await db.get_hunter("h1")).current_tasks == ["stale", "other"]
+
+    assert await db.fail_stale_tasks(TaskStatus.CLAIMED, datetime.now(timezone.utc) + timedelta(minutes=1)) == ["stale"]
+
+    task = await db.get_task("stale")
+    assert (task.status, task.hunter_id, task.lease_id, task.lease_expires_at) == (TaskStatus.FAILED, "h1", None, None)
+    assert (await db.get_hunter("h1")).current_tasks == ["other"]
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_claim_is_not_lost_from_ready_queue(db: SQLiteStore):
+    await db.save_task(Task(id="task-1", name="Task", details="d", required_skill="python"))
+
+    with pytest.raises(RuntimeError):
+        async with db.transaction():
+            assert (await db.claim_next_task("me", ["python"], "lease-1", _lease_expiry())).id == "task-1"
+            raise RuntimeError("abort")
+
+    claimed = await db.claim_next_task("me", ["python"], "lease-2", _lease_expiry())
+    assert claimed.id == "task-1"
+
+
+@pytest.mark.asyncio
+async def test_rollback_that_did_not_claim_keeps_ready_queue(db: SQLiteStore):
+    await db.save_task(Task(id="task-1", name="Task", details="d", required_skill="python"))
+    await db.claim_next_task("me", ["rust"], "lease-0", _lease_expiry())
+    seq = db._ready_seq
+
+    with pytest.raises(RuntimeError):
+        async with db.transaction():
+            await db.save_task(Task(id="task-2", name="Task", details="d", required_skill="python"))
+            raise RuntimeError("abort")
+
+    assert db._ready_seq == seq
+    assert (await db.claim_next_task("me", ["python"], "lease-1", _lease_expiry())).id == "task-1"
+    assert await db.claim_next_task("me", ["python"], "lease-2", _lease_expiry()) is None
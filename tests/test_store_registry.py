@@ -0,0 +1,180 @@
+import asyncio
+
+import pytest
+
+from taskhub import context
+from taskhub.context import StoreRegistry
+from taskhub.storage.sqlite_store import SQLiteStore
+from taskhub.utils.scheduler_utils import MaintenanceScheduler
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """每个命名空间映射到临时目录中的数据库文件"""
+    registry = StoreRegistry(max_stores=2, idle_timeout=60)
+    monkeypatch.setattr(registry, "_db_path", lambda namespace, db_path: str(tmp_path / f"{namespace}.db"))
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_requests_share_one_store(registry, monkeypatch):
+    connects = 0
+    original = SQLiteStore.connect
+
+    async def counting_connect(self):
+        nonlocal connects
+        connects += 1
+        await asyncio.sleep(0.01)
+        await original(self)
+
+    monkeypatch.setattr(SQLiteStore, "connect", counting_connect)
+
+    async def use():
+        async with registry.acquire("ns") as store:
+            return store
+
+    stores = await asyncio.gather(*[use() for _ in range(5)])
+    assert connects == 1
+    assert len({id(store) for store in stores}) == 1
+    assert registry.stats()["created"] == 1
+    await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_skips_stores_in_use(registry):
+    async with registry.acquire("a"):
+        async with registry.acquire("b"):
+            pass
+        async with registry.acquire("c"):
+            # "b" is the least recently used store that is not in use
+            assert len(registry) == 2
+            assert registry.stats()["evictions"] == 1
+            assert registry.stats()["busy"] == 2
+    await registry.close_all()
+    assert len(registry) == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_stores_are_closed(registry):
+    async with registry.acquire("a") as store:
+        pass
+    assert await registry.evict_idle() == 0
+
+    registry.idle_timeout = 0
+    assert await registry.evict_idle() == 1
+    assert not store._pool.is_open
+    assert registry.stats()["idle_evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_holds_store_until_task_finishes(registry):
+    async def request():
+        store = await registry.get("a")
+        assert await registry.get("a") is store
+        assert registry.stats()["busy"] == 1
+        return store
+
+    await asyncio.create_task(request())
+    await asyncio.sleep(0)
+    assert registry.stats()["busy"] == 0
+    registry.idle_timeout = 0
+    assert await registry.evict_idle() == 1
+
+
+@pytest.mark.asyncio
+async def test_maintenance_lends_open_store_without_touching_lru(registry):
+    async with registry.acquire("a") as store_a:
+        pass
+    async with registry.acquire("b"):
+        pass
+    last_used = registry._entries[registry._db_path("a", None)].last_used
+
+    async with registry.maintenance("a") as store:
+        assert store is store_a
+        assert registry.stats()["busy"] == 1
+    # Still the least recently used, and not any fresher
+    assert list(registry._entries) == [registry._db_path("a", None), registry._db_path("b", None)]
+    assert registry._entries[registry._db_path("a", None)].last_used == last_used
+    assert registry.stats()["busy"] == 0
+    await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_maintenance_opens_short_lived_store_for_closed_namespace(registry, monkeypatch):
+    async with registry.maintenance("cold") as store:
+        assert store._pool.is_open
+        assert store._monitor is None
+    assert not store._pool.is_open
+    assert len(registry) == 0
+    assert registry.stats()["created"] == 0
+
+    # The schema was set up by the first run; later runs only open the pool
+    async def init_tables(self):
+        raise AssertionError("schema set up again")
+
+    monkeypatch.setattr(SQLiteStore, "_init_tables", init_tables)
+    async with registry.maintenance("cold") as store:
+        assert store._pool.is_open
+
+
+@pytest.mark.asyncio
+async def test_idle_sweeper_closes_stores_without_further_requests(tmp_path, monkeypatch):
+    registry = StoreRegistry(max_stores=4, idle_timeout=0.2)
+    monkeypatch.setattr(registry, "_db_path", lambda namespace, db_path: str(tmp_path / f"{namespace}.db"))
+    registry.start_idle_sweeper()
+    try:
+        async with registry.acquire("quiet"):
+            pass
+        assert len(registry) == 1
+
+        await asyncio.sleep(0.4)
+
+        assert len(registry) == 0
+        assert registry.stats()["idle_evictions"] == 1
+    finally:
+        await registry.stop_idle_sweeper()
+        await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_closes_the_store(registry, monkeypatch):
+    closed = []
+    original_close = SQLiteStore.close
+
+    async def broken_init_tables(self):
+        raise RuntimeError("boom")
+
+    async def recording_close(self):
+        closed.append(self)
+        await original_close(self)
+
+    monkeypatch.setattr(SQLiteStore, "_init_tables", broken_init_tables)
+    monkeypatch.setattr(SQLiteStore, "close", recording_close)
+
+    with pytest.raises(RuntimeError):
+        async with registry.acquire("broken"):
+            pass
+
+    assert len(closed) == 1
+    assert not closed[0]._pool.is_open
+    assert len(registry) == 0
+
+
+@pytest.mark.asyncio
+async def test_lifespan_uses_the_registry_store(registry, tmp_path, monkeypatch):
+    monkeypatch.setattr(context, "store_registry", registry)
+    monkeypatch.setattr(
+        context,
+        "create_maintenance_scheduler",
+        lambda provider: MaintenanceScheduler(provider, lock_path=tmp_path / "lock", namespaces=lambda: []),
+    )
+
+    async with context.taskhub_lifespan("alpha", "hunter-0") as app:
+        async with registry.acquire("alpha") as store:
+            assert app.namespace_store is store
+        assert registry.stats()["created"] == 1
+        # Held by the lifespan, so it is never evicted
+        assert registry.stats()["busy"] == 1
+
+    assert len(registry) == 0
+    assert not app.namespace_store._pool.is_open
@@ -0,0 +1,141 @@
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+
+from taskhub.models.task import Task, TaskStatus
+from taskhub.services import system_service
+from taskhub.storage.sqlite_store import SQLiteStore
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path) -> AsyncGenerator[SQLiteStore, None]:
+    """创建一个临时文件数据库用于测试"""
+    store = SQLiteStore(db_path=str(tmp_path / "taskhub_test.db"))
+    await store.connect()
+    yield store
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_system_stats_breakdowns(db: SQLiteStore):
+    await db.save_task(Task(id="t0", name="T", details="D", required_skill="python", published_by_hunter_id="p"))
+    await db.save_task(
+        Task(
+            id="t1",
+            name="T",
+            details="D",
+            required_skill="rust",
+            published_by_hunter_id="p",
+            status=TaskStatus.IN_PROGRESS,
+            hunter_id="h1",
+        )
+    )
+
+    stats = await system_service.get_system_stats(db)
+
+    assert stats["total_tasks"] == 2
+    assert stats["pending"] == 1
+    assert stats["in_progress"] == 1
+    assert stats["active_hunters"] == 1
+    assert stats["backlog_by_skill"] == {"python": 1}
+    assert stats["by_publisher"] == {"p": {"pending": 1, "in_progress": 1}}
+
+
+@pytest.mark.asyncio
+async def test_archive_old_tasks(db: SQLiteStore):
+    old = datetime.now(timezone.utc) - timedelta(days=60)
+    for i in range(5):
+        await db.save_task(
+            Task(id=f"t{i}", name="T", details="D", required_skill="python", status=TaskStatus.COMPLETED, updated_at=old)
+        )
+    await db.save_task(Task(id="fresh", name="T", details="D", required_skill="python", status=TaskStatus.COMPLETED))
+
+    result = await system_service.archive_old_tasks(db, timedelta(days=30), batch_size=2)
+
+    assert result["archived"] == 5
+    assert [t.id for t in await db.list_tasks()] == ["fresh"]
+    assert (await db.get_task("t0")).status == TaskStatus.ARCHIVED
+
+
+@pytest.mark.asyncio
+async def test_archive_old_tasks_skips_blocked_failed_tasks(db: SQLiteStore):
+    now = datetime.now(timezone.utc)
+    for i in range(2):
+        # Oldest rows, but an unfinished task still depends on them
+        await db.save_task(
+            Task(id=f"blocked{i}", name="T", details="D", required_skill="python", status=TaskStatus.FAILED,
+                 updated_at=now - timedelta(days=90))
+        )
+        await db.save_task(Task(id=f"dependent{i}", name="T", details="D", required_skill="python", depends_on=[f"blocked{i}"]))
+    await db.save_task(
+        Task(id="eligible", name="T", details="D", required_skill="python", status=TaskStatus.FAILED,
+             updated_at=now - timedelta(days=60))
+    )
+
+    result = await system_service.archive_old_tasks(db, timedelta(days=30), batch_size=2)
+
+    assert result["archived"] == 1
+    assert (await db.get_task("eligible")).status == TaskStatus.ARCHIVED
+    assert {t.id for t in await db.list_tasks()} == {"blocked0", "blocked1", "dependent0", "dependent1"}
+
+
+@pytest.mark.asyncio
+async def test_task_interaction_graph(db: SQLiteStore):
+    await db.save_task(
+        Task(id="t1", name="T", details="D", required_skill="python", published_by_hunter_id="p", hunter_id="h1")
+    )
+
+    graph = await system_service.get_task_interaction_graph(db)
+
+    assert [node["id"] for node in graph["nodes"]] == ["task-t1"]
+    assert {(link["source"], link["target"]) for link in graph["links"]} == {
+        ("hunter-p", "task-t1"),
+        ("task-t1", "hunter-h1"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_stale_task_sweep_uses_config_thresholds(db: SQLiteStore, monkeypatch):
+    now = datetime.now(timezone.utc)
+    monkeypatch.setitem(system_service.config.config["task"], "max_lease_duration", 60)
+    await db.save_task(
+        Task(id="claimed", name="T", details="D", required_skill="python", status=TaskStatus.CLAIMED, updated_at=now - timedelta(minutes=90))
+    )
+    await db.save_task(
+        Task(id="working", name="T", details="D", required_skill="python", status=TaskStatus.IN_PROGRESS, updated_at=now - timedelta(hours=2))
+    )
+    runs = system_service.stale_sweep_stats["runs"]
+
+    assert await system_service.check_and_escalate_stale_tasks(db) == 1
+
+    assert (await db.get_task("claimed")).status == TaskStatus.FAILED
+    assert (await db.get_task("working")).status == TaskStatus.IN_PROGRESS
+    assert system_service.stale_sweep_stats["runs"] == runs + 1
+    assert system_service.stale_sweep_stats["last_failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_task_sweep_returns_expired_claims_to_pending(db: SQLiteStore):
+    now = datetime.now(timezone.utc)
+    # Abandoned long ago on a store without a LeaseManager: past both its lease and the CLAIMED threshold
+    await db.save_task(
+        Task(
+            id="abandoned",
+            name="T",
+            details="D",
+            required_skill="python",
+            status=TaskStatus.CLAIMED,
+            hunter_id="hunter-0",
+            lease_id="lease-1",
+            lease_expires_at=now - timedelta(hours=3),
+            updated_at=now - timedelta(hours=4),
+        )
+    )
+
+    assert await system_service.check_and_escalate_stale_tasks(db) == 0
+
+    task = await db.get_task("abandoned")
+    assert task.status == TaskStatus.PENDING
+    assert task.lease_id is None
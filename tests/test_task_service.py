@@ -0,0 +1,176 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from taskhub.models.task import TaskStatus, TaskSummary
+from taskhub.storage.sqlite_store import SQLiteStore
+from taskhub.services import (
+    hunter_register,
+    report_submit,
+    task_claim,
+    check_task_fields,
+    task_archive,
+    task_claim_next,
+    task_list_page,
+    task_publish,
+    task_publish_many,
+)
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path) -> AsyncGenerator[SQLiteStore, None]:
+    """创建一个临时文件数据库用于测试"""
+    store = SQLiteStore(db_path=str(tmp_path / "taskhub_test.db"))
+    await store.connect()
+    yield store
+    await store.close()
+
+
+@pytest_asyncio.fixture
+async def hunters(db: SQLiteStore) -> list[str]:
+    """注册一个发布者和若干猎人"""
+    await hunter_register(db, "publisher", {"python": 50})
+    hunter_ids = [f"hunter-{i}" for i in range(4)]
+    for hunter_id in hunter_ids:
+        await hunter_register(db, hunter_id, {"python": 10})
+    return hunter_ids
+
+
+@pytest.mark.asyncio
+async def test_task_claim_race_has_single_winner(db: SQLiteStore, hunters: list[str]):
+    task = await task_publish(db, "Task", "Details", "python", "publisher")
+    await db.rebuild_ready_queue()
+
+    results = await asyncio.gather(
+        *[task_claim(db, task.id, hunter_id) for hunter_id in hunters], return_exceptions=True
+    )
+
+    winners = [result for result in results if not isinstance(result, Exception)]
+    assert len(winners) == 1
+    # Losing the race writes nothing, so it neither rolls back nor resets the ready queue
+    assert db._ready_seq is not None
+    assert all(isinstance(result, ValueError) for result in results if result not in winners)
+    stored = await db.get_task(task.id)
+    assert stored.status == TaskStatus.CLAIMED
+    assert stored.hunter_id == winners[0].hunter_id
+
+
+@pytest.mark.asyncio
+async def test_task_claim_next(db: SQLiteStore, hunters: list[str]):
+    task = await task_publish(db, "Task", "Details", "python", "publisher")
+
+    claimed = await task_claim_next(db, hunters[0])
+    assert claimed is not None
+    assert claimed.id == task.id
+    assert claimed.hunter_id == hunters[0]
+    assert claimed.lease_id is not None
+
+    assert await task_claim_next(db, hunters[1], "python") is None
+    with pytest.raises(ValueError):
+        await task_claim_next(db, hunters[1], "rust")
+
+
+@pytest.mark.asyncio
+async def test_task_publish_many_resolves_batch_keys(db: SQLiteStore, hunters: list[str]):
+    tasks = await task_publish_many(
+        db,
+        [
+            {"key": "design", "name": "Design", "details": "d", "required_skill": "python"},
+            {"key": "build", "name": "Build", "details": "d", "required_skill": "python", "depends_on": ["design"]},
+            {"name": "Test", "details": "d", "required_skill": "python", "depends_on": ["build", "design"]},
+        ],
+        "publisher",
+    )
+
+    design, build, test = tasks
+    assert build.depends_on == [design.id]
+    assert test.depends_on == [build.id, design.id]
+    assert len(await db.list_tasks()) == 3
+    assert (await db.get_task(test.id)).depends_on == [build.id, design.id]
+
+
+@pytest.mark.asyncio
+async def test_task_publish_many_is_all_or_nothing(db: SQLiteStore, hunters: list[str]):
+    with pytest.raises(ValueError):
+        await task_publish_many(
+            db,
+            [
+                {"name": "Valid", "details": "d", "required_skill": "python"},
+                {"name": "Missing skill", "details": "d"},
+            ],
+            "publisher",
+        )
+    with pytest.raises(ValueError):
+        await task_publish_many(db, [{"name": "Task", "details": "d", "required_skill": "python"}], "nobody")
+
+    assert await db.list_tasks() == []
+
+
+@pytest.mark.asyncio
+async def test_task_claim_tracks_current_tasks(db: SQLiteStore, hunters: list[str]):
+    task = await task_publish(db, "Task", "Details", "python", "publisher")
+
+    await task_claim(db, task.id, hunters[0])
+
+    assert (await db.get_hunter(hunters[0])).current_tasks == [task.id]
+
+
+@pytest.mark.asyncio
+async def test_report_submit_is_atomic(db: SQLiteStore, hunters: list[str]):
+    task = await task_publish(db, "Task", "Details", "python", "publisher")
+    await task_claim(db, task.id, hunters[0])
+
+    # No "system" hunter exists yet, so publishing the evaluation task fails and nothing is kept
+    with pytest.raises(ValueError):
+        await report_submit(db, task.id, hunters[0], "completed", result="done")
+    assert (await db.get_task(task.id)).status == TaskStatus.CLAIMED
+    assert await db.list_reports(task_id=task.id) == []
+
+    await hunter_register(db, "system")
+    report = await report_submit(db, task.id, hunters[0], "completed", result="done")
+
+    assert (await db.get_task(task.id)).status == TaskStatus.COMPLETED
+    assert [r.id for r in await db.list_reports(task_id=task.id)] == [report.id]
+    assert (await db.get_hunter(hunters[0])).current_tasks == []
+    assert len(await db.list_tasks(required_skill="report_evaluation")) == 1
+
+
+@pytest.mark.asyncio
+async def test_task_claim_rejects_blocked_task(db: SQLiteStore, hunters):
+    first = await task_publish(db, "A", "Details", "python", "publisher")
+    second = await task_publish(db, "B", "Details", "python", "publisher", depends_on=[first.id])
+
+    with pytest.raises(ValueError, match="blocked"):
+        await task_claim(db, second.id, "hunter-0")
+
+
+@pytest.mark.asyncio
+async def test_task_archive_moves_finished_task(db: SQLiteStore, hunters):
+    task = await task_publish(db, "A", "Details", "python", "publisher")
+    with pytest.raises(ValueError, match="completed or failed"):
+        await task_archive(db, task.id)
+
+    task.status = TaskStatus.COMPLETED
+    await db.save_task(task)
+    archived = await task_archive(db, task.id)
+
+    assert archived.status == TaskStatus.ARCHIVED
+    assert await db.list_tasks() == []
+    assert (await task_archive(db, task.id)).id == task.id
+
+
+@pytest.mark.asyncio
+async def test_task_list_page_summary(db: SQLiteStore, hunters):
+    await task_publish(db, "A", "Details", "python", "publisher")
+
+    tasks, _ = await task_list_page(db, summary=True)
+    assert isinstance(tasks[0], TaskSummary)
+    assert tasks[0].name == "A"
+
+    assert check_task_fields(["id", "status"]) is True
+    assert check_task_fields(["id", "details"]) is False
+    assert check_task_fields(None) is False
+    with pytest.raises(ValueError, match="Unknown task fields"):
+        check_task_fields(["nope"])
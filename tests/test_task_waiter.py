@@ -0,0 +1,164 @@
+import asyncio
+import gc
+import weakref
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+
+from taskhub.models.task import Task, TaskStatus
+from taskhub.services import hunter_register, task_publish, task_wait_for
+from taskhub.services import task_service
+from taskhub.services.lease_manager import LeaseManager
+from taskhub.services.task_waiter import get_task_waiter
+from taskhub.storage.sqlite_store import SQLiteStore
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path) -> AsyncGenerator[SQLiteStore, None]:
+    """创建一个临时文件数据库用于测试"""
+    store = SQLiteStore(db_path=str(tmp_path / "taskhub_test.db"))
+    await store.connect()
+    await hunter_register(store, "publisher", {"python": 50, "rust": 50})
+    await hunter_register(store, "hunter-0", {"python": 10, "rust": 10})
+    await hunter_register(store, "hunter-1", {"python": 10})
+    yield store
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_returns_ready_task_immediately(db: SQLiteStore):
+    task = await task_publish(db, "Task", "Details", "python", "publisher")
+
+    claimed = await task_wait_for(db, "hunter-0", ["python"], timeout=5)
+
+    assert claimed.id == task.id
+    assert claimed.status == TaskStatus.CLAIMED
+    assert task.id in (await db.get_hunter("hunter-0")).current_tasks
+
+
+@pytest.mark.asyncio
+async def test_wakes_on_publish(db: SQLiteStore):
+    waiting = asyncio.create_task(task_wait_for(db, "hunter-0", ["rust", "python"], timeout=10))
+    await asyncio.sleep(0.05)
+    assert get_task_waiter(db).waiting == 1
+
+    task = await task_publish(db, "Task", "Details", "python", "publisher")
+
+    claimed = await asyncio.wait_for(waiting, timeout=1)
+    assert claimed.id == task.id
+    assert claimed.hunter_id == "hunter-0"
+    assert get_task_waiter(db).waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_wakes_on_lease_expiry(db: SQLiteStore):
+    task = await task_publish(db, "Task", "Details", "python", "publisher")
+    lease_expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    await db.claim_task(task.id, "hunter-1", "lease-1", lease_expires_at)
+    manager = LeaseManager(db)
+    await manager.resync()
+
+    waiting = asyncio.create_task(task_wait_for(db, "hunter-0", timeout=10))
+    await asyncio.sleep(0.05)
+    await manager.expire_due(lease_expires_at + timedelta(seconds=1))
+
+    claimed = await asyncio.wait_for(waiting, timeout=1)
+    assert claimed.id == task.id
+    assert claimed.hunter_id == "hunter-0"
+
+
+@pytest.mark.asyncio
+async def test_times_out_without_task(db: SQLiteStore):
+    start = asyncio.get_running_loop().time()
+    assert await task_wait_for(db, "hunter-0", ["python"], timeout=0.1) is None
+    assert asyncio.get_running_loop().time() - start >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_retries_for_tasks_published_elsewhere(db: SQLiteStore, monkeypatch):
+    monkeypatch.setitem(task_service.config.config["task"], "wait_poll_interval", 0.05)
+    waiting = asyncio.create_task(task_wait_for(db, "hunter-0", ["python"], timeout=10))
+    await asyncio.sleep(0.05)
+
+    # Another process's store: no in-process wakeup, only the periodic retry finds it
+    other = SQLiteStore(db_path=str(db.db_path))
+    await other.connect()
+    try:
+        await other.save_task(Task(id="task-1", name="Task", details="d", required_skill="python"))
+    finally:
+        await other.close()
+
+    claimed = await asyncio.wait_for(waiting, timeout=1)
+    assert claimed.id == "task-1"
+
+
+@pytest.mark.asyncio
+async def test_idle_retries_do_not_take_the_writer(db: SQLiteStore, monkeypatch):
+    monkeypatch.setitem(task_service.config.config["task"], "wait_poll_interval", 0.02)
+    claims = 0
+    claim_next_task = db.claim_next_task
+
+    async def counting_claim(*args, **kwargs):
+        nonlocal claims
+        claims += 1
+        return await claim_next_task(*args, **kwargs)
+
+    monkeypatch.setattr(db, "claim_next_task", counting_claim)
+    # The publisher's own task is queued but not claimable by them
+    own = await task_publish(db, "Own", "Details", "python", "publisher")
+
+    assert await task_wait_for(db, "publisher", ["python"], timeout=0.15) is None
+    assert claims == 0
+
+    claimed = await task_wait_for(db, "hunter-0", ["python"], timeout=1)
+    assert claimed.id == own.id
+    assert claims == 1
+
+
+@pytest.mark.asyncio
+async def test_wakes_after_publish_in_transaction_commits(db: SQLiteStore, monkeypatch):
+    monkeypatch.setitem(task_service.config.config["task"], "wait_poll_interval", 3)
+    waiting = asyncio.create_task(task_wait_for(db, "hunter-0", ["python"], timeout=10))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(RuntimeError):
+        async with db.transaction():
+            await task_publish(db, "Rolled back", "Details", "python", "publisher")
+            raise RuntimeError("boom")
+    assert get_task_waiter(db).wakeups == 0
+
+    async with db.transaction():
+        task = await task_publish(db, "Task", "Details", "python", "publisher")
+        # Nothing is signalled before the commit, when other connections can't see the task yet
+        await asyncio.sleep(0.05)
+        assert get_task_waiter(db).wakeups == 0
+
+    claimed = await asyncio.wait_for(waiting, timeout=1)
+    assert claimed.id == task.id
+
+
+@pytest.mark.asyncio
+async def test_rejects_unknown_skill(db: SQLiteStore):
+    with pytest.raises(ValueError, match="does not possess"):
+        await task_wait_for(db, "hunter-1", ["rust"], timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_waiter_does_not_keep_closed_store_alive(tmp_path):
+    from taskhub.services import task_waiter
+
+    gc.collect()
+    waiters = len(task_waiter._waiters)
+    store = SQLiteStore(db_path=str(tmp_path / "gc.db"))
+    await store.connect()
+    get_task_waiter(store)
+    assert len(task_waiter._waiters) == waiters + 1
+    await store.close()
+    ref = weakref.ref(store)
+    del store
+    gc.collect()
+
+    assert ref() is None
+    assert len(task_waiter._waiters) == waiters
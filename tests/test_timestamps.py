@@ -0,0 +1,20 @@
+from datetime import datetime, timedelta, timezone
+
+from taskhub.storage.timestamps import from_epoch_us, to_epoch_us
+
+
+def test_epoch_round_trip_keeps_microseconds():
+    value = datetime(2025, 8, 10, 12, 30, 45, 123456, tzinfo=timezone.utc)
+    assert to_epoch_us(value) == 1754829045123456
+    assert from_epoch_us(to_epoch_us(value)) == value
+
+
+def test_naive_aware_and_string_values_agree():
+    aware = datetime(2025, 8, 10, 8, 0, tzinfo=timezone(timedelta(hours=8)))
+    naive_utc = datetime(2025, 8, 10, 0, 0)
+    assert to_epoch_us(aware) == to_epoch_us(naive_utc) == to_epoch_us(aware.isoformat())
+
+
+def test_none_passes_through():
+    assert to_epoch_us(None) is None
+    assert from_epoch_us(None) is None